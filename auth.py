@@ -4,11 +4,21 @@ JWT-based authentication and RBAC for SARO.
 Roles:
   super_admin — provisions tenants, manages users, configures defaults.
   operator    — submits batches, runs audits, views reports.
+
+Authenticated requests resolve to a Principal (an immutable snapshot of the
+user row).  Principals are cached per user for AUTH_CACHE_TTL_SECONDS, so
+a valid token normally costs no DB round trip; any committed update or
+delete of a User row (deactivation, role change) evicts its entry.
 """
 from __future__ import annotations
 
 import logging
 import os
+import secrets
+import uuid
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Annotated
 
@@ -18,8 +28,10 @@ import bcrypt as _bcrypt_lib
 from argon2 import PasswordHasher
 from argon2.exceptions import InvalidHashError, VerificationError, VerifyMismatchError
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
 
+from cache import TTLCache
 from database import get_db
 from models import User
 
@@ -72,6 +84,14 @@ _bearer = HTTPBearer(auto_error=True)
 # bcrypt hash prefixes — bcrypt 2a/2b/2y are all valid
 _BCRYPT_PREFIXES = ("$2b$", "$2a$", "$2y$")
 
+# Marks a stored hash that no password can match (SSO-only accounts whose
+# credentials live at the IdP).  Never a valid Argon2/bcrypt prefix.
+UNUSABLE_PASSWORD_PREFIX = "!"
+
+# Argon2id releases the GIL while hashing, so a few threads give a near
+# linear speed-up for bulk provisioning.  Each hash holds ~64 MiB.
+_HASH_WORKERS = max(1, min(4, int(os.environ.get("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))))
+
 
 # ── Password helpers ──────────────────────────────────────────────────────────
 
@@ -81,6 +101,20 @@ def hash_password(plain: str) -> str:
     return _ph.hash(plain)
 
 
+def hash_passwords(plains: Iterable[str]) -> list[str]:
+    """Hash many passwords (same order) on a small thread pool."""
+    plains = list(plains)
+    if len(plains) <= 1 or _HASH_WORKERS == 1:
+        return [hash_password(p) for p in plains]
+    with ThreadPoolExecutor(max_workers=_HASH_WORKERS, thread_name_prefix="pwhash") as pool:
+        return list(pool.map(hash_password, plains))
+
+
+def unusable_password() -> str:
+    """A stored-hash value that verify_password() never accepts."""
+    return UNUSABLE_PASSWORD_PREFIX + secrets.token_urlsafe(16)
+
+
 def verify_password(plain: str, hashed: str) -> bool:
     """
     Verify a plain-text password against a stored hash.
@@ -89,10 +123,11 @@ def verify_password(plain: str, hashed: str) -> bool:
     • Argon2id  ($argon2id$...)  — current standard, created by hash_password()
     • bcrypt    ($2b$/2a$/2y$…)  — legacy format; created by passlib before the
                                    Argon2 migration; verified via bcrypt directly
+    Unusable hashes (``!…``, SSO-only accounts) never match.
 
     Always returns False on any mismatch or error; never raises.
     """
-    if not hashed:
+    if not hashed or hashed.startswith(UNUSABLE_PASSWORD_PREFIX):
         return False
 
     if hashed.startswith(_BCRYPT_PREFIXES):
@@ -140,29 +175,99 @@ def _decode_token(token: str) -> dict:
         ) from exc
 
 
+# ── Principal cache ───────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated caller — the User columns routes need, detached from any session."""
+
+    id: uuid.UUID
+    tenant_id: uuid.UUID
+    email: str
+    role: str
+    is_active: bool
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> Principal:
+        return cls(
+            id=user.id,
+            tenant_id=user.tenant_id,
+            email=user.email,
+            role=user.role,
+            is_active=user.is_active,
+            created_at=user.created_at,
+        )
+
+
+AUTH_CACHE_TTL = float(os.environ.get("AUTH_CACHE_TTL_SECONDS", "30"))
+_principal_cache: TTLCache[Principal] = TTLCache(ttl=AUTH_CACHE_TTL, maxsize=10_000)
+
+_DIRTY_USERS_KEY = "auth_dirty_user_ids"
+
+
+def invalidate_principal(user_id: uuid.UUID | str) -> None:
+    """Drop the cached principal for ``user_id`` (next request re-reads the row)."""
+    _principal_cache.invalidate(str(user_id))
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(_mapper, _connection, target: User) -> None:
+    # Evict now, and again once the change is committed: a concurrent request
+    # could re-cache the old row between this flush and the commit.
+    invalidate_principal(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_DIRTY_USERS_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed_users(session: Session) -> None:
+    for user_id in session.info.pop(_DIRTY_USERS_KEY, ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_rolled_back_users(session: Session, _previous_transaction) -> None:
+    session.info.pop(_DIRTY_USERS_KEY, None)
+
+
 # ── FastAPI dependencies ───────────────────────────────────────────────────────
 
 
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(_bearer)],
     db: Annotated[Session, Depends(get_db)],
-) -> User:
+) -> Principal:
     """
-    Validate the Bearer token and return the authenticated User row.
+    Validate the Bearer token and return the authenticated Principal.
 
-    Raises 401 if the token is invalid/expired, 403 if the user is inactive.
+    The signature and expiry are checked on every call; only the user lookup
+    is served from the principal cache.  Raises 401 if the token is
+    invalid/expired, 403 if the user is inactive.
     """
     payload = _decode_token(credentials.credentials)
     user_id: str | None = payload.get("sub")
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Malformed token")
 
-    user = db.get(User, user_id)
-    if user is None:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    if not user.is_active:
+    principal = _principal_cache.get(user_id)
+    if principal is None:
+        try:
+            user = db.get(User, uuid.UUID(user_id))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Malformed token"
+            ) from None
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        principal = Principal.from_user(user)
+        _principal_cache.set(user_id, principal)
+    if not principal.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Account disabled")
-    return user
+    return principal
 
 
 def require_role(*roles: str):
@@ -174,8 +279,8 @@ def require_role(*roles: str):
     """
 
     async def _check(
-        current_user: Annotated[User, Depends(get_current_user)],
-    ) -> User:
+        current_user: Annotated[Principal, Depends(get_current_user)],
+    ) -> Principal:
         if current_user.role not in roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
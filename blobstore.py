@@ -0,0 +1,215 @@
+"""
+SARO large-object store
+=======================
+Where single-output audits keep prompts / outputs too large to sit inline in
+Postgres (AuditMetadata.prompt_s3_key / output_s3_key hold the blob key).
+
+Backends (BLOB_STORE):
+    local   content-addressed files under BLOB_STORE_DIR
+            (<dir>/<sha[:2]>/<sha>); the key is the SHA-256 hex digest.
+    s3      any S3-compatible bucket (AWS_S3_BUCKET, optional
+            AWS_S3_ENDPOINT_URL for MinIO / R2 / …); the key is the object
+            key ``traces/<sha>.txt``.  One boto3 client per process.
+    ""      disabled — every text stays inline.
+BLOB_STORE defaults to "s3" when AWS_S3_BUCKET is set, "" otherwise.
+
+Blobs are addressed by content, so identical texts are stored once: a put of
+an existing blob is a HEAD / stat, not an upload.  put_async() runs uploads
+on a small thread pool (BLOB_UPLOAD_WORKERS) so they overlap the audit
+itself; callers wait on the future before committing a row that points at
+the key, falling back to inline storage if the upload failed.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+AWS_S3_BUCKET: str = os.environ.get("AWS_S3_BUCKET", "")
+AWS_S3_ENDPOINT_URL: str = os.environ.get("AWS_S3_ENDPOINT_URL", "")
+BLOB_STORE: str = os.environ.get("BLOB_STORE", "s3" if AWS_S3_BUCKET else "").strip().lower()
+BLOB_STORE_DIR: str = os.environ.get("BLOB_STORE_DIR", "blobs")
+# Texts at least this large (UTF-8 bytes) are offloaded when a store is configured
+BLOB_OFFLOAD_BYTES: int = int(os.environ.get("BLOB_OFFLOAD_BYTES", "50000"))
+BLOB_UPLOAD_WORKERS: int = max(1, int(os.environ.get("BLOB_UPLOAD_WORKERS", "4")))
+_CHUNK_SIZE = 64 * 1024
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore(ABC):
+    """Content-addressed blob storage; backends implement the four primitives."""
+
+    name = "base"
+
+    @abstractmethod
+    def key_for(self, digest: str) -> str:
+        """The key a blob with SHA-256 ``digest`` is stored under."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """True if a blob is already stored under ``key``."""
+
+    @abstractmethod
+    def _write(self, key: str, data: bytes) -> None:
+        """Store ``data`` under ``key`` (only called when it is not there yet)."""
+
+    @abstractmethod
+    def open(self, key: str) -> Iterator[bytes]:
+        """Stream the blob stored under ``key`` in chunks."""
+
+    def put(self, data: bytes) -> str:
+        """Store ``data`` (once per distinct content) and return its key."""
+        key = self.key_for(content_hash(data))
+        if not self.exists(key):
+            self._write(key, data)
+        return key
+
+    def read(self, key: str) -> bytes:
+        return b"".join(self.open(key))
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs as files under ``root``, fanned out by the first two hex digits."""
+
+    name = "local"
+
+    def __init__(self, root: str) -> None:
+        self.root = os.path.abspath(root)
+
+    def key_for(self, digest: str) -> str:
+        return digest
+
+    def _path(self, key: str) -> str:
+        if len(key) != 64 or not all(c in "0123456789abcdef" for c in key):
+            raise KeyError(f"Invalid local blob key: {key!r}")
+        return os.path.join(self.root, key[:2], key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def _write(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename so a reader never sees a partial blob
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def open(self, key: str) -> Iterator[bytes]:
+        fh = open(self._path(key), "rb")  # raise FileNotFoundError before streaming starts
+
+        def _chunks() -> Iterator[bytes]:
+            with fh:
+                while chunk := fh.read(_CHUNK_SIZE):
+                    yield chunk
+
+        return _chunks()
+
+
+class S3BlobStore(BlobStore):
+    """Blobs as objects in an S3-compatible bucket, via one cached boto3 client."""
+
+    name = "s3"
+
+    def __init__(self, bucket: str, endpoint_url: str = "", prefix: str = "traces/") -> None:
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url
+        self.prefix = prefix
+        self._client: Any = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self) -> Any:
+        with self._client_lock:
+            if self._client is None:
+                import boto3  # type: ignore[import]
+
+                self._client = boto3.client("s3", endpoint_url=self.endpoint_url or None)
+            return self._client
+
+    def key_for(self, digest: str) -> str:
+        return f"{self.prefix}{digest}.txt"
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except Exception as exc:
+            if getattr(exc, "response", {}).get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return False
+            raise
+
+    def _write(self, key: str, data: bytes) -> None:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            ContentType="text/plain; charset=utf-8",
+        )
+        logger.info("Stored blob in S3: s3://%s/%s", self.bucket, key)
+
+    def open(self, key: str) -> Iterator[bytes]:
+        # Legacy keys (traces/<audit>/<uuid>.txt) read the same way
+        body = self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+        return body.iter_chunks(_CHUNK_SIZE)
+
+
+# ── Process-wide store + upload pool ──────────────────────────────────────────
+
+_store: BlobStore | None = None
+_store_configured = False
+_uploads: ThreadPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore | None:
+    """The configured store (built once); None when offloading is disabled."""
+    global _store, _store_configured
+    with _lock:
+        if not _store_configured:
+            if BLOB_STORE == "local":
+                _store = LocalBlobStore(BLOB_STORE_DIR)
+            elif BLOB_STORE == "s3" and AWS_S3_BUCKET:
+                _store = S3BlobStore(AWS_S3_BUCKET, AWS_S3_ENDPOINT_URL)
+            elif BLOB_STORE:
+                logger.warning("BLOB_STORE=%r is not usable — storing texts inline", BLOB_STORE)
+            _store_configured = True
+        return _store
+
+
+def put_async(store: BlobStore, data: bytes) -> Future:
+    """Schedule ``store.put(data)``; the future resolves to the blob key."""
+    global _uploads
+    with _lock:
+        if _uploads is None:
+            _uploads = ThreadPoolExecutor(
+                max_workers=BLOB_UPLOAD_WORKERS, thread_name_prefix="saro-blob"
+            )
+        pool = _uploads
+    return pool.submit(store.put, data)
+
+
+def shutdown(wait: bool = True) -> None:
+    """Finish (or abandon) pending uploads — called on app shutdown."""
+    global _uploads
+    with _lock:
+        pool, _uploads = _uploads, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
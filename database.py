@@ -1,9 +1,12 @@
 """
 Database connection and session management.
 
-Uses NullPool so each connection is returned to Neon's pooler immediately —
-critical for serverless/edge deployments where persistent connections are not
-available.
+Uses NullPool by default so each connection is returned to Neon's pooler
+immediately — critical for serverless/edge deployments where persistent
+connections are not available.  Long-running containers can opt into a
+QueuePool (DB_POOL_MODE=queue) and keep connections warm across requests;
+see _pool_kwargs() for the tuning variables.  Either way, pool_stats()
+reports connects, checkouts and checkout wait time (surfaced by /health).
 
 Engine is created lazily on first use so that importing this module never
 raises a KeyError/RuntimeError when DATABASE_URL is not yet in the environment
@@ -14,10 +17,13 @@ from __future__ import annotations
 import functools
 import logging
 import os
+import threading
+import time
+from typing import Any
 
 from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, QueuePool
 
 logger = logging.getLogger(__name__)
 
@@ -34,21 +40,135 @@ def _database_url() -> str:
     return url
 
 
+# ── Pool instrumentation ──────────────────────────────────────────────────────
+
+
+class _PoolStats:
+    """Thread-safe counters fed by pool events and the timed _do_get()."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.wait_count = 0
+            self.wait_total_s = 0.0
+            self.wait_max_s = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total_s += seconds
+            self.wait_max_s = max(self.wait_max_s, seconds)
+
+    def incr(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checked_out": self.checkouts - self.checkins,
+                "wait_avg_ms": round(1000 * self.wait_total_s / self.wait_count, 3)
+                if self.wait_count else 0.0,
+                "wait_max_ms": round(1000 * self.wait_max_s, 3),
+            }
+
+
+_pool_stats = _PoolStats()
+
+
+class _TimedPoolMixin:
+    """
+    Time every pool checkout.  For NullPool that is the full connect
+    (TCP + TLS + auth) cost; for QueuePool it is the wait for an idle
+    connection plus any overflow connect.
+    """
+
+    def _do_get(self):  # noqa: ANN202
+        start = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        finally:
+            _pool_stats.record_wait(time.perf_counter() - start)
+
+
+class _TimedNullPool(_TimedPoolMixin, NullPool):
+    pass
+
+
+class _TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+def _pool_kwargs() -> dict[str, Any]:
+    """
+    Pool arguments for create_engine(), chosen by environment:
+
+        DB_POOL_MODE       null (default) | queue
+        DB_POOL_SIZE       persistent connections kept open (default 5)
+        DB_MAX_OVERFLOW    extra connections allowed under burst (default 10)
+        DB_POOL_TIMEOUT    seconds to wait for a free connection (default 30)
+        DB_POOL_RECYCLE    reconnect connections older than N s (default 1800,
+                           below Neon's idle-connection cutoff)
+        DB_POOL_PRE_PING   test connections on checkout (default true)
+    """
+    mode = os.environ.get("DB_POOL_MODE", "null").strip().lower()
+    if mode != "queue":
+        return {"poolclass": _TimedNullPool}
+    return {
+        "poolclass": _TimedQueuePool,
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.environ.get("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.environ.get("DB_POOL_PRE_PING", "true").strip().lower()
+        in ("1", "true", "yes"),
+    }
+
+
+def _instrument_pool(eng) -> None:  # noqa: ANN001
+    @event.listens_for(eng, "connect")
+    def _on_connect(dbapi_connection, connection_record):  # noqa: ANN001
+        _pool_stats.incr("connects")
+        logger.debug("New DB connection established")
+
+    @event.listens_for(eng, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):  # noqa: ANN001
+        _pool_stats.incr("checkouts")
+
+    @event.listens_for(eng, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):  # noqa: ANN001
+        _pool_stats.incr("checkins")
+
+
 @functools.lru_cache(maxsize=1)
 def _get_engine():
     """Create (once) and return the SQLAlchemy engine."""
     eng = create_engine(
         _database_url(),
-        poolclass=NullPool,
         echo=False,
         connect_args={"connect_timeout": 10},
+        **_pool_kwargs(),
     )
+    _instrument_pool(eng)
+    return eng
 
-    @event.listens_for(eng, "connect")
-    def _on_connect(dbapi_connection, connection_record):  # noqa: ANN001
-        logger.debug("New DB connection established")
 
-    return eng
+def pool_stats() -> dict[str, Any]:
+    """Pool mode, size and checkout/wait counters for the ops endpoints."""
+    pool = _get_engine().pool
+    stats: dict[str, Any] = {"mode": "queue" if isinstance(pool, QueuePool) else "null"}
+    if isinstance(pool, QueuePool):
+        stats.update(size=pool.size(), idle=pool.checkedin(), overflow=pool.overflow())
+    stats.update(_pool_stats.snapshot())
+    return stats
 
 
 @functools.lru_cache(maxsize=1)
@@ -192,6 +312,14 @@ _APP_TABLE_EXPECTED_COLS: dict[str, set[str]] = {
         "line_number", "snippet", "correlation_note",
         "finding_domain", "scan_hash", "created_at",
     },
+    "report_rollups": {
+        "tenant_id", "day", "completed_count",
+        "mit_coverage_sum", "mit_coverage_count",
+        "risk_score_sum", "risk_score_count",
+        "fixed_delta_sum", "fixed_delta_count",
+    },
+    "report_rollup_hits": {"tenant_id", "day", "kind", "name", "hits"},
+    "audit_leases": {"audit_id", "instance_id", "heartbeat_at"},
 }
 
 
@@ -244,7 +372,10 @@ def ensure_app_schema() -> None:
     #   audit_traces    → audits, users
     #   audits          → tenants, users
     _DROP_ORDER = [
+        "report_rollup_hits",    # → tenants (rebuilt by rollups.backfill)
+        "report_rollups",        # → tenants
         "github_scan_results",   # → audits
+        "audit_leases",          # → audits
         "enhanced_traces",       # → audits
         "audit_metadata",        # → audits
         "audit_events",          # → tenants, users
@@ -269,6 +400,27 @@ def ensure_app_schema() -> None:
     )
 
 
+def ensure_app_indexes() -> None:
+    """
+    Create any ORM-declared index missing from an existing table.
+
+    create_all() only builds indexes together with a brand-new table, so
+    composite indexes added to a model later (e.g. the listing indexes on
+    audits / audit_traces / audit_events) would otherwise never reach a
+    live database.  Each CREATE INDEX is skipped when the index exists.
+    """
+    eng = _get_engine()
+    inspector = inspect(eng)
+    for table in Base.metadata.sorted_tables:
+        if not table.indexes or not inspector.has_table(table.name):
+            continue
+        existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(eng, checkfirst=True)
+                logger.info("Created index %s on %s", index.name, table.name)
+
+
 # ── Health check ──────────────────────────────────────────────────────────────
 
 def health_check() -> bool:
@@ -22,12 +22,33 @@ Each MIT risk domain tracks a Beta(α, β) posterior.
   α₀ = β₀ = BAYESIAN_PRIOR  (Jeffreys non-informative prior = 0.5)
   Posterior after k flagged in n samples: Beta(α₀+k, β₀+n-k)
   Risk probability estimate = posterior mean
-  95 % credible interval via scipy.stats.beta.ppf
+  95 % credible interval via scipy.special.betaincinv (inverse regularised
+  incomplete beta = Beta ppf), vectorised over all domains and cached per
+  (k, n, prior, CI level)
 
 Incident matching
 -----------------
-TF-IDF cosine similarity over the concatenation of all sample texts against
-the ai_incidents corpus (loaded once at engine init).
+TF-IDF cosine similarity against the ai_incidents corpus, either for the
+concatenation of the first 200 sample texts (default) or, with
+incident_matching="per_sample", for every sample with per-incident max/mean
+aggregation and sample attributions.
+
+Reference snapshot
+------------------
+The six reference tables and the fitted TF-IDF index are loaded into an
+immutable ReferenceSnapshot that is shared by every request.  It is built once
+at startup and swapped atomically when the tables' fingerprint changes (checked
+at most every REFERENCE_CHECK_INTERVAL_SECONDS) or on an explicit admin reload.
+Per-request work is limited to the gates themselves.
+
+Streaming
+---------
+The gates read running totals (_AuditTally: counts, token-length moments,
+group/label tallies, per-domain flag counts with a few examples) rather than
+the sample list, so AuditStream can audit a batch fed in chunks in constant
+memory.  run_audit() is the same stream fed in one go.  Each chunk is turned
+into columns once (_SampleColumns: texts, token-length array, integer-coded
+group / label categoricals) and folded in with NumPy reductions.
 
 Fixed-delta
 -----------
@@ -38,20 +59,31 @@ Among the top-K similar incidents, compute:
 """
 from __future__ import annotations
 
+import hashlib
+import itertools
 import logging
+import multiprocessing
 import os
 import re
+import tempfile
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
 
 import numpy as np
-from scipy import stats
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy import special
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
+from cache import TTLCache
+from incident_index import IncidentIndex, IncidentMatchAccumulator, incident_text, load_or_build
 from models import (
     AIGPPrinciple,
     AIIncident,
@@ -72,6 +104,8 @@ from schemas import (
     MITCoverageOut,
     RemediationOut,
     SampleIn,
+    SampleMatchOut,
+    SampleRow,
     SimilarIncidentOut,
 )
 
@@ -85,6 +119,26 @@ MIN_SAMPLES: int = int(os.environ.get("MIN_BATCH_SAMPLES", "50"))
 BAYESIAN_PRIOR: float = float(os.environ.get("BAYESIAN_PRIOR_ALPHA", "0.5"))
 INCIDENT_TOP_K: int = int(os.environ.get("INCIDENT_TOP_K", "5"))
 CI_LEVEL: float = float(os.environ.get("CONFIDENCE_THRESHOLD", "0.95"))
+# How often (seconds) a request may re-check the reference tables' fingerprint
+REFERENCE_CHECK_INTERVAL: float = float(
+    os.environ.get("REFERENCE_CHECK_INTERVAL_SECONDS", "300")
+)
+# Appended incidents (as a fraction of the fitted corpus) tolerated before the
+# incident index is refitted instead of extended
+INCIDENT_INDEX_REFIT_RATIO: float = float(os.environ.get("INCIDENT_INDEX_REFIT_RATIO", "0.2"))
+# Gate 3 shards chunks of at least this many samples across GATE3_WORKERS
+# processes (0 disables; a single worker always runs serially).
+GATE3_PARALLEL_THRESHOLD: int = int(os.environ.get("GATE3_PARALLEL_THRESHOLD", "5000"))
+GATE3_WORKERS: int = max(1, int(os.environ.get("GATE3_WORKERS", str(os.cpu_count() or 1))))
+# Single-output audit results are cached by content for this long (0 disables)
+OUTPUT_AUDIT_CACHE_TTL: float = float(os.environ.get("OUTPUT_AUDIT_CACHE_SECONDS", "3600"))
+OUTPUT_AUDIT_CACHE_SIZE: int = int(os.environ.get("OUTPUT_AUDIT_CACHE_SIZE", "10000"))
+# Bumped whenever a change to the pipeline alters reports for the same input
+ENGINE_VERSION = "saro-engine-1.0"
+# Where fitted incident-index artifacts are kept between processes ("" disables)
+INCIDENT_INDEX_DIR: str = os.environ.get(
+    "INCIDENT_INDEX_DIR", os.path.join(tempfile.gettempdir(), "saro-incident-index")
+)
 
 # MIT risk domain identifiers — matches the `domain` column in mit_risks
 MIT_DOMAINS: list[str] = [
@@ -179,6 +233,198 @@ _RISK_SIGNALS: dict[str, dict[str, Any]] = {
     },
 }
 
+# One regex "atom": an escape, a dot, or a plain character, with an optional
+# quantifier.  Sources made only of atoms can be merged into a prefix tree.
+_REGEX_ATOM = re.compile(r"(?:\\.|\.|[^\\.\[\](){}|^$*+?])[*+?]?")
+
+
+def _regex_atoms(source: str) -> list[str]:
+    """Split a simple regex source into atoms; opaque sources become one atom."""
+    atoms = _REGEX_ATOM.findall(source)
+    return atoms if "".join(atoms) == source else [f"(?:{source})"]
+
+
+def _prefix_tree_source(sources: list[str]) -> str:
+    """
+    Fold regex sources into one alternation shaped as a prefix tree, e.g.
+    ``["hate", "harass", r"hack"]`` -> ``ha(?:ck|rass|te)``.  It matches at an
+    offset exactly when one of the sources does.
+    """
+    tree: dict[str, dict] = {}
+    for source in sources:
+        node = tree
+        for atom in _regex_atoms(source):
+            node = node.setdefault(atom, {})
+        node[""] = {}
+
+    def emit(node: dict[str, dict]) -> str:
+        branches = [atom + emit(child) for atom, child in sorted(node.items()) if atom]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        return "(?:" + "|".join(branches) + (")?" if "" in node else ")")
+
+    return emit(tree)
+
+
+class _FirstHitScanner:
+    """
+    Find, per group, the first source (in list order) that matches anywhere.
+
+    ``re`` tries the branches of an alternation one after another at every
+    offset, so a flat ``a|b|c|...`` over the whole vocabulary is slower than
+    the per-source loop it would replace.  Instead each group's sources are
+    folded into a prefix tree (``(?:ha(?:rass|te)|...)``), which lets the
+    engine reject most offsets on the first character, plus one tree over
+    every group used as a prefilter.  A text with no hit costs one scan;
+    otherwise each group's tree is searched from the first global hit, and
+    only a group that hits is resolved back to a list position by searching
+    its sources from that group's first hit — nothing can match earlier, so
+    the result is exactly what a sequential ``re.search`` loop returns.
+    """
+
+    def __init__(self, groups: list[list[str]]) -> None:
+        self._groups = [[re.compile(src) for src in sources] for sources in groups]
+        self._group_scans = [
+            re.compile(_prefix_tree_source(sources)) if sources else None for sources in groups
+        ]
+        all_sources = [src for sources in groups for src in sources]
+        self._any_scan = re.compile(_prefix_tree_source(all_sources)) if all_sources else None
+
+    def first_hits(self, text: str) -> dict[int, int]:
+        """Return {group index: list position of its first matching source}."""
+        best: dict[int, int] = {}
+        if self._any_scan is None:
+            return best
+        first = self._any_scan.search(text)
+        if first is None:
+            return best
+        start = first.start()
+        for gi, scan in enumerate(self._group_scans):
+            hit = scan.search(text, start) if scan is not None else None
+            if hit is None:
+                continue
+            pos = hit.start()
+            best[gi] = next(
+                li for li, src in enumerate(self._groups[gi]) if src.search(text, pos)
+            )
+        return best
+
+
+class _SignalMatcher:
+    """
+    Compiled equivalent of the per-keyword Gate 3 scan.
+
+    For each domain the result is identical to the original sequential logic:
+    the first keyword (list order) found in the lower-cased text, otherwise the
+    first pattern (list order) found in the original text.  Keywords go through
+    the prefix-tree scanner; the few structured patterns are already compiled
+    and only run for domains that had no keyword hit.
+    """
+
+    def __init__(self, signals: dict[str, dict[str, Any]]) -> None:
+        self.domains = list(signals)
+        self._keywords = [list(cfg["keywords"]) for cfg in signals.values()]
+        self._patterns = [list(cfg["patterns"]) for cfg in signals.values()]
+        self._keyword_scan = _FirstHitScanner(self._keywords)
+        # Per domain, the signal label for each code: keywords, then patterns.
+        self.labels = [
+            [f"keyword:{kw}" for kw in keywords] + [f"pattern:{p.pattern[:40]}" for p in patterns]
+            for keywords, patterns in zip(self._keywords, self._patterns)
+        ]
+
+    def codes(self, text: str) -> list[int]:
+        """Per domain, the index into ``labels[domain]`` of the matching signal, or -1."""
+        keyword_hits = self._keyword_scan.first_hits(text.lower())
+        out: list[int] = []
+        for di, patterns in enumerate(self._patterns):
+            if di in keyword_hits:
+                out.append(keyword_hits[di])
+                continue
+            pi = next((i for i, p in enumerate(patterns) if p.search(text)), None)
+            out.append(-1 if pi is None else len(self._keywords[di]) + pi)
+        return out
+
+    def match(self, text: str) -> list[tuple[str, str]]:
+        """Return [(domain, signal label)] in _RISK_SIGNALS domain order."""
+        return [
+            (self.domains[di], self.labels[di][code])
+            for di, code in enumerate(self.codes(text))
+            if code >= 0
+        ]
+
+
+_SIGNAL_MATCHER = _SignalMatcher(_RISK_SIGNALS)
+
+
+def _signal_code_matrix(texts: list[str]) -> np.ndarray:
+    """
+    Gate 3 signal codes for ``texts``: an int16 array of shape
+    (len(texts), domains) holding _SignalMatcher.codes() per text.
+
+    Module-level so it can run in a Gate 3 pool worker; the compact array is
+    all that crosses the process boundary on the way back.
+    """
+    codes = np.full((len(texts), len(_SIGNAL_MATCHER.labels)), -1, dtype=np.int16)
+    for row, text in enumerate(texts):
+        codes[row] = _SIGNAL_MATCHER.codes(text)
+    return codes
+
+
+_gate3_pool: ProcessPoolExecutor | None = None
+_gate3_pool_lock = threading.Lock()
+
+
+def _get_gate3_pool() -> ProcessPoolExecutor:
+    """
+    Workers start from a forkserver (spawn where unavailable), never a plain
+    fork: the API process is multithreaded by then, and a forked child can
+    deadlock on a lock some other thread held at fork time.
+    """
+    global _gate3_pool
+    if _gate3_pool is None:
+        with _gate3_pool_lock:
+            if _gate3_pool is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context(
+                    "forkserver" if "forkserver" in methods else "spawn"
+                )
+                _gate3_pool = ProcessPoolExecutor(max_workers=GATE3_WORKERS, mp_context=context)
+                logger.info("Gate 3 process pool started: %d workers", GATE3_WORKERS)
+    return _gate3_pool
+
+
+def shutdown_gate3_pool() -> None:
+    """Stop the Gate 3 process pool (it is recreated on next use)."""
+    global _gate3_pool
+    with _gate3_pool_lock:
+        pool, _gate3_pool = _gate3_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _scan_signals(texts: list[str]) -> np.ndarray:
+    """
+    Signal codes for a chunk of texts.  At or above GATE3_PARALLEL_THRESHOLD
+    texts the chunk is split into contiguous shards scored on the Gate 3
+    process pool and concatenated in order, so the result is the same array
+    the serial path returns.  A broken pool falls back to the serial path.
+    """
+    n = len(texts)
+    if GATE3_WORKERS < 2 or GATE3_PARALLEL_THRESHOLD <= 0 or n < GATE3_PARALLEL_THRESHOLD:
+        return _signal_code_matrix(texts)
+
+    # A few shards per worker evens out batches whose long texts cluster.
+    size = -(-n // (GATE3_WORKERS * 4))
+    shards = [texts[start:start + size] for start in range(0, n, size)]
+    try:
+        return np.concatenate(list(_get_gate3_pool().map(_signal_code_matrix, shards)))
+    except BrokenProcessPool:
+        logger.exception("Gate 3 process pool broke — rescanning %d samples serially", n)
+        shutdown_gate3_pool()
+        return _signal_code_matrix(texts)
+
 # Compliance rule triggers: which domain detections activate which frameworks
 _COMPLIANCE_TRIGGERS: dict[str, list[dict[str, str]]] = {
     "Discrimination & Toxicity": [
@@ -385,6 +631,249 @@ class _SampleFlag:
     weight: float
 
 
+# Gate 1/2/3 read running totals rather than the samples themselves, so a
+# batch can be fed in chunks (AuditStream) with memory bounded by these caps.
+_FLAG_EXAMPLES_PER_DOMAIN = 20
+_BATCH_TEXT_SAMPLES = 200
+_NEGATIVE_LABELS = ("safe", "benign", "0", "false")
+
+
+# Content-addressed single-output results: (report, traces) by _output_cache_key
+_output_cache: TTLCache[tuple[AuditReportOut, tuple[dict, ...]]] = TTLCache(
+    ttl=OUTPUT_AUDIT_CACHE_TTL, maxsize=OUTPUT_AUDIT_CACHE_SIZE
+)
+
+
+def output_cache_stats() -> dict[str, Any]:
+    """Size and hit/miss counters of the single-output result cache."""
+    return {
+        "entries": len(_output_cache),
+        "max_entries": _output_cache.maxsize,
+        "ttl_seconds": _output_cache.ttl,
+        "hits": _output_cache.hits,
+        "misses": _output_cache.misses,
+    }
+
+
+def clear_output_cache() -> None:
+    _output_cache.clear()
+
+
+def _reuse_output(
+    cached: tuple[AuditReportOut, Sequence[dict]], audit_id: uuid.UUID
+) -> tuple[AuditReportOut, list[dict]]:
+    """A cached single-output result re-issued under a new audit id and timestamp."""
+    report, traces = cached
+    fresh = report.model_copy(
+        update={"audit_id": audit_id, "created_at": datetime.now(tz=timezone.utc)}
+    )
+    return fresh, list(traces)
+
+
+def _output_text(raw_output: str, prompt: str | None) -> str:
+    """Single-output audit text: prompt context + raw output maximise signal surface."""
+    return " ".join(filter(None, [prompt or "", raw_output])).strip() or raw_output
+
+
+def _categorical(values: list[str | None]) -> tuple[np.ndarray, list[str]]:
+    """Integer-code ``values`` (None → -1); categories in first-appearance order."""
+    index: dict[str, int] = {}
+    codes = np.fromiter(
+        (-1 if v is None else index.setdefault(v, len(index)) for v in values),
+        dtype=np.int32,
+        count=len(values),
+    )
+    return codes, list(index)
+
+
+@dataclass
+class _SampleColumns:
+    """
+    A chunk of samples in columnar form, built once per chunk so the gates
+    reduce over arrays instead of re-reading SampleIn attributes.
+    """
+
+    sample_ids: list[str]
+    texts: list[str]
+    token_lengths: np.ndarray   # int64 whitespace-token count per sample
+    blank: np.ndarray           # bool, text is empty / whitespace only
+    group_codes: np.ndarray     # int32 index into groups, -1 = no group
+    groups: list[str]
+    label_codes: np.ndarray     # int32 index into labels, -1 = no label
+    labels: list[str]
+
+    @classmethod
+    def from_samples(cls, samples: Sequence[SampleIn]) -> _SampleColumns:
+        return cls._build(
+            [s.sample_id for s in samples],
+            [s.text for s in samples],
+            [s.group for s in samples],
+            [s.label for s in samples],
+        )
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[SampleRow], offset: int = 0) -> _SampleColumns:
+        """
+        Columns straight from validated bulk rows.  Missing ids become "#<ordinal>"
+        — a caller-supplied "3" elsewhere in the batch must not merge with row 3.
+        """
+        return cls._build(
+            [
+                row["sample_id"] if "sample_id" in row else f"#{offset + i}"
+                for i, row in enumerate(rows)
+            ],
+            [row["text"] for row in rows],
+            [row.get("group") for row in rows],
+            [row.get("label") for row in rows],
+        )
+
+    @classmethod
+    def _build(
+        cls,
+        sample_ids: list[str],
+        texts: list[str],
+        groups: list[str | None],
+        labels: list[str | None],
+    ) -> _SampleColumns:
+        n = len(texts)
+        group_codes, groups = _categorical(groups)
+        label_codes, labels = _categorical(labels)
+        return cls(
+            sample_ids=sample_ids,
+            texts=texts,
+            token_lengths=np.fromiter((len(t.split()) for t in texts), dtype=np.int64, count=n),
+            blank=np.fromiter((not t.strip() for t in texts), dtype=bool, count=n),
+            group_codes=group_codes,
+            groups=groups,
+            label_codes=label_codes,
+            labels=labels,
+        )
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+
+@dataclass
+class _AuditTally:
+    """Running accumulators for one batch — everything the gates need."""
+
+    n: int = 0
+    empty_count: int = 0
+    very_short: int = 0
+    token_sum: int = 0
+    token_sq_sum: int = 0
+    with_group: int = 0
+    with_label: int = 0
+    # group → [labelled samples, positive (non-"safe") labels], first-seen order
+    group_labels: dict[str, list[int]] = field(default_factory=dict)
+    flagged_samples: int = 0
+    total_flags: int = 0
+    domain_counts: dict[str, int] = field(default_factory=lambda: {d: 0 for d in MIT_DOMAINS})
+    # First _FLAG_EXAMPLES_PER_DOMAIN flags per domain (trace detail)
+    flag_examples: dict[str, list[_SampleFlag]] = field(default_factory=dict)
+    # First _BATCH_TEXT_SAMPLES texts (batch_text incident matching)
+    head_texts: list[str] = field(default_factory=list)
+
+    def add(self, cols: _SampleColumns, codes: np.ndarray | None = None) -> None:
+        """
+        Fold a chunk of samples into the totals.  ``codes`` are the chunk's
+        precomputed signal codes (rows of a larger _scan_signals result).
+        """
+        if not len(cols):
+            return
+        # One compiled pass per text finds every domain's first keyword hit
+        # (then first pattern hit) — see _SignalMatcher; large chunks are
+        # sharded across processes by _scan_signals.
+        if codes is None:
+            codes = _scan_signals(cols.texts)
+        self._add_profile(cols)
+        self._add_signal_codes(cols.sample_ids, codes)
+
+    def _add_profile(self, cols: _SampleColumns) -> None:
+        lengths = cols.token_lengths
+        self.n += len(cols)
+        self.empty_count += int(np.count_nonzero(cols.blank))
+        self.token_sum += int(lengths.sum())
+        self.token_sq_sum += int(np.dot(lengths, lengths))
+        self.very_short += int(np.count_nonzero(lengths < 3))
+        room = _BATCH_TEXT_SAMPLES - len(self.head_texts)
+        if room > 0:
+            self.head_texts.extend(cols.texts[:room])
+
+        has_group = cols.group_codes >= 0
+        has_label = cols.label_codes >= 0
+        self.with_group += int(np.count_nonzero(has_group))
+        self.with_label += int(np.count_nonzero(has_label))
+
+        # Parity only counts samples whose group and label are both non-empty.
+        group_ok = np.array([bool(g) for g in cols.groups] + [False])
+        label_ok = np.array([bool(lb) for lb in cols.labels] + [False])
+        positive = np.array([lb.lower() not in _NEGATIVE_LABELS for lb in cols.labels] + [False])
+        pair = group_ok[cols.group_codes] & label_ok[cols.label_codes]  # -1 hits the False pad
+        if not pair.any():
+            return
+        pair_groups = cols.group_codes[pair]
+        labelled = np.bincount(pair_groups, minlength=len(cols.groups))
+        positives = np.bincount(
+            pair_groups, weights=positive[cols.label_codes[pair]], minlength=len(cols.groups)
+        )
+        # Keep groups in the order their first labelled sample arrived.
+        uniq, first = np.unique(pair_groups, return_index=True)
+        for gi in uniq[np.argsort(first)]:
+            counts = self.group_labels.setdefault(cols.groups[gi], [0, 0])
+            counts[0] += int(labelled[gi])
+            counts[1] += int(positives[gi])
+
+    def _add_signal_codes(self, sample_ids: list[str], codes: np.ndarray) -> None:
+        hit = codes >= 0
+        self.flagged_samples += int(np.count_nonzero(hit.any(axis=1)))
+        per_domain = hit.sum(axis=0)
+        self.total_flags += int(per_domain.sum())
+        for di, domain in enumerate(_SIGNAL_MATCHER.domains):
+            if not per_domain[di]:
+                continue
+            self.domain_counts[domain] += int(per_domain[di])
+            examples = self.flag_examples.setdefault(domain, [])
+            room = _FLAG_EXAMPLES_PER_DOMAIN - len(examples)
+            for row in np.flatnonzero(hit[:, di])[:max(room, 0)]:
+                examples.append(
+                    _SampleFlag(
+                        sample_id=sample_ids[row],
+                        domain=domain,
+                        signal=_SIGNAL_MATCHER.labels[di][codes[row, di]],
+                        weight=_RISK_SIGNALS[domain]["weight"],
+                    )
+                )
+
+    @property
+    def triggered_domains(self) -> set[str]:
+        return {d for d, count in self.domain_counts.items() if count}
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    """
+    Immutable view of the reference tables plus the fitted incident index.
+
+    Shared read-only by every SARoEngine built via SARoEngine.from_snapshot();
+    replaced wholesale (never mutated) when the reference data changes.
+    """
+
+    version: str
+    loaded_at: datetime
+    mit_risks: list[dict]
+    incidents: list[dict]
+    eu_rules: list[dict]
+    nist_controls: list[dict]
+    aigp: list[dict]
+    gov_rules: list[dict]
+    incident_index: IncidentIndex | None
+    # Unique per built snapshot: a reload under an unchanged fingerprint
+    # (in-place edits the fingerprint misses, forced admin reloads) still
+    # starts a new generation.
+    generation: int = 0
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Trace remediation hints per gate and MIT domain
 # ─────────────────────────────────────────────────────────────────────────────
@@ -442,6 +931,57 @@ _DOMAIN_REMEDIATION_HINTS: dict[str, str] = {
 }
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Beta posterior cache
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Two-sided normal quantile for the Wilson interval used by fixed-delta.
+_Z_CI: float = float(special.ndtri((1.0 + CI_LEVEL) / 2))
+
+_POSTERIOR_CACHE_SIZE = 4096
+# (k, n, prior, ci_level) -> (posterior mean, ci lower, ci upper)
+_posterior_cache: OrderedDict[tuple[int, int, float, float], tuple[float, float, float]] = OrderedDict()
+_posterior_cache_lock = threading.Lock()
+
+
+def _beta_posteriors(
+    ks: list[int], n: int, prior: float, ci_level: float
+) -> list[tuple[float, float, float]]:
+    """
+    (mean, ci_lower, ci_upper) of Beta(prior+k, prior+n-k) for each k.
+
+    Small batches repeat the same (k, n) pairs across audits, so results are
+    kept in an LRU; all misses are solved in a single vectorised
+    ``betaincinv`` call.  The mean is analytic: α / (α + β).
+    """
+    keys = [(k, n, prior, ci_level) for k in ks]
+    with _posterior_cache_lock:
+        found = {}
+        for key in keys:
+            if key in _posterior_cache:
+                _posterior_cache.move_to_end(key)
+                found[key] = _posterior_cache[key]
+    missing = sorted({key for key in keys if key not in found})
+    if missing:
+        k_arr = np.fromiter((key[0] for key in missing), dtype=float, count=len(missing))
+        alpha = prior + k_arr
+        beta = prior + (n - k_arr)
+        tail = (1.0 - ci_level) / 2
+        # One call: rows are the misses, columns the lower and upper quantiles
+        lower, upper = special.betaincinv(
+            alpha[:, None], beta[:, None], np.array([tail, 1.0 - tail])
+        ).T
+        mean = alpha / (alpha + beta)
+        with _posterior_cache_lock:
+            for i, key in enumerate(missing):
+                found[key] = _posterior_cache[key] = (
+                    float(mean[i]), float(lower[i]), float(upper[i])
+                )
+            while len(_posterior_cache) > _POSTERIOR_CACHE_SIZE:
+                _posterior_cache.popitem(last=False)
+    return [found[key] for key in keys]
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Engine
 # ─────────────────────────────────────────────────────────────────────────────
@@ -451,21 +991,53 @@ class SARoEngine:
     """
     Stateful audit engine.
 
-    Instantiate once per request (or once at startup and reuse for read-only
-    reference data).  The DB session is used only during __init__ to load
-    reference tables; after that the engine is pure in-memory computation.
+    Request handlers should obtain an engine via get_audit_engine(db), which
+    binds a fresh engine (own trace accumulator) to the shared, immutable
+    ReferenceSnapshot.  Constructing SARoEngine(db) directly loads the
+    reference tables and refits the incident index from scratch; after that
+    the engine is pure in-memory computation.
     """
 
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: Session, previous: ReferenceSnapshot | None = None) -> None:
         logger.info("Initialising SARoEngine — loading reference tables")
         self._load_reference_data(db)
-        self._build_incident_index()
+        self._build_incident_index(previous)
         logger.info(
             "SARoEngine ready: %d incidents, %d MIT risks loaded",
             len(self._incidents),
             len(self._mit_risks),
         )
 
+    @classmethod
+    def from_snapshot(cls, snapshot: ReferenceSnapshot) -> SARoEngine:
+        """Bind a new engine to an already-loaded snapshot (no DB access)."""
+        eng = cls.__new__(cls)
+        eng._mit_risks = snapshot.mit_risks
+        eng._incidents = snapshot.incidents
+        eng._eu_rules = snapshot.eu_rules
+        eng._nist_controls = snapshot.nist_controls
+        eng._aigp = snapshot.aigp
+        eng._gov_rules = snapshot.gov_rules
+        eng._incident_index = snapshot.incident_index
+        eng._reference_version = snapshot.version
+        eng._reference_generation = snapshot.generation
+        return eng
+
+    def to_snapshot(self, version: str) -> ReferenceSnapshot:
+        """Freeze this engine's reference data into a shareable snapshot."""
+        return ReferenceSnapshot(
+            version=version,
+            generation=next(_snapshot_generations),
+            loaded_at=datetime.now(tz=timezone.utc),
+            mit_risks=self._mit_risks,
+            incidents=self._incidents,
+            eu_rules=self._eu_rules,
+            nist_controls=self._nist_controls,
+            aigp=self._aigp,
+            gov_rules=self._gov_rules,
+            incident_index=self._incident_index,
+        )
+
     # ── Reference data loading ────────────────────────────────────────────────
 
     def _load_reference_data(self, db: Session) -> None:
@@ -502,7 +1074,7 @@ class SARoEngine:
                     "url": r.url,
                     "is_fixed": r.is_fixed,
                 }
-                for r in db.query(AIIncident).all()
+                for r in db.query(AIIncident).order_by(AIIncident.id).all()
             ]
         except Exception as exc:
             logger.warning("ai_incidents table not accessible — using empty list: %s", exc)
@@ -565,24 +1137,36 @@ class SARoEngine:
             db.rollback()
             self._gov_rules = []
 
-    def _build_incident_index(self) -> None:
-        """Build a TF-IDF matrix over all incident texts for cosine similarity."""
-        if not self._incidents:
-            self._tfidf_vectorizer: TfidfVectorizer | None = None
-            self._incident_matrix = None
-            return
-
-        corpus = [
-            f"{inc['title']} {inc['description']} {inc['category']}"
-            for inc in self._incidents
-        ]
-        self._tfidf_vectorizer = TfidfVectorizer(
-            max_features=10_000,
-            ngram_range=(1, 2),
-            stop_words="english",
-            sublinear_tf=True,
-        )
-        self._incident_matrix = self._tfidf_vectorizer.fit_transform(corpus)
+    def _build_incident_index(self, previous: ReferenceSnapshot | None = None) -> None:
+        """
+        Build the TF-IDF incident index.
+
+        When ``previous`` holds an index over a prefix of the current incident
+        list (the usual case after an import appends rows), the new incidents
+        are added with the existing vectorizer instead of refitting.  Once the
+        appended rows exceed INCIDENT_INDEX_REFIT_RATIO of the fitted corpus,
+        the index is refitted so IDF weights and vocabulary catch up.
+
+        Fully fitted indexes are looked up in / saved to INCIDENT_INDEX_DIR by
+        corpus checksum, so a cold process maps a ready index from disk.  An
+        extended index is never saved: its vocabulary and IDF depend on the
+        corpus it was first fitted on, and a cold process with the same
+        corpus must get the same scores as a fresh fit.
+        """
+        corpus = [incident_text(inc) for inc in self._incidents]
+        prev_index = previous.incident_index if previous is not None else None
+        if prev_index is not None:
+            n_old = len(previous.incidents)
+            appended = len(corpus) - n_old
+            if (
+                n_old == len(prev_index)
+                and 0 <= appended <= INCIDENT_INDEX_REFIT_RATIO * prev_index.fitted_size
+                and corpus[:n_old] == [incident_text(inc) for inc in previous.incidents]
+            ):
+                self._incident_index = prev_index.add(corpus[n_old:])
+                logger.info("Incident index extended by %d incidents (no refit)", appended)
+                return
+        self._incident_index = load_or_build(corpus, INCIDENT_INDEX_DIR)
 
     def get_traces(self) -> list[dict]:
         """Return the trace records accumulated during the last run_audit() call."""
@@ -595,87 +1179,21 @@ class SARoEngine:
         Execute the full 4-gate pipeline and return a complete AuditReportOut.
 
         Gate 1 is the only hard-blocking gate: if <50 samples, we return
-        immediately with status="failed".
+        immediately with status="failed".  The batch goes through the same
+        AuditStream a streamed upload uses, so both produce identical reports.
         """
-        # Reset per-run trace accumulator
-        self._traces: list[dict] = []
-
-        created_at = datetime.now(tz=timezone.utc)
-        gates: list[_GateResult] = []
+        stream = self.open_stream(batch.batch_id, batch.dataset_name, batch.config)
+        stream.add(batch.samples)
+        return stream.finish(audit_id)
 
-        # ── Gate 1: Data Quality ──────────────────────────────────────────────
-        gate1 = self._gate1_data_quality(batch)
-        gates.append(gate1)
-        self._record_gate_trace(gate1)
-        if gate1.status == "fail":
-            # Cannot proceed — return a minimal failed report
-            return self._build_failed_report(audit_id, batch, gates, created_at)
-
-        # ── Gate 2: Fairness ──────────────────────────────────────────────────
-        gate2 = self._gate2_fairness(batch)
-        gates.append(gate2)
-        self._record_gate_trace(gate2)
-
-        # ── Gate 3: Risk Classification ───────────────────────────────────────
-        flags, gate3 = self._gate3_risk_classification(batch)
-        gates.append(gate3)
-        self._record_gate3_domain_traces(flags, gate3)
-
-        # ── Gate 4: Compliance Mapping ────────────────────────────────────────
-        applied_rules, gate4 = self._gate4_compliance_mapping(flags)
-        gates.append(gate4)
-        self._record_gate4_rule_traces(applied_rules, gate4)
-
-        # ── Bayesian Risk Scoring ─────────────────────────────────────────────
-        bayesian = self._compute_bayesian_scores(batch, flags)
-
-        # ── MIT Coverage ──────────────────────────────────────────────────────
-        mit_coverage = self._compute_mit_coverage(flags)
-
-        # ── Incident Matching ─────────────────────────────────────────────────
-        batch_text = " ".join(s.text for s in batch.samples[:200])  # cap for speed
-        similar_incidents = self._find_similar_incidents(
-            batch_text, top_k=batch.config.incident_top_k
-        )
-
-        # ── Fixed-Delta ───────────────────────────────────────────────────────
-        fixed_delta = self._compute_fixed_delta(similar_incidents)
-
-        # ── Remediations ──────────────────────────────────────────────────────
-        triggered_domains = {f.domain for f in flags}
-        remediations = self._build_remediations(triggered_domains)
-
-        # ── Overall confidence score ──────────────────────────────────────────
-        confidence = self._compute_confidence(batch, gate1, gate2)
-
-        # ── Gate scores summary ───────────────────────────────────────────────
-        gate_outs = [
-            GateResultOut(
-                gate_id=g.gate_id,
-                name=g.name,
-                status=g.status,  # type: ignore[arg-type]
-                score=round(g.score, 4),
-                details=g.details,
-            )
-            for g in gates
-        ]
-
-        return AuditReportOut(
-            audit_id=audit_id,
-            status="completed",
-            batch_id=batch.batch_id,
-            dataset_name=batch.dataset_name,
-            sample_count=len(batch.samples),
-            gates=gate_outs,
-            bayesian_scores=bayesian,
-            mit_coverage=mit_coverage,
-            similar_incidents=similar_incidents,
-            fixed_delta=fixed_delta,
-            applied_rules=applied_rules,
-            remediations=remediations,
-            confidence_score=round(confidence, 4),
-            created_at=created_at,
-        )
+    def open_stream(
+        self,
+        batch_id: str | None = None,
+        dataset_name: str | None = None,
+        config: AuditConfigIn | None = None,
+    ) -> AuditStream:
+        """Start an incremental audit; feed samples with add(), then finish()."""
+        return AuditStream(self, batch_id, dataset_name, config or AuditConfigIn())
 
     def run_output_audit(
         self,
@@ -697,28 +1215,112 @@ class SARoEngine:
         Confidence is capped at 0.80 to signal that single-output audits have
         less statistical power than full batch audits.
         """
-        self._traces = []
-        created_at = datetime.now(tz=timezone.utc)
-
-        # Combined text maximises signal surface: prompt context + raw output
-        combined_text = " ".join(filter(None, [prompt or "", raw_output])).strip()
+        key = self._output_cache_key(raw_output, prompt, source_model)
+        cached = _output_cache.get(key) if key else None
+        if cached is not None:
+            report, traces = _reuse_output(cached, audit_id)
+            self._traces = traces
+            return report
 
-        # 1-sample synthetic batch built via model_construct (bypasses validators)
-        sample = SampleIn(sample_id="output_0", text=combined_text or raw_output)
-        _cfg = AuditConfigIn.model_construct(
-            min_samples=1,
-            confidence_threshold=0.95,
-            incident_top_k=5,
-            frameworks=["EU AI Act", "NIST AI RMF", "AIGP", "ISO 42001"],
-        )
-        batch = BatchIn.model_construct(
-            batch_id=None,
-            dataset_name=f"Single Output ({source_model})",
-            samples=[sample],
-            config=_cfg,
-        )
+        self._traces = []
+        combined_text = _output_text(raw_output, prompt)
+        tally = _AuditTally()
+        tally.add(_SampleColumns.from_samples([SampleIn(sample_id="output_0", text=combined_text)]))
+        similar_incidents = self._find_similar_incidents(combined_text, top_k=5)
+        report = self._output_report(audit_id, tally, similar_incidents, source_model)
+        if key:
+            _output_cache.set(key, (report, tuple(self._traces)))
+        return report
+
+    def run_output_audits(
+        self, outputs: Sequence[tuple[uuid.UUID, str, str | None, str]]
+    ) -> list[tuple[AuditReportOut, list[dict]]]:
+        """
+        run_output_audit() for many ``(audit_id, raw_output, prompt,
+        source_model)`` items, returning each report with its trace records.
+
+        The per-output work that dominates is done once for the whole list:
+        one Gate 3 signal scan (sharded like a batch), one incident-index
+        product, and one Gate 4 rule mapping per distinct set of triggered
+        domains.  Cached outputs — and repeats within the list — are not
+        recomputed.  Reports are identical to run_output_audit()'s.
+        """
+        results: list[tuple[AuditReportOut, list[dict]] | None] = [None] * len(outputs)
+        keys = [self._output_cache_key(raw, prompt, model) for _, raw, prompt, model in outputs]
+        pending: dict[str | int, list[int]] = {}  # cache key (or position) → positions
+        for i, key in enumerate(keys):
+            cached = _output_cache.get(key) if key else None
+            if cached is not None:
+                results[i] = _reuse_output(cached, outputs[i][0])
+            else:
+                pending.setdefault(key or i, []).append(i)
+
+        computed = self._run_output_audits([outputs[pos[0]] for pos in pending.values()])
+        for positions, (report, traces) in zip(pending.values(), computed):
+            if keys[positions[0]]:
+                _output_cache.set(keys[positions[0]], (report, tuple(traces)))
+            results[positions[0]] = (report, traces)
+            for i in positions[1:]:
+                results[i] = _reuse_output((report, traces), outputs[i][0])
+        return results  # type: ignore[return-value]
+
+    def _run_output_audits(
+        self, outputs: Sequence[tuple[uuid.UUID, str, str | None, str]]
+    ) -> list[tuple[AuditReportOut, list[dict]]]:
+        """The vectorised (uncached) body of run_output_audits()."""
+        if not outputs:
+            return []
+        texts = [_output_text(raw_output, prompt) for _, raw_output, prompt, _ in outputs]
+        codes = _scan_signals(texts)
+        if self._incident_index is None:
+            matches: list[list[tuple[int, float]]] = [[] for _ in texts]
+        else:
+            matches = self._incident_index.search_each(texts, top_k=5, min_score=0.01)
+        gate4_cache: dict[frozenset[str], tuple[list[AppliedRuleOut], _GateResult]] = {}
+
+        results: list[tuple[AuditReportOut, list[dict]]] = []
+        for i, (audit_id, _, _, source_model) in enumerate(outputs):
+            self._traces = []
+            tally = _AuditTally()
+            tally.add(
+                _SampleColumns.from_samples([SampleIn(sample_id="output_0", text=texts[i])]),
+                codes=codes[i:i + 1],
+            )
+            similar_incidents = [self._similar_incident_out(idx, sim) for idx, sim in matches[i]]
+            report = self._output_report(
+                audit_id, tally, similar_incidents, source_model, gate4_cache
+            )
+            results.append((report, self._traces))
+        self._traces = []
+        return results
 
-        gates: list[_GateResult] = []
+    def _output_cache_key(self, raw_output: str, prompt: str | None, source_model: str) -> str | None:
+        """
+        SHA-256 over the engine version, the reference snapshot's version and
+        generation, and the output's content; None (no caching) unless the
+        engine was built from a fingerprinted snapshot.  Every snapshot load
+        starts a new generation, so a reference reload never serves stale hits.
+        """
+        version = getattr(self, "_reference_version", None)
+        if version in (None, "unversioned") or OUTPUT_AUDIT_CACHE_TTL <= 0:
+            return None
+        generation = str(getattr(self, "_reference_generation", 0))
+        h = hashlib.sha256()
+        for part in (ENGINE_VERSION, version, generation, source_model, prompt or "", raw_output):
+            h.update(part.encode())
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _output_report(
+        self,
+        audit_id: uuid.UUID,
+        tally: _AuditTally,
+        similar_incidents: list[SimilarIncidentOut],
+        source_model: str,
+        gate4_cache: dict | None = None,
+    ) -> AuditReportOut:
+        """Gates 1-2 (skipped) then Gates 3-4 over a single output's 1-sample tally."""
+        created_at = datetime.now(tz=timezone.utc)
 
         # Gate 1: Skipped — data quality / 50-sample threshold not applicable
         gate1 = _GateResult(
@@ -734,7 +1336,6 @@ class SARoEngine:
                 "source_model": source_model,
             },
         )
-        gates.append(gate1)
         self._record_gate_trace(gate1)
 
         # Gate 2: Skipped — statistical fairness requires labelled batch data
@@ -751,46 +1352,80 @@ class SARoEngine:
                 ),
             },
         )
-        gates.append(gate2)
         self._record_gate_trace(gate2)
 
-        # Gate 3: Risk Classification (full MIT taxonomy on combined text)
-        flags, gate3 = self._gate3_risk_classification(batch)
+        # Confidence capped at 0.80 — single-output has less statistical power
+        return self._complete_report(
+            audit_id,
+            batch_id=None,
+            dataset_name=f"Single Output ({source_model})",
+            tally=tally,
+            gate1=gate1,
+            gate2=gate2,
+            similar_incidents=similar_incidents,
+            created_at=created_at,
+            max_confidence=0.80,
+            gate4_cache=gate4_cache,
+        )
+
+    def _complete_report(
+        self,
+        audit_id: uuid.UUID,
+        batch_id: str | None,
+        dataset_name: str | None,
+        tally: _AuditTally,
+        gate1: _GateResult,
+        gate2: _GateResult,
+        similar_incidents: list[SimilarIncidentOut],
+        created_at: datetime,
+        max_confidence: float = 1.0,
+        gate4_cache: dict | None = None,
+    ) -> AuditReportOut:
+        """
+        Gates 3-4 and scoring over a tally whose Gates 1-2 already ran.
+        ``gate4_cache`` shares Gate 4 mappings across reports of one call.
+        """
+        gates = [gate1, gate2]
+
+        # ── Gate 3: Risk Classification ───────────────────────────────────────
+        gate3 = self._gate3_risk_classification(tally)
         gates.append(gate3)
-        self._record_gate3_domain_traces(flags, gate3)
+        self._record_gate3_domain_traces(tally, gate3)
 
-        # Gate 4: Compliance Mapping
-        applied_rules, gate4 = self._gate4_compliance_mapping(flags)
+        # ── Gate 4: Compliance Mapping ────────────────────────────────────────
+        triggered_domains = tally.triggered_domains
+        if gate4_cache is None:
+            applied_rules, gate4 = self._gate4_compliance_mapping(triggered_domains)
+        else:
+            key = frozenset(triggered_domains)
+            if key not in gate4_cache:
+                gate4_cache[key] = self._gate4_compliance_mapping(triggered_domains)
+            applied_rules, gate4 = gate4_cache[key]
         gates.append(gate4)
         self._record_gate4_rule_traces(applied_rules, gate4)
 
-        # Scoring
-        bayesian = self._compute_bayesian_scores(batch, flags)
-        mit_coverage = self._compute_mit_coverage(flags)
-        similar_incidents = self._find_similar_incidents(combined_text, top_k=5)
+        # ── Bayesian Risk Scoring ─────────────────────────────────────────────
+        bayesian = self._compute_bayesian_scores(tally)
+
+        # ── MIT Coverage ──────────────────────────────────────────────────────
+        mit_coverage = self._compute_mit_coverage(tally)
+
+        # ── Fixed-Delta ───────────────────────────────────────────────────────
         fixed_delta = self._compute_fixed_delta(similar_incidents)
-        triggered_domains = {f.domain for f in flags}
-        remediations = self._build_remediations(triggered_domains)
 
-        # Confidence capped at 0.80 — single-output has less statistical power
-        confidence = min(0.80, self._compute_confidence(batch, gate1, gate2))
+        # ── Remediations ──────────────────────────────────────────────────────
+        remediations = self._build_remediations(triggered_domains)
 
-        gate_outs = [
-            GateResultOut(
-                gate_id=g.gate_id, name=g.name,
-                status=g.status,  # type: ignore[arg-type]
-                score=round(g.score, 4), details=g.details,
-            )
-            for g in gates
-        ]
+        # ── Overall confidence score ──────────────────────────────────────────
+        confidence = min(max_confidence, self._compute_confidence(tally.n, gate1, gate2))
 
         return AuditReportOut(
             audit_id=audit_id,
             status="completed",
-            batch_id=None,
-            dataset_name=f"Single Output ({source_model})",
-            sample_count=1,
-            gates=gate_outs,
+            batch_id=batch_id,
+            dataset_name=dataset_name,
+            sample_count=tally.n,
+            gates=_gate_outs(gates),
             bayesian_scores=bayesian,
             mit_coverage=mit_coverage,
             similar_incidents=similar_incidents,
@@ -803,12 +1438,12 @@ class SARoEngine:
 
     # ── Gate 1: Data Quality ──────────────────────────────────────────────────
 
-    def _gate1_data_quality(self, batch: BatchIn) -> _GateResult:
+    def _gate1_data_quality(self, tally: _AuditTally) -> _GateResult:
         """
         Enforce minimum 50 samples (EU AI Act Art. 10, NIST MAP 2.3) and
         check basic data hygiene.
         """
-        n = len(batch.samples)
+        n = tally.n
         if n < MIN_SAMPLES:
             return _GateResult(
                 gate_id=1,
@@ -823,14 +1458,13 @@ class SARoEngine:
                 },
             )
 
-        texts = [s.text for s in batch.samples]
-        empty_count = sum(1 for t in texts if not t.strip())
+        empty_count = tally.empty_count
         null_rate = empty_count / n
 
-        lengths = [len(t.split()) for t in texts]
-        mean_len = float(np.mean(lengths))
-        std_len = float(np.std(lengths))
-        very_short = sum(1 for ln in lengths if ln < 3)
+        # Population mean / std from the running sums (exact integer moments)
+        mean_len = tally.token_sum / n
+        std_len = float(np.sqrt(max(0, n * tally.token_sq_sum - tally.token_sum**2))) / n
+        very_short = tally.very_short
         short_rate = very_short / n
 
         # Score: penalise null rate and very short samples
@@ -861,7 +1495,7 @@ class SARoEngine:
 
     # ── Gate 2: Fairness ──────────────────────────────────────────────────────
 
-    def _gate2_fairness(self, batch: BatchIn) -> _GateResult:
+    def _gate2_fairness(self, tally: _AuditTally) -> _GateResult:
         """
         Fairness analysis per EU AI Act Art. 10 and NIST MAP 2.3.
 
@@ -869,10 +1503,7 @@ class SARoEngine:
         difference.  When absent, the gate WARNS but does not fail — the caller
         must supply group labels for a full fairness audit.
         """
-        groups = [s.group for s in batch.samples if s.group is not None]
-        labels = [s.label for s in batch.samples if s.label is not None]
-
-        if not groups:
+        if not tally.with_group:
             return _GateResult(
                 gate_id=2,
                 name="Fairness (EU AI Act Art. 10 / NIST MAP 2.3)",
@@ -883,15 +1514,12 @@ class SARoEngine:
                     "full statistical parity analysis unavailable.",
                     "reference": "EU AI Act Art. 10 / NIST MAP 2.3",
                     "samples_with_group": 0,
-                    "samples_with_label": len(labels),
+                    "samples_with_label": tally.with_label,
                 },
             )
 
-        # Build group → label distribution
-        group_label_map: dict[str, list[str]] = {}
-        for s in batch.samples:
-            if s.group and s.label:
-                group_label_map.setdefault(s.group, []).append(s.label)
+        # group → (labelled, positive) counts, tallied as samples arrived
+        group_label_map = tally.group_labels
 
         if len(group_label_map) < 2:
             return _GateResult(
@@ -907,9 +1535,7 @@ class SARoEngine:
 
         # Compute positive label rate per group (positive = non-"safe" label)
         positive_rates: dict[str, float] = {}
-        for grp, lbls in group_label_map.items():
-            n_grp = len(lbls)
-            n_pos = sum(1 for lb in lbls if lb.lower() not in ("safe", "benign", "0", "false"))
+        for grp, (n_grp, n_pos) in group_label_map.items():
             positive_rates[grp] = n_pos / n_grp if n_grp else 0.0
 
         rates = list(positive_rates.values())
@@ -940,50 +1566,13 @@ class SARoEngine:
 
     # ── Gate 3: Risk Classification ───────────────────────────────────────────
 
-    def _gate3_risk_classification(
-        self, batch: BatchIn
-    ) -> tuple[list[_SampleFlag], _GateResult]:
+    def _gate3_risk_classification(self, tally: _AuditTally) -> _GateResult:
         """
         Classify each sample against the 7 MIT risk domains using keyword and
-        regex pattern matching.  Returns per-sample flags and a gate result.
+        regex pattern matching (done per sample in _AuditTally.add).
         """
-        flags: list[_SampleFlag] = []
-        domain_counts: dict[str, int] = {d: 0 for d in MIT_DOMAINS}
-
-        for sample in batch.samples:
-            text_lower = sample.text.lower()
-            for domain, signals in _RISK_SIGNALS.items():
-                matched = False
-                matched_signal = ""
-
-                # Keyword matching
-                for kw in signals["keywords"]:
-                    if re.search(kw, text_lower):
-                        matched = True
-                        matched_signal = f"keyword:{kw}"
-                        break
-
-                # Regex pattern matching (if keyword didn't already match)
-                if not matched:
-                    for pat in signals["patterns"]:
-                        if pat.search(sample.text):
-                            matched = True
-                            matched_signal = f"pattern:{pat.pattern[:40]}"
-                            break
-
-                if matched:
-                    flags.append(
-                        _SampleFlag(
-                            sample_id=sample.sample_id,
-                            domain=domain,
-                            signal=matched_signal,
-                            weight=signals["weight"],
-                        )
-                    )
-                    domain_counts[domain] += 1
-
-        n = len(batch.samples)
-        total_flagged = len({f.sample_id for f in flags})
+        n = tally.n
+        total_flagged = tally.flagged_samples
         flag_rate = total_flagged / n if n else 0.0
 
         # Score: fraction of samples with no flags (inverse risk exposure)
@@ -995,7 +1584,7 @@ class SARoEngine:
         else:
             status = "pass"
 
-        return flags, _GateResult(
+        return _GateResult(
             gate_id=3,
             name="Risk Classification (MIT Taxonomy)",
             status=status,
@@ -1004,15 +1593,15 @@ class SARoEngine:
                 "total_samples": n,
                 "flagged_samples": total_flagged,
                 "flag_rate": round(flag_rate, 4),
-                "domain_counts": domain_counts,
-                "total_flags": len(flags),
+                "domain_counts": dict(tally.domain_counts),
+                "total_flags": tally.total_flags,
             },
         )
 
     # ── Gate 4: Compliance Mapping ────────────────────────────────────────────
 
     def _gate4_compliance_mapping(
-        self, flags: list[_SampleFlag]
+        self, triggered_domains: set[str]
     ) -> tuple[list[AppliedRuleOut], _GateResult]:
         """
         Map flagged domains to compliance rules across EU AI Act, NIST AI RMF,
@@ -1021,7 +1610,6 @@ class SARoEngine:
         Also enriches rule entries with obligation text from the reference DB
         when available.
         """
-        triggered_domains = {f.domain for f in flags}
         applied: list[AppliedRuleOut] = []
         seen_rule_ids: set[str] = set()
 
@@ -1113,24 +1701,23 @@ class SARoEngine:
             "remediation_hint": remediation,
         })
 
-    def _record_gate3_domain_traces(self, flags: list, gate: object) -> None:
+    def _record_gate3_domain_traces(self, tally: _AuditTally, gate: object) -> None:
         """
         Record one trace per MIT domain — 'flagged' when signals were detected,
         'pass' when the domain was clean.
         """
-        from collections import defaultdict
-        domain_flags: dict[str, list[dict]] = defaultdict(list)
-        for f in flags:
-            domain_flags[f.domain].append({"sample_id": f.sample_id, "signal": f.signal, "weight": f.weight})
-
         for domain in MIT_DOMAINS:
-            df = domain_flags.get(domain, [])
+            count = tally.domain_counts[domain]
+            df = [
+                {"sample_id": f.sample_id, "signal": f.signal, "weight": f.weight}
+                for f in tally.flag_examples.get(domain, [])
+            ]
             if df:
                 result = "flagged"
                 reason = (
-                    f"{len(df)} risk signal(s) detected in domain '{domain}'. "
+                    f"{count} risk signal(s) detected in domain '{domain}'. "
                     f"Sample signals: {', '.join(d['signal'] for d in df[:3])}"
-                    + (" …" if len(df) > 3 else "")
+                    + (" …" if count > 3 else "")
                 )
                 remediation = _DOMAIN_REMEDIATION_HINTS.get(domain)
             else:
@@ -1145,7 +1732,7 @@ class SARoEngine:
                 "check_name": domain,
                 "result": result,
                 "reason": reason,
-                "detail_json": {"flagged_signals": df[:20]} if df else {},
+                "detail_json": {"flagged_signals": df} if df else {},
                 "remediation_hint": remediation,
             })
 
@@ -1184,73 +1771,48 @@ class SARoEngine:
 
     # ── Bayesian Risk Scoring ─────────────────────────────────────────────────
 
-    def _compute_bayesian_scores(
-        self, batch: BatchIn, flags: list[_SampleFlag]
-    ) -> BayesianScoresOut:
+    def _compute_bayesian_scores(self, tally: _AuditTally) -> BayesianScoresOut:
         """
         Per-domain Beta-Binomial posterior risk probability with 95 % CI.
 
         Prior: Beta(α₀=BAYESIAN_PRIOR, β₀=BAYESIAN_PRIOR)  (Jeffreys = 0.5)
         Posterior: Beta(α₀+k, β₀+n-k)  where k = flagged samples in domain
         """
-        n = len(batch.samples)
-        alpha0 = beta0 = BAYESIAN_PRIOR
-        ci_low = (1.0 - CI_LEVEL) / 2
-        ci_high = 1.0 - ci_low
-
-        # Count unique flagged sample IDs per domain
-        domain_flagged: dict[str, set[str]] = {d: set() for d in MIT_DOMAINS}
-        for f in flags:
-            domain_flagged[f.domain].add(f.sample_id)
-
-        domain_scores: list[BayesianDomainScore] = []
-        overall_flagged_unique: set[str] = set()
-
-        for domain in MIT_DOMAINS:
-            k = len(domain_flagged[domain])
-            overall_flagged_unique.update(domain_flagged[domain])
-            alpha_post = alpha0 + k
-            beta_post = beta0 + (n - k)
-            distribution = stats.beta(alpha_post, beta_post)
-            risk_prob = distribution.mean()
-            ci_l = distribution.ppf(ci_low)
-            ci_u = distribution.ppf(ci_high)
-
-            domain_scores.append(
-                BayesianDomainScore(
-                    domain=domain,
-                    risk_probability=round(float(risk_prob), 4),
-                    ci_lower=round(float(ci_l), 4),
-                    ci_upper=round(float(ci_u), 4),
-                    sample_count=n,
-                    flagged_count=k,
-                )
+        n = tally.n
+
+        # A sample flags a domain at most once, so per-domain flag counts are
+        # flagged-sample counts; the overall posterior uses samples with ANY flag.
+        ks = [tally.domain_counts[d] for d in MIT_DOMAINS] + [tally.flagged_samples]
+        posteriors = _beta_posteriors(ks, n, BAYESIAN_PRIOR, CI_LEVEL)
+
+        domain_scores = [
+            BayesianDomainScore(
+                domain=domain,
+                risk_probability=round(risk_prob, 4),
+                ci_lower=round(ci_l, 4),
+                ci_upper=round(ci_u, 4),
+                sample_count=n,
+                flagged_count=k,
             )
-
-        # Overall posterior: proportion of samples with ANY flag
-        k_overall = len(overall_flagged_unique)
-        alpha_ov = alpha0 + k_overall
-        beta_ov = beta0 + (n - k_overall)
-        overall_prob = stats.beta(alpha_ov, beta_ov).mean()
+            for domain, k, (risk_prob, ci_l, ci_u) in zip(MIT_DOMAINS, ks, posteriors)
+        ]
+        overall_prob = posteriors[-1][0]
 
         return BayesianScoresOut(
-            overall=round(float(overall_prob), 4),
+            overall=round(overall_prob, 4),
             by_domain=domain_scores,
         )
 
     # ── MIT Coverage Score ────────────────────────────────────────────────────
 
-    def _compute_mit_coverage(self, flags: list[_SampleFlag]) -> MITCoverageOut:
+    def _compute_mit_coverage(self, tally: _AuditTally) -> MITCoverageOut:
         """
         MIT Risk Coverage Score = # domains with ≥1 detection / total domains.
 
         A higher score indicates broader risk awareness; a lower score may
         indicate the model only raises narrow risk types.
         """
-        domain_counts: dict[str, int] = {d: 0 for d in MIT_DOMAINS}
-        for f in flags:
-            domain_counts[f.domain] += 1
-
+        domain_counts = dict(tally.domain_counts)
         covered = [d for d, cnt in domain_counts.items() if cnt > 0]
         uncovered = [d for d, cnt in domain_counts.items() if cnt == 0]
         score = len(covered) / len(MIT_DOMAINS) if MIT_DOMAINS else 0.0
@@ -1259,7 +1821,7 @@ class SARoEngine:
             score=round(score, 4),
             covered_domains=covered,
             uncovered_domains=uncovered,
-            total_risks_flagged=len(flags),
+            total_risks_flagged=tally.total_flags,
             domain_risk_counts=domain_counts,
         )
 
@@ -1270,35 +1832,51 @@ class SARoEngine:
     ) -> list[SimilarIncidentOut]:
         """
         Return the top-K incidents most similar to the batch text,
-        ranked by TF-IDF cosine similarity.
+        ranked by TF-IDF cosine similarity (see IncidentIndex.search).
         """
-        if self._tfidf_vectorizer is None or self._incident_matrix is None:
+        if self._incident_index is None:
             return []
 
-        query_vec = self._tfidf_vectorizer.transform([batch_text])
-        sims = cosine_similarity(query_vec, self._incident_matrix).flatten()
-        top_indices = np.argsort(sims)[::-1][:top_k]
-
-        results: list[SimilarIncidentOut] = []
-        for idx in top_indices:
-            inc = self._incidents[idx]
-            sim = float(sims[idx])
-            if sim < 0.01:
-                continue  # Skip effectively zero-similarity results
-            results.append(
-                SimilarIncidentOut(
-                    incident_id=inc["incident_id"],
-                    title=inc["title"],
-                    category=inc["category"],
-                    harm_type=inc.get("harm_type"),
-                    affected_sector=inc.get("affected_sector"),
-                    date=inc.get("date"),
-                    url=inc.get("url"),
-                    similarity_score=round(sim, 4),
-                    is_fixed=inc.get("is_fixed", False),
-                )
+        # Skip effectively zero-similarity results
+        return [
+            self._similar_incident_out(idx, sim)
+            for idx, sim in self._incident_index.search(batch_text, top_k, min_score=0.01)
+        ]
+
+    def _find_similar_incidents_per_sample(
+        self, matches: IncidentMatchAccumulator, top_k: int = INCIDENT_TOP_K, aggregation: str = "max"
+    ) -> list[SimilarIncidentOut]:
+        """
+        Rank incidents by the max or mean per-sample similarity accumulated
+        over every sample (not a truncated concatenation).  Each result names
+        the samples that matched it best.
+        """
+        return [
+            self._similar_incident_out(
+                idx,
+                sim,
+                matched_samples=[
+                    SampleMatchOut(sample_id=sample_id, similarity_score=round(sample_sim, 4))
+                    for sample_id, sample_sim in attributions
+                ],
             )
-        return results
+            for idx, sim, attributions in matches.top(top_k, min_score=0.01, aggregation=aggregation)
+        ]
+
+    def _similar_incident_out(self, idx: int, sim: float, **extra: Any) -> SimilarIncidentOut:
+        inc = self._incidents[idx]
+        return SimilarIncidentOut(
+            incident_id=inc["incident_id"],
+            title=inc["title"],
+            category=inc["category"],
+            harm_type=inc.get("harm_type"),
+            affected_sector=inc.get("affected_sector"),
+            date=inc.get("date"),
+            url=inc.get("url"),
+            similarity_score=round(sim, 4),
+            is_fixed=inc.get("is_fixed", False),
+            **extra,
+        )
 
     # ── Fixed-Delta ───────────────────────────────────────────────────────────
 
@@ -1326,7 +1904,7 @@ class SARoEngine:
 
         # Wilson score confidence for the fixed proportion
         p_hat = fixed / n
-        z = stats.norm.ppf((1 + CI_LEVEL) / 2)
+        z = _Z_CI
         denominator = 1 + z**2 / n
         centre = (p_hat + z**2 / (2 * n)) / denominator
         margin = (z * np.sqrt(p_hat * (1 - p_hat) / n + z**2 / (4 * n**2))) / denominator
@@ -1363,9 +1941,7 @@ class SARoEngine:
 
     # ── Confidence Score ──────────────────────────────────────────────────────
 
-    def _compute_confidence(
-        self, batch: BatchIn, gate1: _GateResult, gate2: _GateResult
-    ) -> float:
+    def _compute_confidence(self, n: int, gate1: _GateResult, gate2: _GateResult) -> float:
         """
         Heuristic confidence score based on sample size and data quality.
 
@@ -1373,7 +1949,6 @@ class SARoEngine:
         Data quality gate score: weighted contribution
         Fairness gate score: weighted contribution
         """
-        n = len(batch.samples)
         size_bonus = min(1.0, n / 200)  # saturates at 200 samples
         quality_weight = gate1.score * 0.60
         fairness_weight = gate2.score * 0.25
@@ -1385,20 +1960,12 @@ class SARoEngine:
     def _build_failed_report(
         self,
         audit_id: uuid.UUID,
-        batch: BatchIn,
+        batch_id: str | None,
+        dataset_name: str | None,
+        sample_count: int,
         gates: list[_GateResult],
         created_at: datetime,
     ) -> AuditReportOut:
-        gate_outs = [
-            GateResultOut(
-                gate_id=g.gate_id,
-                name=g.name,
-                status=g.status,  # type: ignore[arg-type]
-                score=round(g.score, 4),
-                details=g.details,
-            )
-            for g in gates
-        ]
         empty_bayesian = BayesianScoresOut(
             overall=0.0,
             by_domain=[
@@ -1416,10 +1983,10 @@ class SARoEngine:
         return AuditReportOut(
             audit_id=audit_id,
             status="failed",
-            batch_id=batch.batch_id,
-            dataset_name=batch.dataset_name,
-            sample_count=len(batch.samples),
-            gates=gate_outs,
+            batch_id=batch_id,
+            dataset_name=dataset_name,
+            sample_count=sample_count,
+            gates=_gate_outs(gates),
             bayesian_scores=empty_bayesian,
             mit_coverage=MITCoverageOut(
                 score=0.0,
@@ -1437,3 +2004,228 @@ class SARoEngine:
             confidence_score=0.0,
             created_at=created_at,
         )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Streaming audits
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _gate_outs(gates: list[_GateResult]) -> list[GateResultOut]:
+    return [
+        GateResultOut(
+            gate_id=g.gate_id,
+            name=g.name,
+            status=g.status,  # type: ignore[arg-type]
+            score=round(g.score, 4),
+            details=g.details,
+        )
+        for g in gates
+    ]
+
+
+class AuditStream:
+    """
+    Incremental batch audit: samples are folded into running accumulators
+    (_AuditTally, plus the per-sample incident accumulator when enabled) as
+    they arrive and then dropped, so memory does not grow with batch size.
+
+        stream = engine.open_stream(batch_id, dataset_name, config)
+        for chunk in chunks:
+            stream.add(chunk)
+        report = stream.finish(audit_id)
+
+    Not thread-safe; feed one stream from one caller at a time.
+    """
+
+    def __init__(
+        self,
+        engine: SARoEngine,
+        batch_id: str | None,
+        dataset_name: str | None,
+        config: AuditConfigIn,
+    ) -> None:
+        self.engine = engine
+        self.batch_id = batch_id
+        self.dataset_name = dataset_name
+        self.config = config
+        self.created_at = datetime.now(tz=timezone.utc)
+        self._tally = _AuditTally()
+        self._matches: IncidentMatchAccumulator | None = None
+        if config.incident_matching == "per_sample" and engine._incident_index is not None:
+            self._matches = IncidentMatchAccumulator(engine._incident_index)
+
+    @property
+    def sample_count(self) -> int:
+        return self._tally.n
+
+    def add(self, samples: Sequence[SampleIn]) -> None:
+        """Fold the next chunk of samples into the running totals."""
+        if samples:
+            self._add_columns(_SampleColumns.from_samples(samples))
+
+    def add_rows(self, rows: Sequence[SampleRow]) -> None:
+        """Like add(), for SampleRow dicts from the bulk (TypeAdapter) path."""
+        if rows:
+            self._add_columns(_SampleColumns.from_rows(rows, offset=self._tally.n))
+
+    def _add_columns(self, cols: _SampleColumns) -> None:
+        self._tally.add(cols)
+        if self._matches is not None:
+            self._matches.add(cols.texts, keys=cols.sample_ids)
+
+    def finish(self, audit_id: uuid.UUID) -> AuditReportOut:
+        """Run the gates over everything added so far and build the report."""
+        engine, tally, config = self.engine, self._tally, self.config
+        engine._traces = []
+
+        # ── Gate 1: Data Quality ──────────────────────────────────────────────
+        gate1 = engine._gate1_data_quality(tally)
+        engine._record_gate_trace(gate1)
+        if gate1.status == "fail":
+            # Cannot proceed — return a minimal failed report
+            return engine._build_failed_report(
+                audit_id, self.batch_id, self.dataset_name, tally.n, [gate1], self.created_at
+            )
+
+        # ── Gate 2: Fairness ──────────────────────────────────────────────────
+        gate2 = engine._gate2_fairness(tally)
+        engine._record_gate_trace(gate2)
+
+        # ── Incident Matching ─────────────────────────────────────────────────
+        if self._matches is not None:
+            similar_incidents = engine._find_similar_incidents_per_sample(
+                self._matches,
+                top_k=config.incident_top_k,
+                aggregation=config.incident_aggregation,
+            )
+        elif config.incident_matching == "per_sample":
+            similar_incidents = []  # no incident corpus loaded
+        else:
+            batch_text = " ".join(tally.head_texts)  # first 200 samples, capped for speed
+            similar_incidents = engine._find_similar_incidents(
+                batch_text, top_k=config.incident_top_k
+            )
+
+        return engine._complete_report(
+            audit_id,
+            batch_id=self.batch_id,
+            dataset_name=self.dataset_name,
+            tally=tally,
+            gate1=gate1,
+            gate2=gate2,
+            similar_incidents=similar_incidents,
+            created_at=self.created_at,
+        )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Shared reference snapshot
+# ─────────────────────────────────────────────────────────────────────────────
+#
+# One snapshot per process.  Readers grab the module-level reference (an atomic
+# operation under the GIL); writers build a complete replacement off to the
+# side and swap it in under _snapshot_lock, so a request never observes a
+# half-loaded snapshot.
+
+_REFERENCE_MODELS = (MITRisk, AIIncident, EUAIActRule, NISTControl, AIGPPrinciple, GovernanceRule)
+
+_snapshot: ReferenceSnapshot | None = None
+_snapshot_lock = threading.Lock()
+_snapshot_checked_at: float = 0.0
+_snapshot_generations = itertools.count(1)
+
+# Columns reference loads may UPDATE in place without touching the timestamp
+# the fingerprint reads; their sums stand in for the rows' content.
+_FINGERPRINT_CONTENT = {
+    AIIncident: lambda m: [func.sum(case((m.is_fixed, 1), else_=0))],
+    MITRisk: lambda m: [func.sum(func.length(m.domain)), func.sum(func.length(m.sub_domain))],
+}
+
+
+def reference_fingerprint(db: Session) -> str | None:
+    """
+    Return a cheap checksum of the reference tables' contents.
+
+    One round trip: row count, max primary key and latest timestamp of each
+    table, plus content sums over the columns _FINGERPRINT_CONTENT lists for
+    tables without a last-updated timestamp.  Returns None when the tables cannot be read (the snapshot is then
+    kept as-is rather than rebuilt on every request).
+    """
+    columns = []
+    for model in _REFERENCE_MODELS:
+        ts_col = getattr(model, "last_updated", None) or getattr(model, "created_at")
+        columns += [
+            select(func.count(model.id)).scalar_subquery(),
+            select(func.max(model.id)).scalar_subquery(),
+            select(func.max(ts_col)).scalar_subquery(),
+        ]
+        content = _FINGERPRINT_CONTENT.get(model)
+        if content is not None:
+            columns += [select(agg).scalar_subquery() for agg in content(model)]
+    try:
+        row = db.execute(select(*columns)).one()
+    except Exception as exc:
+        logger.warning("Could not fingerprint reference tables: %s", exc)
+        db.rollback()
+        return None
+    return hashlib.sha256(repr(tuple(row)).encode()).hexdigest()[:16]
+
+
+def load_reference_snapshot(db: Session) -> ReferenceSnapshot:
+    """
+    Build a fresh snapshot from the DB and atomically make it current.
+    Cached single-output results from earlier snapshots are dropped.
+    """
+    global _snapshot, _snapshot_checked_at
+    version = reference_fingerprint(db) or "unversioned"
+    snapshot = SARoEngine(db, previous=_snapshot).to_snapshot(version)
+    with _snapshot_lock:
+        _snapshot = snapshot
+        _snapshot_checked_at = time.monotonic()
+    clear_output_cache()
+    logger.info(
+        "Reference snapshot %s loaded: %d incidents, %d MIT risks",
+        version, len(snapshot.incidents), len(snapshot.mit_risks),
+    )
+    return snapshot
+
+
+def current_reference_snapshot() -> ReferenceSnapshot | None:
+    """Return the snapshot currently served to requests (None before warm-up)."""
+    return _snapshot
+
+
+def _refresh_if_stale(db: Session, snapshot: ReferenceSnapshot) -> ReferenceSnapshot:
+    """Re-fingerprint at most once per interval; rebuild only on change."""
+    global _snapshot_checked_at
+    if time.monotonic() - _snapshot_checked_at < REFERENCE_CHECK_INTERVAL:
+        return snapshot
+    # Only one request pays for the check; the others keep serving the
+    # current snapshot instead of queueing behind the lock.
+    if not _snapshot_lock.acquire(blocking=False):
+        return snapshot
+    try:
+        _snapshot_checked_at = time.monotonic()
+        version = reference_fingerprint(db)
+    finally:
+        _snapshot_lock.release()
+    if version is None or version == snapshot.version:
+        return snapshot
+    logger.info("Reference tables changed (%s → %s) — reloading", snapshot.version, version)
+    return load_reference_snapshot(db)
+
+
+def get_audit_engine(db: Session) -> SARoEngine:
+    """
+    Return a per-request engine bound to the shared reference snapshot.
+
+    The snapshot is built on first use (normally at startup) and is only
+    rebuilt when reference_fingerprint() reports a change.
+    """
+    snapshot = _snapshot
+    if snapshot is None:
+        snapshot = load_reference_snapshot(db)
+    else:
+        snapshot = _refresh_if_stale(db, snapshot)
+    return SARoEngine.from_snapshot(snapshot)
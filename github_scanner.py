@@ -0,0 +1,287 @@
+"""
+SARO GitHub code scanner
+========================
+Read-only client for the GitHub correlation scan (routers/github_integration.py).
+
+    • One pooled ``httpx.Client`` per process (keep-alive across searches,
+      snippet fetches and audits) instead of a fresh connection per call.
+    • Code searches and snippet fetches run on a thread pool bounded by
+      GITHUB_SCAN_CONCURRENCY; results keep the serial scan's order and cap,
+      and no more searches are issued than the cap could still need.
+    • X-RateLimit-Remaining / X-RateLimit-Reset (and Retry-After) are honoured
+      per token and per X-RateLimit-Resource: when a budget is spent, calls
+      against it wait for the reset — at most GITHUB_RATE_LIMIT_MAX_WAIT
+      seconds — rather than hammering a 403.
+    • Snippets are cached per (repo, path, blob sha): an unchanged file is
+      never downloaded twice, across scans and audits.
+
+GITHUB_API_URL overrides the API base (GitHub Enterprise, or a local stub in
+tests).  Full file content is never returned — only a short snippet + SHA-256.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_SCAN_CONCURRENCY = max(1, int(os.environ.get("GITHUB_SCAN_CONCURRENCY", "8")))
+GITHUB_RATE_LIMIT_MAX_WAIT = float(os.environ.get("GITHUB_RATE_LIMIT_MAX_WAIT", "30"))
+_REQUEST_TIMEOUT = 10.0
+_SNIPPET_MAX_CHARS = 500  # max snippet length stored per file — never full file
+
+# Blob shas are content hashes, so a cached snippet can only go stale by
+# eviction; the TTL just bounds memory held for repos nobody scans anymore.
+_snippet_cache: TTLCache[tuple[str | None, str | None]] = TTLCache(ttl=24 * 3600, maxsize=4096)
+
+
+@dataclass(frozen=True)
+class CodeHit:
+    """One file returned by a domain search, with its (truncated) snippet."""
+
+    repo: str
+    domain: str
+    path: str
+    snippet: str | None
+    scan_hash: str | None
+
+
+def github_headers(pat: str) -> dict[str, str]:
+    return {
+        "Authorization": f"token {pat}",
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+
+
+# ── Shared client ─────────────────────────────────────────────────────────────
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> httpx.Client:
+    """The process-wide pooled client (created on first use)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(
+                base_url=GITHUB_API_URL,
+                timeout=_REQUEST_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=GITHUB_SCAN_CONCURRENCY,
+                    max_keepalive_connections=GITHUB_SCAN_CONCURRENCY,
+                ),
+            )
+        return _client
+
+
+def close_client() -> None:
+    """Close the pooled client (app shutdown); the next call builds a new one."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+# ── Rate limiting ─────────────────────────────────────────────────────────────
+
+
+def _resource(url: str) -> str:
+    """The X-RateLimit-Resource GitHub bills ``url`` against."""
+    if url.startswith("/search/code"):
+        return "code_search"
+    return "search" if url.startswith("/search/") else "core"
+
+
+class _RateLimit:
+    """
+    Shared view of GitHub's rate-limit headers.  Budgets are tracked per
+    (token, resource) — GitHub limits each separately — and once a response
+    reports one exhausted, calls against that budget wait for the advertised
+    reset (bounded by GITHUB_RATE_LIMIT_MAX_WAIT) before their next request.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._blocked_until: dict[tuple[str, str], float] = {}
+
+    @staticmethod
+    def _key(pat: str, resource: str) -> tuple[str, str]:
+        return hashlib.sha256(pat.encode()).hexdigest()[:16], resource
+
+    def observe(self, pat: str, url: str, resp: httpx.Response) -> bool:
+        """Record ``resp``'s headers; True if it was rejected for rate limiting."""
+        limited = resp.status_code == 429 or (
+            resp.status_code == 403 and resp.headers.get("X-RateLimit-Remaining") == "0"
+        )
+        until = 0.0
+        if "Retry-After" in resp.headers:
+            until = time.time() + float(resp.headers["Retry-After"])
+        elif resp.headers.get("X-RateLimit-Remaining") == "0":
+            until = float(resp.headers.get("X-RateLimit-Reset", 0))
+        if until:
+            key = self._key(pat, resp.headers.get("X-RateLimit-Resource") or _resource(url))
+            now = time.time()
+            with self._lock:
+                for stale in [k for k, t in self._blocked_until.items() if t <= now]:
+                    del self._blocked_until[stale]
+                self._blocked_until[key] = max(self._blocked_until.get(key, 0.0), until)
+        return limited
+
+    def wait(self, pat: str, url: str) -> bool:
+        """Sleep until ``url``'s budget resets; False if that is beyond the max wait."""
+        with self._lock:
+            delay = self._blocked_until.get(self._key(pat, _resource(url)), 0.0) - time.time()
+        if delay <= 0:
+            return True
+        if delay > GITHUB_RATE_LIMIT_MAX_WAIT:
+            return False
+        time.sleep(delay)
+        return True
+
+
+_rate_limit = _RateLimit()
+
+
+def _get(pat: str, url: str, params: dict[str, Any] | None = None) -> httpx.Response | None:
+    """GET with rate-limit handling (one retry after a reset); None if given up."""
+    for _attempt in range(2):
+        if not _rate_limit.wait(pat, url):
+            logger.warning("GitHub rate limit exhausted — skipping %s", url)
+            return None
+        resp = get_client().get(url, headers=github_headers(pat), params=params)
+        if not _rate_limit.observe(pat, url, resp):
+            return resp
+    logger.warning("GitHub rate limit still exhausted after reset — skipping %s", url)
+    return None
+
+
+# ── API calls ─────────────────────────────────────────────────────────────────
+
+
+def search_code(pat: str, query: str, repo: str) -> list[dict[str, Any]]:
+    """GitHub code search — read-only, returns file paths and blob shas."""
+    try:
+        resp = _get(pat, "/search/code", params={"q": f"{query} repo:{repo}", "per_page": 5})
+        if resp is None:
+            return []
+        if resp.status_code == 200:
+            return resp.json().get("items", [])
+        if resp.status_code == 422:
+            return []  # Query too complex / no results
+        logger.warning("GitHub search returned %d for query %r in %s", resp.status_code, query, repo)
+        return []
+    except httpx.TimeoutException:
+        logger.warning("GitHub search timed out for %r in %s", query, repo)
+        return []
+    except Exception as exc:
+        logger.warning("GitHub search error: %s", exc)
+        return []
+
+
+def fetch_file_snippet(
+    pat: str,
+    repo: str,
+    path: str,
+    sha: str | None = None,
+    max_chars: int = _SNIPPET_MAX_CHARS,
+) -> tuple[str | None, str | None]:
+    """
+    Fetch the first `max_chars` of a file from GitHub (read-only).
+    Returns (snippet, sha256_of_content).  With the blob ``sha`` from the
+    search result, the answer is cached for later scans of the same file.
+    Full file content is NEVER stored — only the snippet.
+    """
+    key = (repo, path, sha)
+    if sha:
+        cached = _snippet_cache.get(key)
+        if cached is not None:
+            return cached
+    try:
+        resp = _get(pat, f"/repos/{repo}/contents/{path}")
+        if resp is None or resp.status_code != 200:
+            return None, None
+        content = base64.b64decode(resp.json().get("content", "")).decode("utf-8", errors="replace")
+    except Exception:
+        return None, None
+    scan_hash = hashlib.sha256(content.encode()).hexdigest()
+    snippet = content[:max_chars] + ("…" if len(content) > max_chars else "")
+    if sha:
+        _snippet_cache.set(key, (snippet, scan_hash))
+    return snippet, scan_hash
+
+
+# ── Scan ──────────────────────────────────────────────────────────────────────
+
+
+def scan(
+    pat: str,
+    searches: Sequence[tuple[str, str, str]],
+    max_results: int,
+    files_per_search: int = 3,
+) -> list[CodeHit]:
+    """
+    Run ``(repo, domain, term)`` code searches and fetch a snippet for the
+    first ``files_per_search`` files of each, up to ``max_results`` hits.
+
+    Searches and fetches overlap on a pool of GITHUB_SCAN_CONCURRENCY
+    threads, but hits come back in the order a serial walk over
+    ``searches`` would produce them.  Searches are issued through a window
+    at most GITHUB_SCAN_CONCURRENCY wide, and only while the hits picked so
+    far plus those the in-flight searches could still return fall short of
+    ``max_results`` — code search has a small per-minute budget, so a scan
+    never spends more of it than the serial walk could have.
+    """
+    pending = iter(searches)
+    window: deque[tuple[str, str, Future]] = deque()
+    picked: list[tuple[str, str, str, Future]] = []
+    with ThreadPoolExecutor(
+        max_workers=GITHUB_SCAN_CONCURRENCY, thread_name_prefix="github-scan"
+    ) as pool:
+
+        def refill() -> None:
+            while (
+                len(window) < GITHUB_SCAN_CONCURRENCY
+                and len(picked) + files_per_search * len(window) < max_results
+            ):
+                nxt = next(pending, None)
+                if nxt is None:
+                    return
+                repo, domain, term = nxt
+                window.append((repo, domain, pool.submit(search_code, pat, term, repo)))
+
+        refill()
+        while window and len(picked) < max_results:
+            repo, domain, future = window.popleft()
+            for item in future.result()[:files_per_search]:
+                path = item.get("path", "")
+                if not path:
+                    continue
+                snippet = pool.submit(fetch_file_snippet, pat, repo, path, item.get("sha"))
+                picked.append((repo, domain, path, snippet))
+                if len(picked) >= max_results:
+                    break
+            refill()
+        for _, _, future in window:
+            future.cancel()
+
+        return [
+            CodeHit(repo, domain, path, *future.result())
+            for repo, domain, path, future in picked
+        ]
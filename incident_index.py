@@ -0,0 +1,387 @@
+"""
+TF-IDF incident similarity index.
+
+Replaces the dense ``cosine_similarity(query, matrix)`` + full ``argsort`` in
+the engine with an inverted-index lookup:
+
+  * Rows of the TF-IDF matrix are L2-normalised, so cosine similarity is a
+    plain dot product.
+  * The matrix is also kept transposed (term → incident postings).  A query
+    only touches the postings of the terms it contains, so the cost grows
+    with the number of incidents sharing a term with the query — not with
+    the size of the corpus — and the score vector stays sparse.
+  * Top-K is taken with ``np.argpartition`` over the non-zero scores only.
+
+Indexes are immutable: ``add()`` returns a new index with extra incidents
+transformed by the already-fitted vectorizer (no refit), so a snapshot that
+is being read by in-flight audits is never mutated.
+
+Artifacts
+---------
+``load_or_build()`` keeps fitted indexes on disk keyed by a checksum of the
+incident corpus, so a fresh container or worker process maps the arrays in
+instead of refitting::
+
+    <cache_dir>/<checksum>/index.json     vectorizer params, vocabulary, shape
+    <cache_dir>/<checksum>/*.npy          idf + CSR arrays of matrix/postings
+
+The ``.npy`` files are opened with ``mmap_mode="r"``: pages are shared
+between processes and only the postings a query touches are read.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+logger = logging.getLogger(__name__)
+
+
+# Bump when the index layout or vectorizer settings change: old artifacts are
+# then simply never matched again.
+_ARTIFACT_FORMAT = 1
+_ARTIFACTS_KEPT = 3
+
+_VECTORIZER_PARAMS: dict = {
+    "max_features": 10_000,
+    "ngram_range": (1, 2),
+    "stop_words": "english",
+    "sublinear_tf": True,
+}
+
+
+def _top_hits(
+    indices: np.ndarray, values: np.ndarray, top_k: int, min_score: float
+) -> list[tuple[int, float]]:
+    """Best ``top_k`` (index, score) pairs at or above ``min_score``; ties by index."""
+    keep = values >= min_score
+    indices, values = indices[keep], values[keep]
+    if len(values) > top_k:
+        part = np.argpartition(-values, top_k - 1)[:top_k]
+        indices, values = indices[part], values[part]
+    order = np.lexsort((indices, -values))
+    return [(int(indices[i]), float(values[i])) for i in order]
+
+
+def incident_text(incident: dict) -> str:
+    """The text that represents an incident in the index."""
+    return f"{incident['title']} {incident['description']} {incident['category']}"
+
+
+class IncidentIndex:
+    """Sparse TF-IDF index over incident texts with top-K cosine search."""
+
+    def __init__(
+        self,
+        vectorizer: TfidfVectorizer,
+        matrix: sp.csr_matrix,
+        fitted_size: int | None = None,
+        postings: sp.csr_matrix | None = None,
+    ) -> None:
+        self.vectorizer = vectorizer
+        self.matrix = matrix.tocsr()
+        # Number of incidents the vectorizer was fitted on (rows after that were add()-ed)
+        self.fitted_size = self.matrix.shape[0] if fitted_size is None else fitted_size
+        # term → incident postings; CSR so selecting the query's terms is a row slice
+        self._postings = self.matrix.T.tocsr() if postings is None else postings
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    @classmethod
+    def build(cls, corpus: list[str]) -> IncidentIndex | None:
+        """Fit the vectorizer on ``corpus``; None for an empty corpus."""
+        if not corpus:
+            return None
+        vectorizer = TfidfVectorizer(**_VECTORIZER_PARAMS)
+        matrix = vectorizer.fit_transform(corpus)
+        return cls(vectorizer, matrix)
+
+    def add(self, corpus: list[str]) -> IncidentIndex:
+        """
+        Return a new index with ``corpus`` appended (row order preserved).
+
+        The vocabulary and IDF weights stay those of the original fit; terms
+        unseen at fit time are ignored for the new rows.
+        """
+        if not corpus:
+            return self
+        extra = self.vectorizer.transform(corpus)
+        return IncidentIndex(
+            self.vectorizer, sp.vstack([self.matrix, extra], format="csr"), self.fitted_size
+        )
+
+    def scores(self, text: str) -> tuple[np.ndarray, np.ndarray]:
+        """(incident indices, cosine scores) for every incident with a non-zero score."""
+        query = self.vectorizer.transform([text])
+        if query.nnz == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        hits = sp.csr_matrix(query.data) @ self._postings[query.indices]
+        return hits.indices.astype(np.int64), hits.data
+
+    def search(self, text: str, top_k: int, min_score: float = 0.0) -> list[tuple[int, float]]:
+        """
+        Top-``top_k`` (incident index, score) pairs with score ≥ ``min_score``,
+        best first; ties are broken by incident order.
+        """
+        if top_k <= 0:
+            return []
+        return _top_hits(*self.scores(text), top_k, min_score)
+
+    def search_each(
+        self, texts: list[str], top_k: int, min_score: float = 0.0
+    ) -> list[list[tuple[int, float]]]:
+        """
+        ``search()`` for every text, with one vectorizer transform and one
+        sparse product for the whole list instead of one per text.
+        """
+        if top_k <= 0 or not texts:
+            return [[] for _ in texts]
+        hits = (self.vectorizer.transform(texts) @ self._postings).tocsr()
+        return [
+            _top_hits(
+                hits.indices[start:end].astype(np.int64), hits.data[start:end], top_k, min_score
+            )
+            for start, end in zip(hits.indptr[:-1], hits.indptr[1:])
+        ]
+
+    # ── Persistence ──────────────────────────────────────────────────────────
+
+    def save(self, directory: str) -> None:
+        """
+        Write the index under ``directory`` (created atomically: readers see
+        either no directory or a complete one).
+        """
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".incident-index-", dir=parent)
+        try:
+            arrays = {
+                "idf": self.vectorizer.idf_,
+                "matrix_data": self.matrix.data,
+                "matrix_indices": self.matrix.indices,
+                "matrix_indptr": self.matrix.indptr,
+                "postings_data": self._postings.data,
+                "postings_indices": self._postings.indices,
+                "postings_indptr": self._postings.indptr,
+            }
+            for name, array in arrays.items():
+                np.save(os.path.join(staging, f"{name}.npy"), np.asarray(array))
+            meta = {
+                "format": _ARTIFACT_FORMAT,
+                "shape": list(self.matrix.shape),
+                "fitted_size": self.fitted_size,
+                "vocabulary": {term: int(i) for term, i in self.vectorizer.vocabulary_.items()},
+            }
+            with open(os.path.join(staging, "index.json"), "w", encoding="utf-8") as fh:
+                json.dump(meta, fh)
+            os.replace(staging, directory)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.isdir(directory):  # lost a race with another writer → fine
+                raise
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> IncidentIndex:
+        """Load an index written by ``save()``; arrays are memory-mapped by default."""
+        with open(os.path.join(directory, "index.json"), encoding="utf-8") as fh:
+            meta = json.load(fh)
+        if meta.get("format") != _ARTIFACT_FORMAT:
+            raise ValueError(f"Unsupported incident index format: {meta.get('format')!r}")
+        mode = "r" if mmap else None
+
+        def array(name: str) -> np.ndarray:
+            return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode)
+
+        n_docs, n_terms = meta["shape"]
+        matrix = sp.csr_matrix(
+            (array("matrix_data"), array("matrix_indices"), array("matrix_indptr")),
+            shape=(n_docs, n_terms),
+            copy=False,
+        )
+        postings = sp.csr_matrix(
+            (array("postings_data"), array("postings_indices"), array("postings_indptr")),
+            shape=(n_terms, n_docs),
+            copy=False,
+        )
+        vectorizer = TfidfVectorizer(**_VECTORIZER_PARAMS)
+        vectorizer.vocabulary_ = meta["vocabulary"]
+        vectorizer.idf_ = np.array(array("idf"))
+        return cls(vectorizer, matrix, meta["fitted_size"], postings)
+
+
+class IncidentMatchAccumulator:
+    """
+    Per-sample incident matching over a stream of text chunks.
+
+    Each chunk is transformed into one sparse query matrix and scored with a
+    single sparse product against the postings, so N texts cost vectorised
+    N-proportional work rather than N Python calls.  State is per incident —
+    running max, running sum and the ``attributions`` best (score, text
+    position, key) triples — so memory does not grow with the number of
+    texts.  Keys (e.g. sample ids) default to the text position.
+    """
+
+    def __init__(self, index: IncidentIndex, attributions: int = 3) -> None:
+        self.index = index
+        self.attributions = attributions
+        self.count = 0
+        n_docs = len(index)
+        self.best = np.zeros(n_docs)
+        self.total = np.zeros(n_docs)
+        self.top_val = np.zeros((n_docs, attributions))
+        self.top_pos = np.full((n_docs, attributions), -1, dtype=np.int64)
+        self.top_key = np.full((n_docs, attributions), None, dtype=object)
+
+    def add(self, texts: list[str], keys: list | None = None) -> None:
+        """Score the next chunk of texts (positions continue from the last chunk)."""
+        if not texts:
+            return
+        offset, self.count = self.count, self.count + len(texts)
+        hits = (self.index.vectorizer.transform(texts) @ self.index._postings).tocoo()
+        if hits.nnz == 0:
+            return
+        cols, vals = hits.col.astype(np.int64), hits.data
+        np.maximum.at(self.best, cols, vals)
+        self.total += np.bincount(cols, weights=vals, minlength=len(self.best))
+        if self.attributions:
+            rows = hits.row.astype(np.int64)
+            if keys is None:
+                row_keys = (rows + offset).astype(object)
+            else:
+                row_keys = np.asarray(keys, dtype=object)[rows]
+            self._merge_attributions(cols, vals, rows + offset, row_keys)
+
+    def _merge_attributions(
+        self, cols: np.ndarray, vals: np.ndarray, pos: np.ndarray, keys: np.ndarray
+    ) -> None:
+        """Merge this chunk's hits into the per-incident top-m (score desc, position asc)."""
+        m = self.attributions
+        # Later chunks have later positions, so a hit must strictly beat the
+        # incident's current m-th best to get in — usually very few do.
+        floor = np.where(self.top_pos[:, -1] >= 0, self.top_val[:, -1], 0.0)
+        better = vals > floor[cols]
+        if not better.any():
+            return
+        cols, vals, pos, keys = cols[better], vals[better], pos[better], keys[better]
+        touched = np.unique(cols)
+        prev_pos = self.top_pos[touched]
+        valid = prev_pos >= 0
+        cols = np.concatenate([cols, np.repeat(touched, m)[valid.ravel()]])
+        vals = np.concatenate([vals, self.top_val[touched][valid]])
+        pos = np.concatenate([pos, prev_pos[valid]])
+        keys = np.concatenate([keys, self.top_key[touched][valid]])
+
+        order = np.lexsort((pos, -vals, cols))
+        cols, vals, pos, keys = cols[order], vals[order], pos[order], keys[order]
+        starts = np.flatnonzero(np.r_[True, cols[1:] != cols[:-1]])
+        rank = np.arange(len(cols)) - np.repeat(starts, np.diff(np.r_[starts, len(cols)]))
+        keep = rank < m
+        self.top_val[cols[keep], rank[keep]] = vals[keep]
+        self.top_pos[cols[keep], rank[keep]] = pos[keep]
+        self.top_key[cols[keep], rank[keep]] = keys[keep]
+
+    def top(
+        self, top_k: int, min_score: float = 0.0, aggregation: str = "max"
+    ) -> list[tuple[int, float, list[tuple[Any, float]]]]:
+        """
+        Up to ``top_k`` ``(incident index, aggregated score, [(key, score),
+        ...])`` tuples, best first (ties by incident order).
+
+        An incident qualifies when at least one text scored ≥ ``min_score``
+        (> 0 when ``min_score`` is 0) against it; qualifying incidents are
+        ranked by the ``aggregation`` of their scores over all texts ("max",
+        or "mean" counting non-matching texts as 0).
+        """
+        if top_k <= 0 or self.count == 0:
+            return []
+        candidates = np.flatnonzero(self.best >= min_score) if min_score > 0 else np.flatnonzero(self.best)
+        if len(candidates) == 0:
+            return []
+        agg = self.best if aggregation == "max" else self.total / self.count
+        scores = agg[candidates]
+        if len(candidates) > top_k:
+            part = np.argpartition(-scores, top_k - 1)[:top_k]
+            candidates, scores = candidates[part], scores[part]
+        order = np.lexsort((candidates, -scores))
+        results = []
+        for doc, score in zip(candidates[order], scores[order]):
+            matched = [
+                (key, float(v))
+                for p, key, v in zip(self.top_pos[doc], self.top_key[doc], self.top_val[doc])
+                if p >= 0
+            ]
+            results.append((int(doc), float(score), matched))
+        return results
+
+
+def corpus_checksum(corpus: list[str]) -> str:
+    """Checksum of the incident corpus (and index format) used as the artifact key."""
+    digest = hashlib.sha256(f"v{_ARTIFACT_FORMAT}:{len(corpus)}".encode())
+    for text in corpus:
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+    return digest.hexdigest()[:24]
+
+
+def _prune_artifacts(cache_dir: str, keep: str) -> None:
+    """Remove all but the most recent _ARTIFACTS_KEPT artifacts (never ``keep``)."""
+    try:
+        entries = [
+            e for e in os.scandir(cache_dir) if e.is_dir() and not e.name.startswith(".")
+        ]
+    except OSError:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    for entry in entries[_ARTIFACTS_KEPT:]:
+        if entry.name != keep:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def load_or_build(
+    corpus: list[str],
+    cache_dir: str | None,
+    build: Callable[[], IncidentIndex | None] | None = None,
+) -> IncidentIndex | None:
+    """
+    Return the index for ``corpus`` from ``cache_dir`` when an artifact with
+    the same checksum exists; otherwise build it (``build`` or a fresh fit)
+    and save it for the next process.  Disk problems never fail the caller —
+    they only cost a refit.
+    """
+    if not corpus:
+        return None
+    fit = build or (lambda: IncidentIndex.build(corpus))
+    if not cache_dir:
+        return fit()
+
+    key = corpus_checksum(corpus)
+    path = os.path.join(cache_dir, key)
+    if os.path.isdir(path):
+        try:
+            index = IncidentIndex.load(path)
+            logger.info("Incident index %s loaded from %s", key, cache_dir)
+            return index
+        except Exception as exc:
+            logger.warning("Incident index artifact %s unreadable, rebuilding: %s", path, exc)
+            shutil.rmtree(path, ignore_errors=True)
+
+    index = fit()
+    if index is not None:
+        try:
+            index.save(path)
+            _prune_artifacts(cache_dir, keep=key)
+            logger.info("Incident index %s saved to %s", key, cache_dir)
+        except Exception as exc:
+            logger.warning("Could not save incident index artifact to %s: %s", path, exc)
+    return index
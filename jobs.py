@@ -0,0 +1,138 @@
+"""
+SARO background audit jobs
+==========================
+Runs long audits off the request path.  The API creates the ``Audit`` row
+(status=pending), hands the batch to a local executor and returns the
+``audit_id`` straight away; clients poll ``GET /api/v1/audits/{id}``.
+
+The job function itself lives with the code that owns the data it writes
+(``routers.scan._run_audit_job``); this module only manages the executor.
+Each job opens its own DB session — request sessions are closed as soon as
+the response is sent.
+
+Environment:
+    AUDIT_EXECUTOR  thread (default) | process | inline
+                    "process" sidesteps the GIL for CPU-heavy batches; each
+                    worker process loads its own reference snapshot once.
+                    "inline" runs the job inside the request (tests / dev).
+    AUDIT_WORKERS   maximum concurrent audit jobs (default 2)
+    AUDIT_LEASE_SECONDS
+                    how long an in-flight audit's owner may go without
+                    renewing its lease before the audit is failed as
+                    interrupted (default 120); renewed every quarter of that
+"""
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+AUDIT_EXECUTOR: str = os.environ.get("AUDIT_EXECUTOR", "thread").strip().lower()
+AUDIT_WORKERS: int = max(1, int(os.environ.get("AUDIT_WORKERS", "2")))
+AUDIT_LEASE_SECONDS: float = float(os.environ.get("AUDIT_LEASE_SECONDS", "120"))
+
+# Identifies this API process on the audit leases it holds
+INSTANCE_ID: str = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_executor: Executor | None = None
+_executor_lock = threading.Lock()
+_heartbeat: threading.Thread | None = None
+_heartbeat_stop = threading.Event()
+
+
+def _get_executor() -> Executor | None:
+    """Create (once) and return the configured executor; None means inline."""
+    global _executor
+    if AUDIT_EXECUTOR == "inline":
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                if AUDIT_EXECUTOR == "process":
+                    _executor = ProcessPoolExecutor(max_workers=AUDIT_WORKERS)
+                else:
+                    _executor = ThreadPoolExecutor(
+                        max_workers=AUDIT_WORKERS, thread_name_prefix="saro-audit"
+                    )
+                logger.info("Audit executor started: %s x%d", AUDIT_EXECUTOR, AUDIT_WORKERS)
+    return _executor
+
+
+def _log_job_failure(future: Future) -> None:
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Background audit job raised: %s", exc, exc_info=exc)
+
+
+def submit(fn: Callable[..., Any], *args: Any) -> Future | None:
+    """
+    Schedule ``fn(*args)`` on the audit executor.
+
+    ``fn`` must be a module-level function and ``args`` picklable so the same
+    call works with the process pool.  With AUDIT_EXECUTOR=inline the job runs
+    before this returns and None is returned.
+    """
+    executor = _get_executor()
+    if executor is None:
+        fn(*args)
+        return None
+    future = executor.submit(fn, *args)
+    future.add_done_callback(_log_job_failure)
+    return future
+
+
+def open_session() -> Session:
+    """Open a DB session owned by a background job (caller must close it)."""
+    from database import _get_session_factory
+
+    return _get_session_factory()()
+
+
+def _beat(fn: Callable[[], None]) -> None:
+    while not _heartbeat_stop.wait(AUDIT_LEASE_SECONDS / 4):
+        try:
+            fn()
+        except Exception as exc:
+            logger.warning("Audit lease heartbeat failed: %s", exc)
+
+
+def start_heartbeat(fn: Callable[[], None]) -> None:
+    """Call ``fn`` every AUDIT_LEASE_SECONDS / 4 on a daemon thread until shutdown()."""
+    global _heartbeat
+    with _executor_lock:
+        if _heartbeat is not None:
+            return
+        _heartbeat_stop.clear()
+        _heartbeat = threading.Thread(
+            target=_beat, args=(fn,), name="saro-audit-heartbeat", daemon=True
+        )
+        _heartbeat.start()
+
+
+def shutdown(wait: bool = True) -> None:
+    """
+    Stop the executor, then the lease heartbeat.  Queued jobs that have not
+    started are cancelled; their audits stay ``pending`` until their lease
+    expires and routers.scan.fail_interrupted_audits fails them.  Running
+    jobs finish when ``wait`` is true.
+    """
+    global _executor, _heartbeat
+    with _executor_lock:
+        executor, _executor = _executor, None
+        heartbeat, _heartbeat = _heartbeat, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+        logger.info("Audit executor shut down")
+    # Keep renewing leases until the jobs that were allowed to finish are done
+    if heartbeat is not None:
+        _heartbeat_stop.set()
+        heartbeat.join()
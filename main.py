@@ -8,7 +8,15 @@ Startup (standalone repo / Koyeb):
 
 Environment variables (see .env.example):
     DATABASE_URL, JWT_SECRET_KEY, JWT_ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES,
-    MIN_BATCH_SAMPLES, INCIDENT_TOP_K, BAYESIAN_PRIOR_ALPHA, CONFIDENCE_THRESHOLD
+    MIN_BATCH_SAMPLES, INCIDENT_TOP_K, BAYESIAN_PRIOR_ALPHA, CONFIDENCE_THRESHOLD,
+    REFERENCE_CHECK_INTERVAL_SECONDS, AUDIT_EXECUTOR, AUDIT_WORKERS, AUDIT_LEASE_SECONDS,
+    DB_POOL_MODE, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING, INCIDENT_INDEX_DIR, INCIDENT_INDEX_REFIT_RATIO,
+    GATE3_PARALLEL_THRESHOLD, GATE3_WORKERS, DASHBOARD_KPI_CACHE_SECONDS,
+    AUTH_CACHE_TTL_SECONDS, PASSWORD_HASH_WORKERS, GITHUB_API_URL, GITHUB_SCAN_CONCURRENCY,
+    GITHUB_RATE_LIMIT_MAX_WAIT, OUTPUT_AUDIT_CACHE_SECONDS, OUTPUT_AUDIT_CACHE_SIZE,
+    TRACE_PACK_MIN_BYTES, BLOB_STORE, BLOB_STORE_DIR, BLOB_OFFLOAD_BYTES, BLOB_UPLOAD_WORKERS,
+    AWS_S3_BUCKET, AWS_S3_ENDPOINT_URL
 """
 from __future__ import annotations
 
@@ -33,7 +41,17 @@ from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from database import Base, create_all_tables, ensure_app_schema, engine, health_check
+import blobstore
+import github_scanner
+import jobs
+import rollups
+from database import (
+    Base, create_all_tables, ensure_app_indexes, ensure_app_schema, engine, get_db, health_check,
+    pool_stats,
+)
+from engine import load_reference_snapshot, shutdown_gate3_pool
+from pagination import NEXT_CURSOR_HEADER
+from routers.admin import router as admin_router
 from routers.auth import router as auth_router
 from routers.auth import tenants_router
 from routers.clients import audit_events_router, router as clients_router
@@ -42,7 +60,7 @@ from routers.github_integration import router as github_router
 from routers.output_audit import router as output_audit_router
 from routers.demo import router as demo_router
 from routers.reports import router as reports_router
-from routers.scan import router as scan_router
+from routers.scan import fail_interrupted_audits, heartbeat_audit_leases, router as scan_router
 from routers.traces import router as traces_router
 
 # ── Structured logging setup ──────────────────────────────────────────────────
@@ -73,7 +91,12 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """
     On startup: create any missing tables (idempotent — existing tables are
-    never dropped).  On shutdown: dispose the engine connection pool.
+    never dropped), fail in-flight audits no live process owns, warm the
+    shared audit-engine reference snapshot, backfill empty report rollups and
+    start the audit lease heartbeat.
+    On shutdown: drain the background audit executor (then stop its lease
+    heartbeat) and blob uploads, stop the Gate 3 process pool, close the
+    GitHub HTTP client, then dispose the engine connection pool.
     """
     logger.info("SARO starting up — environment=%s", os.environ.get("ENVIRONMENT", "development"))
 
@@ -92,10 +115,40 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         ensure_app_schema()
         # 2. Create any other tables that don't exist yet (reference tables, etc.)
         create_all_tables()
+        # 3. Add indexes declared on models after their table already existed
+        ensure_app_indexes()
         logger.info("Database schema synchronised")
+        db = next(get_db())
+        # 4. Audits whose owning process is gone will never finish — fail
+        #    them so pollers stop getting 202 (live owners' audits are kept).
+        try:
+            fail_interrupted_audits(db)
+        except Exception:
+            db.rollback()
+            logger.exception("Could not fail interrupted audits — the lease heartbeat will retry")
+        # 5. Load reference tables + fit the incident index once, so the first
+        #    audit request does not pay for it.
+        try:
+            load_reference_snapshot(db)
+        except Exception:
+            logger.exception("Reference snapshot warm-up failed — will retry on first audit")
+        # 6. Seed the report rollups from existing reports if they are empty.
+        try:
+            rollups.backfill(db)
+        except Exception:
+            db.rollback()
+            logger.exception("Report rollup backfill failed — /reports/summary may undercount")
+        finally:
+            db.close()
+    # Renew this process's audit leases and keep failing orphaned audits
+    jobs.start_heartbeat(heartbeat_audit_leases)
 
     yield
 
+    jobs.shutdown(wait=True)
+    blobstore.shutdown(wait=True)
+    shutdown_gate3_pool()
+    github_scanner.close_client()
     engine.dispose()
     logger.info("SARO shut down cleanly")
 
@@ -130,6 +183,7 @@ if _raw_origins.strip():
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 else:
     # Open CORS — accept any origin; API security is enforced via JWT
@@ -139,6 +193,7 @@ else:
         allow_credentials=False,   # required when allow_origins=["*"]
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
 
@@ -179,6 +234,7 @@ app.include_router(audit_events_router)
 app.include_router(dashboard_router)
 app.include_router(output_audit_router)
 app.include_router(github_router)
+app.include_router(admin_router)
 
 
 # ── Health check ──────────────────────────────────────────────────────────────
@@ -190,7 +246,8 @@ def health() -> dict:
     Koyeb / load-balancer health probe.
 
     Also returns bootstrap_needed=True when the users table is empty so the
-    frontend can display a first-run setup prompt instead of a plain login form.
+    frontend can display a first-run setup prompt instead of a plain login form,
+    and db_pool checkout / wait metrics for the configured DB_POOL_MODE.
     """
     from database import get_db  # local import to avoid circular at module level
     from models import User
@@ -211,6 +268,7 @@ def health() -> dict:
         "status": "ok" if db_ok else "degraded",
         "database": "ok" if db_ok else "unreachable",
         "bootstrap_needed": bootstrap_needed,
+        "db_pool": pool_stats() if db_ok else None,
         "version": app.version,
     }
 
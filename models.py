@@ -6,18 +6,21 @@ Existing tables (populated by import_*.py scripts):
   aigp_principles, governance_rules, ai_incidents
 
 New tables added here:
-  tenants, users, audits, scan_reports, audit_traces, demo_requests
+  tenants, users, audits, scan_reports, audit_traces, demo_requests,
+  report_rollups, report_rollup_hits
 """
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 
 from sqlalchemy import (
     Boolean,
+    Date,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -27,6 +30,7 @@ from sqlalchemy.dialects.postgresql import JSON, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database import Base
+from storage import PackedText
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -114,6 +118,28 @@ class Audit(Base):
         back_populates="audit", cascade="all, delete-orphan"
     )
 
+    # Tenant audit listings page newest-first on (created_at, id)
+    __table_args__ = (Index("ix_audits_tenant_created", "tenant_id", "created_at"),)
+
+
+class AuditLease(Base):
+    """
+    Which API process owns an in-flight audit (jobs.INSTANCE_ID) and when it
+    last renewed the claim.  Audits whose lease has gone stale are failed by
+    routers.scan.fail_interrupted_audits.  Kept out of ``audits`` so adding
+    it needs no schema healing; rows of finished audits are pruned by the
+    owner's heartbeat.
+    """
+    __tablename__ = "audit_leases"
+
+    audit_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("audits.id", ondelete="CASCADE"), primary_key=True
+    )
+    instance_id: Mapped[str] = mapped_column(String(100), nullable=False)
+    heartbeat_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (Index("ix_audit_leases_instance", "instance_id"),)
+
 
 class ScanReport(Base):
     """Persisted full audit report (JSON blob + key scalar metrics)."""
@@ -142,6 +168,44 @@ class ScanReport(Base):
     audit: Mapped[Audit] = relationship(back_populates="report")
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Report rollups (per tenant per completion day — see rollups.py)
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class ReportRollup(Base):
+    """Running counts and sums over one tenant's completed reports on one day."""
+
+    __tablename__ = "report_rollups"
+
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    completed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    mit_coverage_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    mit_coverage_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    risk_score_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    risk_score_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    fixed_delta_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    fixed_delta_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class ReportRollupHit(Base):
+    """Framework / MIT-domain hit counts for one tenant on one day."""
+
+    __tablename__ = "report_rollup_hits"
+
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    # kind: "framework" (one hit per applied rule) | "domain" (one per audit)
+    kind: Mapped[str] = mapped_column(String(20), primary_key=True)
+    name: Mapped[str] = mapped_column(String(255), primary_key=True)
+    hits: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
 class AuditMetadata(Base):
     """
     1:1 extension of Audit for universal AI output ingestion metadata.
@@ -198,6 +262,11 @@ class AuditTrace(Base):
 
     audit: Mapped["Audit"] = relationship(back_populates="traces")
 
+    # Per-audit trace views read gates in order: (gate_id, created_at)
+    __table_args__ = (
+        Index("ix_audit_traces_audit_gate_created", "audit_id", "gate_id", "created_at"),
+    )
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Reference tables (read-only, populated by import_*.py scripts)
@@ -364,10 +433,15 @@ class AuditEvent(Base):
     )
     # event_type: "client_created" | "sso_configured" | "scim_token_rotated"
     # | "user_enrolled" | "mfa_policy_changed" | "sso_test_passed" | "sso_test_failed"
+    # | "audit_interrupted"
     event_type: Mapped[str] = mapped_column(String(100), nullable=False)
     event_data: Mapped[dict] = mapped_column(JSON, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        Index("ix_audit_events_tenant_type_created", "tenant_id", "event_type", "created_at"),
+    )
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Enhanced Trace / Chain-of-Thought (one per completed audit)
@@ -395,12 +469,15 @@ class EnhancedTrace(Base):
     # Representative sample metadata (no raw PII stored)
     client_input_summary: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     client_output_summary: Mapped[dict | None] = mapped_column(JSON, nullable=True)
-    # Full raw prompt / response stored as text (expandable in UI)
-    raw_prompt: Mapped[str | None] = mapped_column(Text, nullable=True)
-    raw_response: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Full raw prompt / response (expandable in UI).  Large texts are stored
+    # gzip-packed (see storage.py).  raw_response (pretty-printed CoT + output
+    # summary) and, for single-output audits, raw_prompt (prompt_text +
+    # raw_output_text) are NULL for new traces and re-rendered on read.
+    raw_prompt: Mapped[str | None] = mapped_column(PackedText, nullable=True)
+    raw_response: Mapped[str | None] = mapped_column(PackedText, nullable=True)
     # Verbatim original prompt and AI output (universal ingestion — never truncated)
-    prompt_text: Mapped[str | None] = mapped_column(Text, nullable=True)
-    raw_output_text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    prompt_text: Mapped[str | None] = mapped_column(PackedText, nullable=True)
+    raw_output_text: Mapped[str | None] = mapped_column(PackedText, nullable=True)
     # SHA-256 of the exported trace JSON (for signed export verification)
     export_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
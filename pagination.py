@@ -0,0 +1,70 @@
+"""
+SARO keyset pagination
+======================
+Cursor-based paging for the newest-first listings (audits, dashboard audits,
+audit events).  Rows are ordered by ``(created_at DESC, id DESC)`` and a page
+continues strictly after the last row of the previous one, so page N costs
+the same index range scan as page 1 instead of skipping N × limit rows.
+
+The cursor is opaque to clients: URL-safe base64 of ``"<created_at>|<id>"``.
+Endpoints return it in the ``X-Next-Cursor`` response header when the page
+is full; pass it back as ``?cursor=`` to fetch the next page.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import uuid
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Select, and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Parse a cursor from :func:`encode_cursor`; 400 on anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid pagination cursor: {cursor!r}",
+        ) from exc
+
+
+def keyset_page(
+    stmt: Select, created_col: Any, id_col: Any, cursor: str | None, offset: int = 0
+) -> Select:
+    """
+    Order ``stmt`` newest first and, given a cursor, keep only rows after it.
+    The legacy ``offset`` only applies without a cursor (a cursor already
+    marks where the page starts); the caller applies ``limit``.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                created_col < created_at,
+                and_(created_col == created_at, id_col < row_id),
+            )
+        )
+    elif offset:
+        stmt = stmt.offset(offset)
+    return stmt.order_by(created_col.desc(), id_col.desc())
+
+
+def set_next_cursor(response: Response, rows: list[Any], limit: int) -> None:
+    """Advertise the cursor for the next page when ``rows`` filled the page."""
+    if len(rows) == limit and rows:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
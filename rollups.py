@@ -0,0 +1,182 @@
+"""
+SARO report rollups
+===================
+Per-tenant, per-day aggregates behind GET /api/v1/reports/summary, so the
+summary is a couple of small GROUP BY queries instead of a walk over every
+stored report_json.
+
+    report_rollups      completed-audit count plus sum / count pairs for the
+                        MIT coverage, risk score and fixed-delta averages
+    report_rollup_hits  framework hits (one per applied rule) and MIT domain
+                        hits (one per audit whose Gate 3 flagged the domain)
+
+record_report() / record_reports() add completed reports inside the caller's
+transaction, so the rollups commit (or roll back) together with the ScanReport
+rows.  Days are UTC completion dates.  backfill() rebuilds the tables from existing reports
+when they are empty (first deploy, or after ensure_app_schema recreated them).
+"""
+from __future__ import annotations
+
+import logging
+import uuid
+from collections import Counter, defaultdict
+from collections.abc import Sequence
+from datetime import date, datetime, timezone
+from typing import Any
+
+from sqlalchemy import and_, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models import Audit, ReportRollup, ReportRollupHit, ScanReport
+
+logger = logging.getLogger(__name__)
+
+_SUM_COLUMNS = {
+    "mit_coverage": "mit_coverage_score",
+    "risk_score": "overall_risk_score",
+    "fixed_delta": "fixed_delta",
+}
+
+
+def report_hits(report_json: dict[str, Any] | None) -> tuple[Counter, Counter]:
+    """Framework hits (per applied rule) and domain hits (per flagged domain) of one report."""
+    frameworks: Counter = Counter()
+    domains: Counter = Counter()
+    if not report_json:
+        return frameworks, domains
+    for rule in report_json.get("applied_rules", []):
+        frameworks[rule.get("framework", "")] += 1
+    for gate in report_json.get("gates", []):
+        if gate.get("gate_id") == 3:
+            for domain, cnt in gate.get("details", {}).get("domain_counts", {}).items():
+                if cnt > 0:
+                    domains[domain] += 1
+    return frameworks, domains
+
+
+def _rollup_day(completed_at: datetime | None) -> date:
+    if completed_at is None:
+        return datetime.now(tz=timezone.utc).date()
+    if completed_at.tzinfo is None:  # SQLite hands back naive UTC
+        return completed_at.date()
+    return completed_at.astimezone(timezone.utc).date()
+
+
+def _rollup_values(report: ScanReport) -> dict[str, float | int]:
+    values: dict[str, float | int] = {"completed_count": 1}
+    for prefix, attr in _SUM_COLUMNS.items():
+        value = getattr(report, attr)
+        values[f"{prefix}_sum"] = float(value) if value is not None else 0.0
+        values[f"{prefix}_count"] = int(value is not None)
+    return values
+
+
+def _upsert_increment(
+    db: Session, model: type, keys: list[str], rows: list[dict[str, Any]]
+) -> None:
+    """
+    Insert ``rows`` into ``model``'s table, adding their non-key values onto
+    any existing row with the same key.  One statement on PostgreSQL and
+    SQLite (INSERT … ON CONFLICT DO UPDATE); row by row elsewhere.
+    """
+    if not rows:
+        return
+    table = model.__table__
+    counters = [c for c in rows[0] if c not in keys]
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={c: table.c[c] + stmt.excluded[c] for c in counters},
+        )
+        db.execute(stmt)
+        return
+    for row in rows:
+        match = and_(*(table.c[k] == row[k] for k in keys))
+        result = db.execute(
+            update(table).where(match).values({c: table.c[c] + row[c] for c in counters})
+        )
+        if result.rowcount == 0:
+            db.execute(insert(table).values(row))
+
+
+def record_report(db: Session, audit: Audit, report: ScanReport) -> None:
+    """
+    Add ``report`` to its tenant's rollups.  Only completed audits count;
+    the caller commits (so the rollup shares the report's transaction).
+    """
+    record_reports(db, [(audit, report)])
+
+
+def record_reports(db: Session, pairs: Sequence[tuple[Audit, ScanReport]]) -> None:
+    """record_report() for many reports: folded in memory, one upsert per table."""
+    sums: dict[tuple[uuid.UUID, date], Counter] = defaultdict(Counter)
+    hits: Counter = Counter()
+    for audit, report in pairs:
+        if audit.status != "completed":
+            continue
+        key = (audit.tenant_id, _rollup_day(audit.completed_at))
+        _fold(sums, hits, key, report)
+    _upsert_increment(
+        db, ReportRollup, ["tenant_id", "day"],
+        [{"tenant_id": t, "day": d, **values} for (t, d), values in sums.items()],
+    )
+    _upsert_increment(db, ReportRollupHit, ["tenant_id", "day", "kind", "name"], _hit_rows(hits))
+
+
+def _fold(
+    sums: dict[tuple[uuid.UUID, date], Counter],
+    hits: Counter,
+    key: tuple[uuid.UUID, date],
+    report: ScanReport,
+) -> None:
+    sums[key].update(_rollup_values(report))
+    frameworks, domains = report_hits(report.report_json)
+    for kind, counter in (("framework", frameworks), ("domain", domains)):
+        for name, n in counter.items():
+            hits[(*key, kind, name)] += n
+
+
+def _hit_rows(hits: Counter) -> list[dict[str, Any]]:
+    return [
+        {"tenant_id": t, "day": d, "kind": kind, "name": name, "hits": n}
+        for (t, d, kind, name), n in hits.items()
+    ]
+
+
+def backfill(db: Session, batch_size: int = 500) -> int:
+    """
+    Rebuild both rollup tables from completed reports when they are empty.
+    Returns the number of reports folded in (0 when rollups already exist).
+    """
+    if db.execute(select(ReportRollup.tenant_id).limit(1)).first() is not None:
+        return 0
+
+    sums: dict[tuple[uuid.UUID, date], Counter] = defaultdict(Counter)
+    hits: Counter = Counter()
+    rows = db.execute(
+        select(Audit.tenant_id, Audit.completed_at, ScanReport)
+        .join(ScanReport, ScanReport.audit_id == Audit.id)
+        .where(Audit.status == "completed")
+        .execution_options(yield_per=batch_size)
+    )
+    folded = 0
+    for tenant_id, completed_at, report in rows:
+        _fold(sums, hits, (tenant_id, _rollup_day(completed_at)), report)
+        folded += 1
+        db.expunge(report)  # keep the identity map from holding every blob
+
+    if not folded:
+        return 0
+    db.execute(
+        insert(ReportRollup.__table__),
+        [{"tenant_id": t, "day": d, **values} for (t, d), values in sums.items()],
+    )
+    if hits:
+        db.execute(insert(ReportRollupHit.__table__), _hit_rows(hits))
+    db.commit()
+    logger.info("Report rollups backfilled from %d completed reports", folded)
+    return folded
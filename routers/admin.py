@@ -0,0 +1,91 @@
+"""
+Operational admin routes (super_admin only).
+
+GET  /api/v1/admin/reference          — current reference snapshot version + sizes
+POST /api/v1/admin/reference/reload   — rebuild and atomically swap the snapshot
+GET  /api/v1/admin/output-cache       — single-output audit result cache size + hit rate
+DELETE /api/v1/admin/output-cache     — drop every cached single-output result
+"""
+from __future__ import annotations
+
+import logging
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from auth import Principal, get_current_user, require_role
+from database import get_db
+from engine import (
+    ReferenceSnapshot, clear_output_cache, current_reference_snapshot, load_reference_snapshot,
+    output_cache_stats,
+)
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
+
+
+def _snapshot_summary(snapshot: ReferenceSnapshot | None) -> dict[str, Any]:
+    if snapshot is None:
+        return {"loaded": False}
+    return {
+        "loaded": True,
+        "version": snapshot.version,
+        "loaded_at": snapshot.loaded_at.isoformat(),
+        "mit_risks": len(snapshot.mit_risks),
+        "incidents": len(snapshot.incidents),
+        "eu_rules": len(snapshot.eu_rules),
+        "nist_controls": len(snapshot.nist_controls),
+        "aigp_principles": len(snapshot.aigp),
+        "governance_rules": len(snapshot.gov_rules),
+    }
+
+
+@router.get(
+    "/reference",
+    dependencies=[Depends(require_role("super_admin"))],
+    summary="Reference-data snapshot currently used by the audit engine",
+)
+def get_reference_snapshot() -> dict[str, Any]:
+    return _snapshot_summary(current_reference_snapshot())
+
+
+@router.post(
+    "/reference/reload",
+    dependencies=[Depends(require_role("super_admin"))],
+    summary="Reload reference tables and swap the shared engine snapshot",
+)
+def reload_reference_snapshot(
+    current_user: Annotated[Principal, Depends(get_current_user)],
+    db: Annotated[Session, Depends(get_db)],
+) -> dict[str, Any]:
+    """
+    Force a rebuild of the reference snapshot (e.g. right after an import_*
+    script has updated the reference tables).  In-flight audits finish on the
+    previous snapshot; new audits pick up the new one.
+    """
+    snapshot = load_reference_snapshot(db)
+    logger.info("Reference snapshot reloaded by %s: version=%s", current_user.email, snapshot.version)
+    return _snapshot_summary(snapshot)
+
+
+@router.get(
+    "/output-cache",
+    dependencies=[Depends(require_role("super_admin"))],
+    summary="Single-output audit result cache statistics",
+)
+def get_output_cache_stats() -> dict[str, Any]:
+    return output_cache_stats()
+
+
+@router.delete(
+    "/output-cache",
+    dependencies=[Depends(require_role("super_admin"))],
+    summary="Drop every cached single-output audit result",
+)
+def clear_output_audit_cache(
+    current_user: Annotated[Principal, Depends(get_current_user)],
+) -> dict[str, Any]:
+    clear_output_cache()
+    logger.info("Single-output audit cache cleared by %s", current_user.email)
+    return output_cache_stats()
@@ -17,6 +17,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from auth import (
+    Principal,
     authenticate_user,
     create_access_token,
     get_current_user,
@@ -114,7 +115,7 @@ def login(payload: LoginIn, db: Annotated[Session, Depends(get_db)]) -> TokenOut
 def register_user(
     payload: UserCreateIn,
     db: Annotated[Session, Depends(get_db)],
-    _current: Annotated[User, Depends(get_current_user)],
+    _current: Annotated[Principal, Depends(get_current_user)],
 ) -> UserOut:
     """Super admin creates a new user within a tenant."""
     existing = db.query(User).filter(User.email == payload.email).first()
@@ -143,7 +144,7 @@ def register_user(
 
 
 @router.get("/me", response_model=UserOut)
-def me(current: Annotated[User, Depends(get_current_user)]) -> UserOut:
+def me(current: Annotated[Principal, Depends(get_current_user)]) -> UserOut:
     """Return the currently authenticated user."""
     return UserOut.model_validate(current)
 
@@ -162,7 +163,7 @@ def me(current: Annotated[User, Depends(get_current_user)]) -> UserOut:
 def create_tenant(
     payload: TenantCreateIn,
     db: Annotated[Session, Depends(get_db)],
-    _current: Annotated[User, Depends(get_current_user)],
+    _current: Annotated[Principal, Depends(get_current_user)],
 ) -> TenantOut:
     """Provision a new tenant (super_admin only)."""
     existing = db.query(Tenant).filter(Tenant.slug == payload.slug).first()
@@ -186,7 +187,7 @@ def create_tenant(
 )
 def list_tenants(
     db: Annotated[Session, Depends(get_db)],
-    _current: Annotated[User, Depends(get_current_user)],
+    _current: Annotated[Principal, Depends(get_current_user)],
 ) -> list[TenantOut]:
     """List all tenants (super_admin only)."""
     return [TenantOut.model_validate(t) for t in db.query(Tenant).all()]
@@ -6,7 +6,7 @@ GET  /api/v1/clients                        — list all clients
 GET  /api/v1/clients/{tenant_id}            — client detail
 POST /api/v1/clients/{tenant_id}/test-sso   — validate SSO configuration
 POST /api/v1/clients/{tenant_id}/scim/rotate-token — rotate SCIM bearer token
-GET  /api/v1/audit-events                   — immutable event log (super_admin only)
+GET  /api/v1/audit-events                   — immutable event log (super_admin only, keyset paged)
 """
 from __future__ import annotations
 
@@ -19,17 +19,22 @@ from datetime import datetime, timezone
 from typing import Annotated, Any
 
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from auth import get_current_user, hash_password, require_role
+from auth import (
+    Principal, get_current_user, hash_passwords, require_role, unusable_password,
+)
 from database import get_db
 from models import AuditEvent, ClientConfig, Tenant, User
+from pagination import keyset_page, set_next_cursor
 from schemas import (
     AuditEventOut,
     ClientConfigOut,
     ClientOnboardingIn,
     SCIMTokenRotateOut,
+    UserEnrollmentIn,
 )
 
 logger = logging.getLogger(__name__)
@@ -105,6 +110,42 @@ def _get_client_or_404(tenant_id: uuid.UUID, db: Session) -> tuple[Tenant, Clien
     return tenant, cfg
 
 
+def _enroll_initial_users(payload: ClientOnboardingIn, tenant_id: uuid.UUID, db: Session) -> int:
+    """
+    Add ``payload.initial_users`` to the new tenant, skipping emails that
+    already exist (one IN query) or repeat within the payload.
+
+    SSO tenants authenticate at the IdP, so their users get an unusable
+    password instead of an Argon2 hash of a throwaway secret; a password can
+    be set later through the normal reset flow.  Otherwise the temporary
+    passwords are hashed together on a small thread pool.
+    """
+    emails = list(dict.fromkeys(str(u.email) for u in payload.initial_users))
+    taken: set[str] = set()
+    if emails:
+        taken = set(db.execute(select(User.email).where(User.email.in_(emails))).scalars())
+
+    new_users: list[UserEnrollmentIn] = []
+    seen: set[str] = set()
+    for u_in in payload.initial_users:
+        email = str(u_in.email)
+        if email in taken or email in seen:
+            logger.warning("Skipping duplicate email during enrollment: %s", email)
+            continue
+        seen.add(email)
+        new_users.append(u_in)
+
+    if payload.sso_enabled:
+        hashes = [unusable_password() for _ in new_users]
+    else:
+        hashes = hash_passwords(secrets.token_urlsafe(16) for _ in new_users)
+    db.add_all(
+        User(email=str(u_in.email), hashed_password=hashed, role=u_in.role, tenant_id=tenant_id)
+        for u_in, hashed in zip(new_users, hashes)
+    )
+    return len(new_users)
+
+
 # ── Routes ────────────────────────────────────────────────────────────────────
 
 
@@ -117,7 +158,7 @@ def _get_client_or_404(tenant_id: uuid.UUID, db: Session) -> tuple[Tenant, Clien
 )
 def create_client(
     payload: ClientOnboardingIn,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> ClientConfigOut:
     """
@@ -195,21 +236,7 @@ def create_client(
     db.add(cfg)
 
     # Provision initial users
-    users_enrolled = 0
-    for u_in in payload.initial_users:
-        if db.query(User).filter(User.email == str(u_in.email)).first():
-            logger.warning("Skipping duplicate email during enrollment: %s", u_in.email)
-            continue
-        # JIT users get a temporary password; SSO users don't need it
-        temp_pw = secrets.token_urlsafe(16) if payload.jit_provisioning_enabled else secrets.token_urlsafe(16)
-        new_user = User(
-            email=str(u_in.email),
-            hashed_password=hash_password(temp_pw),
-            role=u_in.role,
-            tenant_id=tenant.id,
-        )
-        db.add(new_user)
-        users_enrolled += 1
+    users_enrolled = _enroll_initial_users(payload, tenant.id, db)
 
     # Immutable audit event
     _log_event(
@@ -245,7 +272,7 @@ def create_client(
     summary="List all provisioned enterprise clients",
 )
 def list_clients(
-    _current: Annotated[User, Depends(get_current_user)],
+    _current: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
@@ -276,7 +303,7 @@ def list_clients(
 )
 def get_client(
     tenant_id: uuid.UUID,
-    _current: Annotated[User, Depends(get_current_user)],
+    _current: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> ClientConfigOut:
     tenant, cfg = _get_client_or_404(tenant_id, db)
@@ -291,7 +318,7 @@ def get_client(
 )
 def test_sso_connection(
     tenant_id: uuid.UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> dict[str, Any]:
     """
@@ -369,7 +396,7 @@ def test_sso_connection(
 )
 def rotate_scim_token(
     tenant_id: uuid.UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> SCIMTokenRotateOut:
     """Generate a new SCIM bearer token. The previous token is immediately invalidated."""
@@ -403,18 +430,24 @@ def rotate_scim_token(
     summary="Immutable audit event log (append-only)",
 )
 def list_audit_events(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
+    response: Response,
     tenant_id: uuid.UUID | None = Query(default=None, description="Filter by tenant"),
     event_type: str | None = Query(default=None, description="Filter by event type"),
     limit: int = Query(default=100, ge=1, le=500),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(
+        default=None, description="Opaque cursor from the previous page's X-Next-Cursor header"
+    ),
 ) -> list[AuditEventOut]:
     """Return the immutable audit event log. Super-admin sees all tenants."""
-    q = db.query(AuditEvent).order_by(AuditEvent.created_at.desc())
+    q = select(AuditEvent)
     if tenant_id:
-        q = q.filter(AuditEvent.tenant_id == tenant_id)
+        q = q.where(AuditEvent.tenant_id == tenant_id)
     if event_type:
-        q = q.filter(AuditEvent.event_type == event_type)
-    events = q.offset(offset).limit(limit).all()
+        q = q.where(AuditEvent.event_type == event_type)
+    q = keyset_page(q, AuditEvent.created_at, AuditEvent.id, cursor, offset)
+    events = db.execute(q.limit(limit)).scalars().all()
+    set_next_cursor(response, events, limit)
     return [AuditEventOut.model_validate(e) for e in events]
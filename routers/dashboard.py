@@ -9,18 +9,22 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import uuid
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
-from auth import get_current_user, require_role
+from auth import Principal, get_current_user, require_role
+from cache import TTLCache
 from database import get_db
-from models import Audit, AuditTrace, EnhancedTrace, ScanReport, User
+from engine import ENGINE_VERSION
+from models import Audit, AuditTrace, EnhancedTrace, ScanReport
+from pagination import keyset_page, set_next_cursor
 from schemas import AuditDashboardItemOut, DashboardKPIOut, EnhancedTraceOut
 
 logger = logging.getLogger(__name__)
@@ -180,93 +184,150 @@ def _build_output_summary(report: ScanReport) -> dict[str, Any]:
     }
 
 
-# ── KPI Endpoint ──────────────────────────────────────────────────────────────
+def _raw_response(
+    audit_id: uuid.UUID, cot: dict[str, Any], output_summary: dict[str, Any] | None
+) -> str:
+    """Full structured response representing the pipeline output."""
+    return json.dumps(
+        {
+            "audit_id": str(audit_id),
+            "chain_of_thought": cot,
+            "report_summary": output_summary,
+        },
+        indent=2,
+        default=str,
+    )
 
 
-@router.get(
-    "/kpis",
-    response_model=DashboardKPIOut,
-    dependencies=[Depends(require_role("super_admin", "operator"))],
-    summary="KPI summary bar for the enterprise audit dashboard",
-)
-def get_dashboard_kpis(
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
-) -> DashboardKPIOut:
+def _output_raw_prompt(source_model: str | None, prompt_text: str | None,
+                       raw_output_text: str | None) -> str:
+    """Raw audit pipeline representation of a single-output audit."""
+    return (
+        f"SARO Universal Output Audit — Single-Output Mode\n"
+        f"Source Model: {source_model}\n"
+        f"Gates: Risk Classification (Gate 3) + Compliance Mapping (Gate 4)\n\n"
+        f"--- ORIGINAL PROMPT ---\n{prompt_text or '[not provided]'}\n\n"
+        f"--- RAW AI OUTPUT ---\n{raw_output_text or '[not provided]'}"
+    )
+
+
+def _trace_out(trace: EnhancedTrace) -> EnhancedTraceOut:
     """
-    Returns aggregated KPIs for the authenticated tenant plus a 30-day
-    risk-score trend series for the trend chart.
+    Serialise a stored trace.  raw_response is only a pretty-printed copy of
+    the chain of thought, and a single-output raw_prompt only wraps
+    prompt_text / raw_output_text, so new traces store neither and they are
+    rendered here instead; older rows that still carry them return them
+    unchanged.
     """
-    tenant_id = current_user.tenant_id
+    out = EnhancedTraceOut.model_validate(trace)
+    input_summary = trace.client_input_summary or {}
+    if out.raw_prompt is None and input_summary.get("ingestion_mode") == "single_output":
+        out.raw_prompt = _output_raw_prompt(
+            input_summary.get("source_model"), trace.prompt_text, trace.raw_output_text
+        )
+    if out.raw_response is None:
+        out.raw_response = _raw_response(
+            trace.audit_id, trace.chain_of_thought, trace.client_output_summary
+        )
+    return out
 
-    audits = db.query(Audit).filter(Audit.tenant_id == tenant_id).all()
-    total = len(audits)
-    completed = sum(1 for a in audits if a.status == "completed")
-    failed = sum(1 for a in audits if a.status == "failed")
 
-    # Aggregate report metrics for completed audits
-    reports = (
-        db.query(ScanReport)
-        .join(Audit, ScanReport.audit_id == Audit.id)
-        .filter(Audit.tenant_id == tenant_id, Audit.status == "completed")
-        .all()
-    )
-    avg_risk = (
-        sum(r.overall_risk_score for r in reports if r.overall_risk_score is not None)
-        / max(len([r for r in reports if r.overall_risk_score is not None]), 1)
-        if reports
-        else None
-    )
-    avg_mit = (
-        sum(r.mit_coverage_score for r in reports if r.mit_coverage_score is not None)
-        / max(len([r for r in reports if r.mit_coverage_score is not None]), 1)
-        if reports
-        else None
-    )
+# ── KPI Endpoint ──────────────────────────────────────────────────────────────
 
-    # Pending remediations across all completed audits
-    audit_ids = [a.id for a in audits if a.status == "completed"]
-    pending_rem = 0
-    if audit_ids:
-        pending_rem = (
-            db.query(AuditTrace)
-            .filter(
-                AuditTrace.audit_id.in_(audit_ids),
-                AuditTrace.result.in_(list(_FAILED_RESULTS)),
-                AuditTrace.is_remediated == False,  # noqa: E712
-            )
-            .count()
+# Per-tenant KPI cache.  Entries are dropped as soon as a tenant's audit
+# finishes or a trace is remediated (invalidate_kpis); the TTL only bounds
+# staleness in other worker processes.
+KPI_CACHE_TTL: float = float(os.environ.get("DASHBOARD_KPI_CACHE_SECONDS", "60"))
+_kpi_cache: TTLCache[DashboardKPIOut] = TTLCache(ttl=KPI_CACHE_TTL)
+
+
+def invalidate_kpis(tenant_id: uuid.UUID | None) -> None:
+    """Forget the cached KPIs for ``tenant_id`` (call after audit status changes)."""
+    if tenant_id is not None:
+        _kpi_cache.invalidate(tenant_id)
+
+
+def _compute_kpis(tenant_id: uuid.UUID, db: Session) -> DashboardKPIOut:
+    """
+    KPIs from two aggregate queries — totals plus pending remediations, and
+    the 30-day trend grouped by completion day — independent of how many
+    audits the tenant has.
+    """
+    is_completed = Audit.status == "completed"
+    pending_rem = (
+        select(func.count(AuditTrace.id))
+        .join(Audit, AuditTrace.audit_id == Audit.id)
+        .where(
+            Audit.tenant_id == tenant_id,
+            is_completed,
+            AuditTrace.result.in_(list(_FAILED_RESULTS)),
+            AuditTrace.is_remediated == False,  # noqa: E712
+        )
+        .scalar_subquery()
+    )
+    totals = db.execute(
+        select(
+            func.count(Audit.id),
+            func.count(case((is_completed, 1))),
+            func.count(case((Audit.status == "failed", 1))),
+            func.avg(case((is_completed, ScanReport.overall_risk_score))),
+            func.avg(case((is_completed, ScanReport.mit_coverage_score))),
+            pending_rem,
         )
+        .select_from(Audit)
+        .outerjoin(ScanReport, ScanReport.audit_id == Audit.id)
+        .where(Audit.tenant_id == tenant_id)
+    ).one()
+    total, completed, failed, avg_risk, avg_mit, pending = totals
 
     # 30-day risk score trend (one data point per day with a completed audit)
     cutoff = datetime.now(tz=timezone.utc) - timedelta(days=30)
-    trend_data: dict[str, list[float]] = defaultdict(list)
-    for r in reports:
-        audit = db.get(Audit, r.audit_id)
-        if not audit or not audit.completed_at:
-            continue
-        if audit.completed_at < cutoff:
-            continue
-        day_key = audit.completed_at.strftime("%Y-%m-%d")
-        if r.overall_risk_score is not None:
-            trend_data[day_key].append(r.overall_risk_score)
-
+    day = func.date(Audit.completed_at)
+    trend_rows = db.execute(
+        select(day, func.avg(ScanReport.overall_risk_score))
+        .join(ScanReport, ScanReport.audit_id == Audit.id)
+        .where(
+            Audit.tenant_id == tenant_id,
+            is_completed,
+            Audit.completed_at >= cutoff,
+            ScanReport.overall_risk_score.is_not(None),
+        )
+        .group_by(day)
+        .order_by(day)
+    ).all()
     risk_trend = [
-        {"date": d, "avg_risk_score": round(sum(scores) / len(scores), 2)}
-        for d, scores in sorted(trend_data.items())
+        {"date": str(d), "avg_risk_score": round(float(score), 2)} for d, score in trend_rows
     ]
 
     return DashboardKPIOut(
         total_audits=total,
         completed_audits=completed,
         failed_audits=failed,
-        avg_risk_score=round(avg_risk, 2) if avg_risk is not None else None,
-        avg_mit_coverage=round(avg_mit, 2) if avg_mit is not None else None,
-        pending_remediations=pending_rem,
+        avg_risk_score=round(float(avg_risk), 2) if avg_risk is not None else None,
+        avg_mit_coverage=round(float(avg_mit), 2) if avg_mit is not None else None,
+        pending_remediations=pending or 0,
         risk_trend=risk_trend,
     )
 
 
+@router.get(
+    "/kpis",
+    response_model=DashboardKPIOut,
+    dependencies=[Depends(require_role("super_admin", "operator"))],
+    summary="KPI summary bar for the enterprise audit dashboard",
+)
+def get_dashboard_kpis(
+    current_user: Annotated[Principal, Depends(get_current_user)],
+    db: Annotated[Session, Depends(get_db)],
+) -> DashboardKPIOut:
+    """
+    Returns aggregated KPIs for the authenticated tenant plus a 30-day
+    risk-score trend series for the trend chart, cached per tenant.
+    """
+    tenant_id = current_user.tenant_id
+    return _kpi_cache.get_or_compute(tenant_id, lambda: _compute_kpis(tenant_id, db))
+
+
 # ── Enhanced Audit List ───────────────────────────────────────────────────────
 
 
@@ -277,41 +338,53 @@ def get_dashboard_kpis(
     summary="Enhanced audit list with risk colour, exception counts, remediation status",
 )
 def list_dashboard_audits(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
+    response: Response,
     status_filter: str | None = Query(default=None, description="Filter by status: completed|failed|pending|running"),
     limit: int = Query(default=100, ge=1, le=500),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(
+        default=None, description="Opaque cursor from the previous page's X-Next-Cursor header"
+    ),
 ) -> list[AuditDashboardItemOut]:
     """
     Returns audits enriched with per-row metrics needed for the dashboard table:
     risk colour, exception count, remediation progress, confidence.
     """
+    # One round trip: the report columns come from an outer join and the
+    # exception / remediated counts from correlated COUNT subqueries, which
+    # only run for the page of audits being returned.
+    is_exception = AuditTrace.result.in_(list(_FAILED_RESULTS))
+    trace_count = (
+        select(func.count(AuditTrace.id))
+        .where(AuditTrace.audit_id == Audit.id, is_exception)
+        .correlate(Audit)
+    )
     q = (
-        db.query(Audit)
-        .filter(Audit.tenant_id == current_user.tenant_id)
-        .order_by(Audit.created_at.desc())
+        select(
+            Audit,
+            ScanReport.overall_risk_score,
+            ScanReport.mit_coverage_score,
+            ScanReport.confidence_score,
+            trace_count.scalar_subquery().label("exceptions"),
+            trace_count.where(AuditTrace.is_remediated == True)  # noqa: E712
+            .scalar_subquery()
+            .label("remediated"),
+        )
+        .outerjoin(ScanReport, ScanReport.audit_id == Audit.id)
+        .where(Audit.tenant_id == current_user.tenant_id)
     )
     if status_filter:
-        q = q.filter(Audit.status == status_filter)
-    audits = q.offset(offset).limit(limit).all()
+        q = q.where(Audit.status == status_filter)
+    q = keyset_page(q, Audit.created_at, Audit.id, cursor, offset)
+    rows = db.execute(q.limit(limit)).all()
 
     items: list[AuditDashboardItemOut] = []
-    for audit in audits:
-        report = db.query(ScanReport).filter(ScanReport.audit_id == audit.id).first()
-
-        risk_score = report.overall_risk_score if report else None
-        mit_cov = report.mit_coverage_score if report else None
-        confidence = report.confidence_score if report else None
-
-        # Exception metrics from trace records
-        all_traces = (
-            db.query(AuditTrace).filter(AuditTrace.audit_id == audit.id).all()
-            if audit.status == "completed"
-            else []
-        )
-        exceptions = sum(1 for t in all_traces if t.result in _FAILED_RESULTS)
-        remediated = sum(1 for t in all_traces if t.result in _FAILED_RESULTS and t.is_remediated)
+    for audit, risk_score, mit_cov, confidence, exceptions, remediated in rows:
+        # Exception metrics only count once the audit has completed
+        if audit.status != "completed":
+            exceptions = remediated = 0
 
         items.append(
             AuditDashboardItemOut(
@@ -330,6 +403,7 @@ def list_dashboard_audits(
                 confidence_score=confidence,
             )
         )
+    set_next_cursor(response, items, limit)
     return items
 
 
@@ -344,7 +418,7 @@ def list_dashboard_audits(
 )
 def get_enhanced_trace(
     audit_id: uuid.UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> EnhancedTraceOut:
     """
@@ -366,7 +440,7 @@ def get_enhanced_trace(
     # Return cached enhanced trace if it exists
     existing = db.query(EnhancedTrace).filter(EnhancedTrace.audit_id == audit_id).first()
     if existing:
-        return EnhancedTraceOut.model_validate(existing)
+        return _trace_out(existing)
 
     # Synthesise from AuditTrace + ScanReport (first access)
     traces = (
@@ -397,31 +471,19 @@ def get_enhanced_trace(
         )
     )
 
-    # Full structured response representing the pipeline output
-    raw_response = json.dumps(
-        {
-            "audit_id": str(audit_id),
-            "chain_of_thought": cot,
-            "report_summary": output_summary,
-        },
-        indent=2,
-        default=str,
-    )
-
     enhanced = EnhancedTrace(
         audit_id=audit_id,
         confidence=report.confidence_score,
-        model_version="saro-engine-1.0",
+        model_version=ENGINE_VERSION,
         executive_summary=exec_summary,
         chain_of_thought=cot,
         client_input_summary=input_summary,
         client_output_summary=output_summary,
         raw_prompt=raw_prompt,
-        raw_response=raw_response,
     )
     db.add(enhanced)
     db.commit()
     db.refresh(enhanced)
 
     logger.info("Synthesised and cached EnhancedTrace for audit %s", audit_id)
-    return EnhancedTraceOut.model_validate(enhanced)
+    return _trace_out(enhanced)
@@ -17,15 +17,16 @@ import hashlib
 import logging
 import uuid
 from datetime import datetime, timezone
-from typing import Annotated, Any
+from typing import Annotated
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from auth import get_current_user, require_role
+import github_scanner
+from auth import Principal, get_current_user, require_role
 from database import get_db
-from models import Audit, AuditTrace, GitHubIntegration, GitHubScanResult, User
+from models import Audit, AuditTrace, GitHubIntegration, GitHubScanResult
 from routers.clients import _log_event
 from schemas import (
     GitHubIntegrationConfigIn,
@@ -36,8 +37,6 @@ from schemas import (
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/github", tags=["github-integration"])
 
-_GITHUB_API = "https://api.github.com"
-_SNIPPET_MAX_CHARS = 500  # max snippet length stored per file — never full file
 _MAX_RESULTS_PER_SCAN = 20  # cap on correlated file results per audit
 
 # MIT domain → search keywords for GitHub code search
@@ -76,65 +75,6 @@ def _get_integration_or_404(tenant_id: uuid.UUID, db: Session) -> GitHubIntegrat
     return integ
 
 
-def _github_headers(pat: str) -> dict[str, str]:
-    return {
-        "Authorization": f"token {pat}",
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
-
-
-def _search_code(
-    pat: str,
-    query: str,
-    repo: str,
-    timeout: int = 10,
-) -> list[dict[str, Any]]:
-    """GitHub code search — read-only, returns file paths and snippets."""
-    try:
-        url = f"{_GITHUB_API}/search/code"
-        params = {"q": f"{query} repo:{repo}", "per_page": 5}
-        resp = httpx.get(url, headers=_github_headers(pat), params=params, timeout=timeout)
-        if resp.status_code == 200:
-            return resp.json().get("items", [])
-        if resp.status_code == 422:
-            return []  # Query too complex / no results
-        logger.warning("GitHub search returned %d for query %r in %s", resp.status_code, query, repo)
-        return []
-    except httpx.TimeoutException:
-        logger.warning("GitHub search timed out for %r in %s", query, repo)
-        return []
-    except Exception as exc:
-        logger.warning("GitHub search error: %s", exc)
-        return []
-
-
-def _fetch_file_snippet(
-    pat: str,
-    repo: str,
-    path: str,
-    max_chars: int = _SNIPPET_MAX_CHARS,
-) -> tuple[str | None, str | None]:
-    """
-    Fetch the first `max_chars` of a file from GitHub (read-only).
-    Returns (snippet, sha256_of_content).
-    Full file content is NEVER stored — only the snippet.
-    """
-    try:
-        url = f"{_GITHUB_API}/repos/{repo}/contents/{path}"
-        resp = httpx.get(url, headers=_github_headers(pat), timeout=10)
-        if resp.status_code != 200:
-            return None, None
-        data = resp.json()
-        import base64
-        content = base64.b64decode(data.get("content", "")).decode("utf-8", errors="replace")
-        scan_hash = hashlib.sha256(content.encode()).hexdigest()
-        snippet = content[:max_chars] + ("…" if len(content) > max_chars else "")
-        return snippet, scan_hash
-    except Exception:
-        return None, None
-
-
 def _correlate_finding(domain: str, path: str, snippet: str | None) -> str:
     """Generate a human-readable correlation note from domain + file path."""
     hints = {
@@ -165,7 +105,7 @@ def _correlate_finding(domain: str, path: str, snippet: str | None) -> str:
 )
 def configure_github(
     payload: GitHubIntegrationConfigIn,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> GitHubIntegrationOut:
     """
@@ -176,10 +116,8 @@ def configure_github(
     """
     # Validate PAT has basic GitHub API access (read-only test)
     try:
-        resp = httpx.get(
-            f"{_GITHUB_API}/user",
-            headers=_github_headers(payload.access_token),
-            timeout=10,
+        resp = github_scanner.get_client().get(
+            "/user", headers=github_scanner.github_headers(payload.access_token)
         )
         if resp.status_code == 401:
             raise HTTPException(status_code=400, detail="Invalid GitHub Personal Access Token.")
@@ -239,7 +177,7 @@ def configure_github(
     summary="GitHub integration status",
 )
 def get_github_status(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> GitHubIntegrationOut:
     """Return the current GitHub integration configuration for this tenant."""
@@ -254,7 +192,7 @@ def get_github_status(
     summary="Revoke GitHub integration — clears token immediately",
 )
 def disconnect_github(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> None:
     """
@@ -281,7 +219,7 @@ def disconnect_github(
 )
 def scan_repos_for_audit(
     audit_id: uuid.UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> list[GitHubScanResultOut]:
     """
@@ -332,7 +270,7 @@ def scan_repos_for_audit(
 def scan_repos_with_token(
     audit_id: uuid.UUID,
     pat: str,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> list[GitHubScanResultOut]:
     """
@@ -375,43 +313,30 @@ def scan_repos_with_token(
     db.query(GitHubScanResult).filter(GitHubScanResult.audit_id == audit_id).delete()
     db.commit()
 
+    # max 2 terms per domain to avoid rate limiting; searches and snippet
+    # fetches run concurrently on the shared client (see github_scanner.py)
+    searches = [
+        (repo, domain, term)
+        for repo in integ.allowed_repos
+        for domain in triggered_domains
+        for term in _DOMAIN_SEARCH_TERMS.get(domain, [domain.lower().replace(" & ", " ")])[:2]
+    ]
+    hits = github_scanner.scan(pat, searches, max_results=_MAX_RESULTS_PER_SCAN)
+
     results: list[GitHubScanResult] = []
-    total_found = 0
-
-    for repo in integ.allowed_repos:
-        if total_found >= _MAX_RESULTS_PER_SCAN:
-            break
-
-        for domain in triggered_domains:
-            search_terms = _DOMAIN_SEARCH_TERMS.get(domain, [domain.lower().replace(" & ", " ")])
-
-            for term in search_terms[:2]:  # max 2 terms per domain to avoid rate limiting
-                items = _search_code(pat, term, repo, timeout=10)
-
-                for item in items[:3]:  # max 3 files per search term
-                    if total_found >= _MAX_RESULTS_PER_SCAN:
-                        break
-
-                    file_path = item.get("path", "")
-                    if not file_path:
-                        continue
-
-                    snippet, scan_hash = _fetch_file_snippet(pat, repo, file_path)
-                    correlation_note = _correlate_finding(domain, file_path, snippet)
-
-                    result = GitHubScanResult(
-                        audit_id=audit_id,
-                        repo_name=repo,
-                        file_path=file_path,
-                        line_number=None,  # GitHub code search doesn't return line numbers
-                        snippet=snippet,
-                        correlation_note=correlation_note,
-                        finding_domain=domain,
-                        scan_hash=scan_hash,
-                    )
-                    db.add(result)
-                    results.append(result)
-                    total_found += 1
+    for hit in hits:
+        result = GitHubScanResult(
+            audit_id=audit_id,
+            repo_name=hit.repo,
+            file_path=hit.path,
+            line_number=None,  # GitHub code search doesn't return line numbers
+            snippet=hit.snippet,
+            correlation_note=_correlate_finding(hit.domain, hit.path, hit.snippet),
+            finding_domain=hit.domain,
+            scan_hash=hit.scan_hash,
+        )
+        db.add(result)
+        results.append(result)
 
     db.commit()
     for r in results:
@@ -442,7 +367,7 @@ def scan_repos_with_token(
 )
 def get_scan_results(
     audit_id: uuid.UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> list[GitHubScanResultOut]:
     """Return all GitHub scan results previously stored for this audit."""
@@ -2,32 +2,52 @@
 Universal AI Output Ingestion routes.
 
 POST /api/v1/audit/output        — audit any single AI-generated output
+POST /api/v1/audit/output/batch  — audit many outputs in one call (bulk-written)
 GET  /api/v1/audit/output/{id}   — retrieve result + full enhanced trace
+                                   (offloaded texts streamed from the blob store)
 
 SARO never calls external models — the caller provides the raw output.
 Accepts outputs from Grok, Claude, OpenAI, Sierra, internal models, or any source.
 """
 from __future__ import annotations
 
+import codecs
 import hashlib
 import json
 import logging
 import os
+import re
 import uuid
+from collections.abc import Iterator
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
-from auth import get_current_user, require_role
+import rollups
+from auth import Principal, get_current_user, require_role
+from blobstore import BLOB_OFFLOAD_BYTES, get_blob_store, put_async
 from database import get_db
-from engine import SARoEngine
-from models import Audit, AuditMetadata, AuditTrace, EnhancedTrace, ScanReport, User
-from routers.dashboard import _synthesize_cot, _generate_executive_summary, _build_output_summary
+from engine import ENGINE_VERSION, get_audit_engine
+from models import Audit, AuditMetadata, AuditTrace, EnhancedTrace, ScanReport
+from routers.dashboard import (
+    _FAILED_RESULTS,
+    _build_output_summary,
+    _generate_executive_summary,
+    _synthesize_cot,
+    _trace_out,
+    invalidate_kpis,
+)
+from routers.scan import _trace_rows
 from schemas import (
     AuditReportOut,
     EnhancedTraceOut,
+    OutputAuditBatchIn,
+    OutputAuditBatchOut,
     SingleOutputAuditIn,
     SingleOutputAuditOut,
 )
@@ -35,73 +55,101 @@ from schemas import (
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/audit", tags=["output-audit"])
 
-_AWS_S3_BUCKET = os.environ.get("AWS_S3_BUCKET", "")
 _SARO_API_URL = os.environ.get("SARO_API_URL", "http://localhost:8000").rstrip("/")
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
 
-def _store_text_field(text: str, s3_prefix: str) -> tuple[str | None, str | None]:
+def _offload_text(text: str) -> Future | None:
+    """
+    Start uploading ``text`` to the blob store if it is too large to keep
+    inline (see blobstore.py); None when it stays in the DB.
     """
-    Store a large text field.
+    store = get_blob_store()
+    data = text.encode("utf-8")
+    if store is None or len(data) < BLOB_OFFLOAD_BYTES:
+        return None
+    return put_async(store, data)
+
 
-    Returns (db_text, s3_key).
-    If AWS_S3_BUCKET is set and text exceeds 50 KB, uploads to S3 and returns
-    the object key.  Otherwise stores directly in the DB.
+def _stored_text(text: str, upload: Future | None) -> tuple[str | None, str | None]:
     """
-    if _AWS_S3_BUCKET and len(text.encode("utf-8")) > 50_000:
-        try:
-            import boto3  # type: ignore[import]
-            s3 = boto3.client("s3")
-            key = f"traces/{s3_prefix}/{uuid.uuid4()}.txt"
-            s3.put_object(
-                Bucket=_AWS_S3_BUCKET,
-                Key=key,
-                Body=text.encode("utf-8"),
-                ContentType="text/plain; charset=utf-8",
-            )
-            logger.info("Stored large text in S3: s3://%s/%s", _AWS_S3_BUCKET, key)
-            return None, key
-        except Exception as exc:
-            logger.warning("S3 upload failed, falling back to DB storage: %s", exc)
-    return text, None
-
-
-def _persist_output_traces(engine: SARoEngine, audit_id: uuid.UUID, db: Session) -> None:
-    """Persist traces from a single-output audit (same as batch path)."""
-    traces = engine.get_traces()
-    if not traces:
-        return
+    Returns (db_text, blob_key) once ``upload`` has finished — the text stays
+    in the DB when it was not offloaded or the upload failed.
+    """
+    if upload is None:
+        return text, None
     try:
-        for t in traces:
-            db.add(AuditTrace(
-                audit_id=audit_id,
-                gate_id=t["gate_id"],
-                gate_name=t["gate_name"],
-                check_type=t["check_type"],
-                check_name=t["check_name"],
-                result=t["result"],
-                reason=t.get("reason"),
-                detail_json=t.get("detail_json"),
-                remediation_hint=t.get("remediation_hint"),
-            ))
-        db.commit()
+        return None, upload.result()
     except Exception as exc:
-        logger.warning("Could not persist traces for output audit %s: %s", audit_id, exc)
-        db.rollback()
+        logger.warning("Blob upload failed, falling back to DB storage: %s", exc)
+        return text, None
+
 
+def _stream_trace(out: EnhancedTraceOut, blobs: dict[str, Iterator[bytes]]) -> Iterator[bytes]:
+    """
+    The JSON body of ``out`` with each field in ``blobs`` (field → opened blob
+    stream) filled straight from the store, so an offloaded text is never
+    held in memory whole.
+    """
+    body = out.model_dump(mode="json")
+    placeholders: dict[str, Iterator[bytes]] = {}
+    for field, stream in blobs.items():
+        body[field] = f"\0blob:{field}\0"
+        placeholders[json.dumps(body[field])] = stream
+    pattern = "(" + "|".join(re.escape(p) for p in placeholders) + ")"
+    for piece in re.split(pattern, json.dumps(body)):
+        if piece not in placeholders:
+            yield piece.encode()
+            continue
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        yield b'"'
+        for chunk in placeholders[piece]:
+            yield json.dumps(decoder.decode(chunk))[1:-1].encode()
+        yield json.dumps(decoder.decode(b"", final=True))[1:-1].encode() + b'"'
+
+
+def _audit_traces(
+    traces: list[dict], audit_id: uuid.UUID, created_at: datetime
+) -> tuple[list[dict], list[AuditTrace]]:
+    """
+    audit_traces column values for an output audit's engine traces, plus
+    transient AuditTrace objects built from them for the chain-of-thought —
+    so the enhanced trace never has to read back the rows it just wrote.
+    """
+    rows = [{**row, "created_at": created_at} for row in _trace_rows(traces, audit_id)]
+    return rows, [AuditTrace(**row) for row in rows]
+
+
+def _scan_report(
+    audit_id: uuid.UUID, report: AuditReportOut, payload: SingleOutputAuditIn
+) -> ScanReport:
+    """The ScanReport row for a single-output audit (report + ingestion context)."""
+    return ScanReport(
+        audit_id=audit_id,
+        mit_coverage_score=report.mit_coverage.score,
+        fixed_delta=report.fixed_delta.delta,
+        overall_risk_score=report.bayesian_scores.overall,
+        confidence_score=report.confidence_score,
+        report_json={
+            **report.model_dump(mode="json"),
+            "source_model": payload.source_model,
+            "ingestion_method": payload.ingestion_method,
+            "metadata": payload.metadata,
+        },
+    )
 
-def _build_enhanced_trace(
+
+def _enhanced_trace(
     audit_id: uuid.UUID,
     prompt_text: str | None,
     raw_output_text: str | None,
     report: ScanReport,
     traces: list[AuditTrace],
     source_model: str,
-    db: Session,
 ) -> EnhancedTrace:
-    """Synthesise and persist the full enhanced trace for a single-output audit."""
+    """Synthesise (but do not persist) the enhanced trace for a single-output audit."""
     cot = _synthesize_cot(traces)
     exec_summary = _generate_executive_summary(report, traces)
     output_summary = _build_output_summary(report)
@@ -114,19 +162,6 @@ def _build_enhanced_trace(
         "note": "Full prompt and output text stored in prompt_text / raw_output_text fields.",
     }
 
-    # Build the raw audit pipeline representation
-    raw_prompt_desc = (
-        f"SARO Universal Output Audit — Single-Output Mode\n"
-        f"Source Model: {source_model}\n"
-        f"Gates: Risk Classification (Gate 3) + Compliance Mapping (Gate 4)\n\n"
-        f"--- ORIGINAL PROMPT ---\n{prompt_text or '[not provided]'}\n\n"
-        f"--- RAW AI OUTPUT ---\n{raw_output_text or '[not provided]'}"
-    )
-    raw_response_desc = json.dumps(
-        {"audit_id": str(audit_id), "chain_of_thought": cot, "report_summary": output_summary},
-        indent=2, default=str,
-    )
-
     # Export hash (SHA-256 of the full trace JSON)
     export_payload = json.dumps(
         {
@@ -141,24 +176,18 @@ def _build_enhanced_trace(
     )
     export_hash = hashlib.sha256(export_payload.encode()).hexdigest()
 
-    enhanced = EnhancedTrace(
+    return EnhancedTrace(
         audit_id=audit_id,
         confidence=report.confidence_score,
-        model_version="saro-engine-1.0",
+        model_version=ENGINE_VERSION,
         executive_summary=exec_summary,
         chain_of_thought=cot,
         client_input_summary=input_summary,
         client_output_summary=output_summary,
-        raw_prompt=raw_prompt_desc,
-        raw_response=raw_response_desc,
         prompt_text=prompt_text,
         raw_output_text=raw_output_text,
         export_hash=export_hash,
     )
-    db.add(enhanced)
-    db.commit()
-    db.refresh(enhanced)
-    return enhanced
 
 
 # ── Routes ────────────────────────────────────────────────────────────────────
@@ -180,21 +209,21 @@ def _build_enhanced_trace(
 )
 def audit_single_output(
     payload: SingleOutputAuditIn,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> SingleOutputAuditOut:
     """
     Universal AI output ingestion.
 
     Creates an Audit record, runs the single-output pipeline (Gates 3+4),
-    persists the report, synthesises a full enhanced trace, and returns the
-    complete result immediately.
+    then persists the report, traces and full enhanced trace in one
+    transaction and returns the complete result immediately.
     """
     audit_id = uuid.uuid4()
 
-    # Handle large text storage (S3 or DB)
-    prompt_db, prompt_s3 = _store_text_field(payload.prompt, f"{audit_id}/prompt")
-    output_db, output_s3 = _store_text_field(payload.raw_output, f"{audit_id}/output")
+    # Large texts go to the blob store; the uploads overlap the audit itself
+    prompt_upload = _offload_text(payload.prompt)
+    output_upload = _offload_text(payload.raw_output)
 
     # Persist Audit record
     audit = Audit(
@@ -213,14 +242,12 @@ def audit_single_output(
         audit_id=audit_id,
         source_model=payload.source_model,
         ingestion_method=payload.ingestion_method,
-        prompt_s3_key=prompt_s3,
-        output_s3_key=output_s3,
     )
     db.add(meta)
     db.commit()
 
     try:
-        engine = SARoEngine(db)
+        engine = get_audit_engine(db)
         report: AuditReportOut = engine.run_output_audit(
             audit_id=audit_id,
             raw_output=payload.raw_output,
@@ -228,47 +255,28 @@ def audit_single_output(
             source_model=payload.source_model,
         )
 
-        scan_report = ScanReport(
-            audit_id=audit_id,
-            mit_coverage_score=report.mit_coverage.score,
-            fixed_delta=report.fixed_delta.delta,
-            overall_risk_score=report.bayesian_scores.overall,
-            confidence_score=report.confidence_score,
-            report_json={
-                **report.model_dump(mode="json"),
-                "source_model": payload.source_model,
-                "ingestion_method": payload.ingestion_method,
-                "metadata": payload.metadata,
-            },
-        )
-        db.add(scan_report)
+        completed_at = datetime.now(tz=timezone.utc)
+        scan_report = _scan_report(audit_id, report, payload)
+        trace_rows, traces = _audit_traces(engine.get_traces(), audit_id, completed_at)
+        prompt_db, meta.prompt_s3_key = _stored_text(payload.prompt, prompt_upload)
+        output_db, meta.output_s3_key = _stored_text(payload.raw_output, output_upload)
         audit.status = report.status
-        audit.completed_at = datetime.now(tz=timezone.utc)
-        db.commit()
-
-        # Persist traces
-        _persist_output_traces(engine, audit_id, db)
+        audit.completed_at = completed_at
 
-        # Build and persist enhanced trace (with verbatim prompt + output)
-        traces = (
-            db.query(AuditTrace)
-            .filter(AuditTrace.audit_id == audit_id)
-            .order_by(AuditTrace.gate_id, AuditTrace.created_at)
-            .all()
-        )
-        _build_enhanced_trace(
-            audit_id=audit_id,
-            prompt_text=prompt_db,
-            raw_output_text=output_db,
-            report=scan_report,
-            traces=traces,
-            source_model=payload.source_model,
-            db=db,
+        # Report, traces and enhanced trace (verbatim prompt + output) commit together
+        db.add(scan_report)
+        db.add(
+            _enhanced_trace(
+                audit_id, prompt_db, output_db, scan_report, traces, payload.source_model
+            )
         )
+        if trace_rows:
+            db.execute(insert(AuditTrace.__table__), trace_rows)
+        rollups.record_report(db, audit, scan_report)
+        db.commit()
+        invalidate_kpis(audit.tenant_id)
 
-        # Count exceptions
-        failed_results = {"fail", "warn", "flagged", "triggered"}
-        exceptions = sum(1 for t in traces if t.result in failed_results)
+        exceptions = sum(1 for t in traces if t.result in _FAILED_RESULTS)
 
         logger.info(
             "Output audit %s completed: model=%s, risk=%.2f, exceptions=%d",
@@ -297,6 +305,7 @@ def audit_single_output(
             audit.status = "failed"
             audit.completed_at = datetime.now(tz=timezone.utc)
             db.commit()
+            invalidate_kpis(audit.tenant_id)
         except Exception:
             db.rollback()
         logger.exception("Output audit %s failed: %s", audit_id, exc)
@@ -306,6 +315,120 @@ def audit_single_output(
         ) from exc
 
 
+@router.post(
+    "/output/batch",
+    response_model=OutputAuditBatchOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_role("super_admin", "operator"))],
+    summary="Audit many AI-generated outputs in one call",
+    description=(
+        "Bulk form of `POST /api/v1/audit/output` for logging production inference traffic. "
+        "Every output gets its own audit, report, traces and enhanced trace — identical to the "
+        "single-output endpoint — but Gates 3/4 run once over the whole list and all rows are "
+        "written in one transaction."
+    ),
+)
+def audit_output_batch(
+    payload: OutputAuditBatchIn,
+    current_user: Annotated[Principal, Depends(get_current_user)],
+    db: Annotated[Session, Depends(get_db)],
+) -> OutputAuditBatchOut:
+    """
+    Vectorised single-output audits.  Nothing is written until every output
+    has been audited, so an engine error leaves no partial batch behind.
+    """
+    outputs = payload.outputs
+    audit_ids = [uuid.uuid4() for _ in outputs]
+    uploads = [(_offload_text(o.prompt), _offload_text(o.raw_output)) for o in outputs]
+    try:
+        engine = get_audit_engine(db)
+        audited = engine.run_output_audits(
+            [(aid, o.raw_output, o.prompt, o.source_model) for aid, o in zip(audit_ids, outputs)]
+        )
+    except Exception as exc:
+        logger.exception("Output audit batch of %d failed: %s", len(outputs), exc)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Output audit engine error: {exc}",
+        ) from exc
+
+    completed_at = datetime.now(tz=timezone.utc)
+    rows: list[Any] = []
+    trace_rows: list[dict] = []
+    reports: list[tuple[Audit, ScanReport]] = []
+    results: list[SingleOutputAuditOut] = []
+    for audit_id, o, (report, traces), (prompt_upload, output_upload) in zip(
+        audit_ids, outputs, audited, uploads
+    ):
+        prompt_db, prompt_s3 = _stored_text(o.prompt, prompt_upload)
+        output_db, output_s3 = _stored_text(o.raw_output, output_upload)
+        audit = Audit(
+            id=audit_id,
+            tenant_id=current_user.tenant_id,
+            user_id=current_user.id,
+            batch_id=None,
+            dataset_name=f"Single Output ({o.source_model})",
+            sample_count=1,
+            status=report.status,
+            completed_at=completed_at,
+        )
+        scan_report = _scan_report(audit_id, report, o)
+        audit_traces, trace_objs = _audit_traces(traces, audit_id, completed_at)
+        rows += [
+            audit,
+            AuditMetadata(
+                audit_id=audit_id,
+                source_model=o.source_model,
+                ingestion_method=o.ingestion_method,
+                prompt_s3_key=prompt_s3,
+                output_s3_key=output_s3,
+            ),
+            scan_report,
+            _enhanced_trace(audit_id, prompt_db, output_db, scan_report, trace_objs, o.source_model),
+        ]
+        trace_rows += audit_traces
+        reports.append((audit, scan_report))
+        results.append(
+            SingleOutputAuditOut(
+                audit_id=audit_id,
+                status=report.status,
+                source_model=o.source_model,
+                ingestion_method=o.ingestion_method,
+                risk_score=report.bayesian_scores.overall,
+                mit_coverage_pct=report.mit_coverage.score * 100,
+                confidence_score=report.confidence_score,
+                exceptions_count=sum(1 for t in traces if t["result"] in _FAILED_RESULTS),
+                remediation_count=len(report.remediations),
+                trace_endpoint=f"{_SARO_API_URL}/api/v1/dashboard/audits/{audit_id}/trace",
+                report=report,
+                created_at=completed_at,
+            )
+        )
+
+    # One transaction: batched INSERTs per table, traces via one executemany
+    try:
+        db.add_all(rows)
+        db.flush()
+        if trace_rows:
+            db.execute(insert(AuditTrace.__table__), trace_rows)
+        rollups.record_reports(db, reports)
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        logger.exception("Could not persist output audit batch of %d: %s", len(outputs), exc)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Output audit batch could not be saved: {exc}",
+        ) from exc
+    invalidate_kpis(current_user.tenant_id)
+
+    logger.info(
+        "Output audit batch: %d outputs audited for tenant %s",
+        len(results), current_user.tenant_id,
+    )
+    return OutputAuditBatchOut(count=len(results), results=results)
+
+
 @router.get(
     "/output/{audit_id}",
     response_model=EnhancedTraceOut,
@@ -314,13 +437,16 @@ def audit_single_output(
 )
 def get_output_audit_trace(
     audit_id: uuid.UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
-) -> EnhancedTraceOut:
+) -> EnhancedTraceOut | StreamingResponse:
     """
     Returns the full, untruncated enhanced trace including verbatim
     prompt text and raw AI output.  Includes the export hash for
     cryptographic verification of the trace integrity.
+
+    Texts offloaded to the blob store are streamed into the response body
+    rather than loaded whole.
     """
     audit = db.get(Audit, audit_id)
     if not audit or audit.tenant_id != current_user.tenant_id:
@@ -332,4 +458,20 @@ def get_output_audit_trace(
             status_code=404,
             detail="Enhanced trace not found. The audit may still be processing.",
         )
-    return EnhancedTraceOut.model_validate(trace)
+    out = _trace_out(trace)
+
+    meta = db.query(AuditMetadata).filter(AuditMetadata.audit_id == audit_id).first()
+    store = get_blob_store()
+    blobs = {
+        field: key
+        for field, key in (
+            ("prompt_text", meta and meta.prompt_s3_key),
+            ("raw_output_text", meta and meta.output_s3_key),
+        )
+        if key and getattr(out, field) is None
+    }
+    if not blobs or store is None:
+        return out
+    # Open every blob up front so a missing one fails the request, not the stream
+    streams = {field: store.open(key) for field, key in blobs.items()}
+    return StreamingResponse(_stream_trace(out, streams), media_type="application/json")
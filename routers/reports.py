@@ -1,7 +1,7 @@
 """
 Reports API — data endpoints consumed by the Streamlit Reports tab.
 
-GET /api/v1/reports/summary          — aggregate stats across all tenant audits
+GET /api/v1/reports/summary          — aggregate stats across tenant audits (?days=N window)
 GET /api/v1/reports/{audit_id}       — full report for one audit
 GET /api/v1/reports/{audit_id}/mit   — MIT coverage detail
 GET /api/v1/reports/{audit_id}/delta — fixed-delta detail
@@ -12,15 +12,16 @@ from __future__ import annotations
 
 import logging
 import uuid
+from datetime import datetime, time, timedelta, timezone
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from auth import get_current_user, require_role
+from auth import Principal, get_current_user, require_role
 from database import get_db
-from models import Audit, ScanReport, User
+from models import Audit, ReportRollup, ReportRollupHit
 from schemas import (
     AppliedRuleOut,
     AuditReportOut,
@@ -53,8 +54,12 @@ def _get_report_or_404(
     summary="Aggregate reporting statistics for the current tenant",
 )
 def reports_summary(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
+    days: int | None = Query(
+        default=None, ge=1, le=3650,
+        description="Only count audits completed in the last N days (UTC, today included).",
+    ),
 ) -> dict[str, Any]:
     """
     Returns aggregate metrics across all completed audits for the tenant:
@@ -63,19 +68,34 @@ def reports_summary(
       - average risk score
       - fixed-delta distribution
       - top triggered domains
+
+    Read from the per-day report rollups (see rollups.py), never from the
+    stored report JSON.
     """
-    rows = (
-        db.query(Audit, ScanReport)
-        .outerjoin(ScanReport, ScanReport.audit_id == Audit.id)
-        .filter(
-            Audit.tenant_id == current_user.tenant_id,
-            Audit.status == "completed",
-        )
-        .all()
+    tenant_id = current_user.tenant_id
+    since = (
+        datetime.now(tz=timezone.utc).date() - timedelta(days=days - 1) if days else None
     )
-
-    total = len(rows)
-    if total == 0:
+    window = [ReportRollup.tenant_id == tenant_id]
+    hit_window = [ReportRollupHit.tenant_id == tenant_id]
+    if since is not None:
+        window.append(ReportRollup.day >= since)
+        hit_window.append(ReportRollupHit.day >= since)
+
+    totals = db.execute(
+        select(
+            func.sum(ReportRollup.completed_count),
+            func.sum(ReportRollup.mit_coverage_sum),
+            func.sum(ReportRollup.mit_coverage_count),
+            func.sum(ReportRollup.risk_score_sum),
+            func.sum(ReportRollup.risk_score_count),
+            func.sum(ReportRollup.fixed_delta_sum),
+            func.sum(ReportRollup.fixed_delta_count),
+        ).where(*window)
+    ).one()
+    total, mit_sum, mit_n, risk_sum, risk_n, delta_sum, delta_n = totals
+
+    if not total:
         return {
             "total_audits": 0,
             "completed": 0,
@@ -85,46 +105,40 @@ def reports_summary(
             "avg_fixed_delta": None,
         }
 
-    mit_scores = [r.mit_coverage_score for _, r in rows if r and r.mit_coverage_score is not None]
-    risk_scores = [r.overall_risk_score for _, r in rows if r and r.overall_risk_score is not None]
-    deltas = [r.fixed_delta for _, r in rows if r and r.fixed_delta is not None]
-
-    # Collect all applied rules across audits
-    all_frameworks: list[str] = []
-    all_domains: list[str] = []
-    for _, r in rows:
-        if r and r.report_json:
-            for rule in r.report_json.get("applied_rules", []):
-                all_frameworks.append(rule.get("framework", ""))
-            for gate in r.report_json.get("gates", []):
-                if gate.get("gate_id") == 3:
-                    for domain, cnt in gate.get("details", {}).get("domain_counts", {}).items():
-                        if cnt > 0:
-                            all_domains.append(domain)
-
-    # Top-5 frameworks
-    from collections import Counter
-
-    top_frameworks = dict(Counter(all_frameworks).most_common(5))
-    top_domains = dict(Counter(all_domains).most_common(5))
+    # Top-5 frameworks / domains
+    hit_total = func.sum(ReportRollupHit.hits)
+    top: dict[str, dict[str, int]] = {"framework": {}, "domain": {}}
+    for kind, name, hits in db.execute(
+        select(ReportRollupHit.kind, ReportRollupHit.name, hit_total)
+        .where(*hit_window)
+        .group_by(ReportRollupHit.kind, ReportRollupHit.name)
+        .order_by(ReportRollupHit.kind, hit_total.desc(), ReportRollupHit.name)
+    ):
+        if kind in top and len(top[kind]) < 5:
+            top[kind][name] = int(hits)
 
     # Count failed audits
-    failed_count = (
-        db.query(func.count(Audit.id))
-        .filter(Audit.tenant_id == current_user.tenant_id, Audit.status == "failed")
-        .scalar()
-        or 0
+    failed_q = select(func.count(Audit.id)).where(
+        Audit.tenant_id == tenant_id, Audit.status == "failed"
     )
+    if since is not None:
+        failed_q = failed_q.where(
+            Audit.completed_at >= datetime.combine(since, time.min, tzinfo=timezone.utc)
+        )
+    failed_count = db.execute(failed_q).scalar() or 0
+
+    def _avg(total_sum: float | None, n: int | None) -> float | None:
+        return round(total_sum / n, 4) if n else None
 
     return {
-        "total_audits": total,
-        "completed": total,
+        "total_audits": int(total),
+        "completed": int(total),
         "failed": failed_count,
-        "avg_mit_coverage": round(sum(mit_scores) / len(mit_scores), 4) if mit_scores else None,
-        "avg_risk_score": round(sum(risk_scores) / len(risk_scores), 4) if risk_scores else None,
-        "avg_fixed_delta": round(sum(deltas) / len(deltas), 4) if deltas else None,
-        "top_triggered_frameworks": top_frameworks,
-        "top_triggered_domains": top_domains,
+        "avg_mit_coverage": _avg(mit_sum, mit_n),
+        "avg_risk_score": _avg(risk_sum, risk_n),
+        "avg_fixed_delta": _avg(delta_sum, delta_n),
+        "top_triggered_frameworks": top["framework"],
+        "top_triggered_domains": top["domain"],
     }
 
 
@@ -135,7 +149,7 @@ def reports_summary(
 )
 def get_full_report(
     audit_id: uuid.UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> AuditReportOut:
     data = _get_report_or_404(audit_id, current_user.tenant_id, db)
@@ -150,7 +164,7 @@ def get_full_report(
 )
 def get_mit_coverage(
     audit_id: uuid.UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> MITCoverageOut:
     data = _get_report_or_404(audit_id, current_user.tenant_id, db)
@@ -165,7 +179,7 @@ def get_mit_coverage(
 )
 def get_fixed_delta(
     audit_id: uuid.UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> FixedDeltaOut:
     data = _get_report_or_404(audit_id, current_user.tenant_id, db)
@@ -180,7 +194,7 @@ def get_fixed_delta(
 )
 def get_applied_rules(
     audit_id: uuid.UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> list[AppliedRuleOut]:
     data = _get_report_or_404(audit_id, current_user.tenant_id, db)
@@ -195,7 +209,7 @@ def get_applied_rules(
 )
 def get_similar_incidents(
     audit_id: uuid.UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> list[SimilarIncidentOut]:
     data = _get_report_or_404(audit_id, current_user.tenant_id, db)
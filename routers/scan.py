@@ -3,34 +3,88 @@
 
 POST /api/v1/scan          — standard BatchIn (samples[].text format)
 POST /api/v1/scan/data     — saro_data framework format (model_outputs[].output)
-GET  /api/v1/audits        — list audits for the caller's tenant
-GET  /api/v1/audits/{id}   — fetch a specific audit report
+POST /api/v1/scan/stream   — NDJSON upload (one SampleIn per line), audited as it streams
+POST /api/v1/scan/bulk     — BatchIn JSON validated in one pass, no per-sample models
+GET  /api/v1/audits        — list audits for the caller's tenant (keyset paged)
+GET  /api/v1/audits/{id}   — fetch a specific audit report (202 while still running)
+
+Both JSON scan endpoints accept ``?async_mode=true``: the audit is queued on
+the background executor (see jobs.py) and 202 + audit_id is returned
+immediately.  The stream endpoint never holds the whole batch: samples are
+folded into the engine's running accumulators chunk by chunk (see
+engine.AuditStream), so very large batches run in constant memory.
 """
 from __future__ import annotations
 
 import logging
 import uuid
-from datetime import datetime, timezone
-from typing import Annotated
-
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.orm import Session
 
-from auth import get_current_user, require_role
+import jobs
+import rollups
+from auth import Principal, get_current_user, require_role
 from database import get_db
-from engine import SARoEngine
-from models import Audit, AuditTrace, ScanReport, User
+from engine import AuditStream, SARoEngine, get_audit_engine
+from models import Audit, AuditEvent, AuditLease, AuditTrace, ScanReport
+from pagination import keyset_page, set_next_cursor
+from routers.dashboard import invalidate_kpis
 from schemas import (
+    BULK_BATCH_ADAPTER,
+    AuditConfigIn,
+    AuditJobOut,
     AuditListItemOut,
     AuditReportOut,
     BatchIn,
     SARoDataBatchIn,
+    SampleIn,
 )
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1", tags=["scan"])
 
 
+def _trace_rows(traces: list[dict], audit_id: uuid.UUID) -> list[dict]:
+    """Map engine trace dicts onto audit_traces column values."""
+    return [
+        {
+            "id": uuid.uuid4(),
+            "audit_id": audit_id,
+            "gate_id": t["gate_id"],
+            "gate_name": t["gate_name"],
+            "check_type": t["check_type"],
+            "check_name": t["check_name"],
+            "result": t["result"],
+            "reason": t.get("reason"),
+            "detail_json": t.get("detail_json"),
+            "remediation_hint": t.get("remediation_hint"),
+            "is_remediated": False,
+        }
+        for t in traces
+    ]
+
+
+def _bulk_insert_traces(traces: list[dict], audit_id: uuid.UUID, db: Session) -> None:
+    """
+    Write all of an audit's traces with one executemany INSERT and commit.
+
+    A Core insert against the table bypasses the unit of work (and the ORM's
+    regrouping of rows by which columns are NULL), so on PostgreSQL the rows
+    go out as multi-row VALUES batches instead of one round trip per trace —
+    which matters on the NullPool / Neon connection.
+    """
+    db.execute(insert(AuditTrace.__table__), _trace_rows(traces, audit_id))
+    db.commit()
+
+
 def _persist_traces(engine: SARoEngine, audit_id: uuid.UUID, db: Session) -> None:
     """
     Persist all trace records accumulated by the engine during run_audit().
@@ -40,114 +94,288 @@ def _persist_traces(engine: SARoEngine, audit_id: uuid.UUID, db: Session) -> Non
     if not traces:
         return
     try:
-        for t in traces:
-            db.add(AuditTrace(
-                audit_id=audit_id,
-                gate_id=t["gate_id"],
-                gate_name=t["gate_name"],
-                check_type=t["check_type"],
-                check_name=t["check_name"],
-                result=t["result"],
-                reason=t.get("reason"),
-                detail_json=t.get("detail_json"),
-                remediation_hint=t.get("remediation_hint"),
-            ))
-        db.commit()
+        _bulk_insert_traces(traces, audit_id, db)
         logger.info("Persisted %d trace records for audit %s", len(traces), audit_id)
     except Exception as trace_exc:
         logger.warning("Could not persist traces for audit %s: %s", audit_id, trace_exc)
         db.rollback()
 
 
+def _execute_audit(
+    engine: SARoEngine, batch: BatchIn, audit: Audit, db: Session
+) -> AuditReportOut:
+    """Run the 4-gate pipeline for ``audit`` and persist report, status and traces."""
+    report: AuditReportOut = engine.run_audit(batch, audit.id)
+    _persist_report(engine, report, audit, db)
+    return report
+
+
+def _persist_report(
+    engine: SARoEngine, report: AuditReportOut, audit: Audit, db: Session
+) -> None:
+    """Store the report, close out the audit row and write the engine's traces."""
+    scan_report = ScanReport(
+        audit_id=audit.id,
+        mit_coverage_score=report.mit_coverage.score,
+        fixed_delta=report.fixed_delta.delta,
+        overall_risk_score=report.bayesian_scores.overall,
+        confidence_score=report.confidence_score,
+        report_json=report.model_dump(mode="json"),
+    )
+    db.add(scan_report)
+    audit.status = report.status
+    audit.completed_at = datetime.now(tz=timezone.utc)
+    rollups.record_report(db, audit, scan_report)
+    db.commit()
+
+    # ── Persist audit traces (non-critical — never block the response) ──
+    _persist_traces(engine, audit.id, db)
+    # Status, scores and traces are all in: drop the tenant's cached KPIs
+    invalidate_kpis(audit.tenant_id)
+
+
+def _mark_audit_failed(audit: Audit, db: Session) -> None:
+    """
+    Roll back any aborted transaction before attempting a status update.
+    Without this, a failed reference-table query (InFailedSqlTransaction)
+    will cause the commit below to fail as well, hiding the real error.
+    """
+    try:
+        db.rollback()
+        audit.status = "failed"
+        audit.completed_at = datetime.now(tz=timezone.utc)
+        db.commit()
+        invalidate_kpis(audit.tenant_id)
+    except Exception as inner:
+        logger.warning("Could not persist audit failure status for %s: %s", audit.id, inner)
+        db.rollback()
+
+
+INTERRUPTED_AUDIT_ERROR = (
+    "Interrupted: the API process running it stopped before it finished — resubmit the batch"
+)
+_IN_FLIGHT = ("pending", "running")
+
+
+def _lease_audit(audit: Audit, db: Session) -> None:
+    """Claim ``audit`` for this process; committed together with the audit row."""
+    db.add(AuditLease(
+        audit_id=audit.id,
+        instance_id=jobs.INSTANCE_ID,
+        heartbeat_at=datetime.now(tz=timezone.utc),
+    ))
+
+
+def fail_interrupted_audits(db: Session) -> int:
+    """
+    Mark in-flight audits that no live API process owns as failed.
+
+    Audit jobs only live in the executor of the process that accepted them
+    (jobs.py), so a ``pending`` / ``running`` audit whose lease has not been
+    renewed for AUDIT_LEASE_SECONDS will never finish; without this it would
+    answer 202 on GET /scan/{id} forever.  Audits without a lease (single
+    outputs, rows from before leases existed) are judged by their age.
+    Audits held by another live process — other replicas or workers, or the
+    old process during a rolling deploy — are left alone.
+
+    Each failed audit gets an ``audit_interrupted`` AuditEvent carrying the
+    error.  Returns how many audits were failed.
+    """
+    now = datetime.now(tz=timezone.utc)
+    cutoff = now - timedelta(seconds=jobs.AUDIT_LEASE_SECONDS)
+    orphaned = (
+        Audit.status.in_(_IN_FLIGHT),
+        Audit.created_at < cutoff,
+        Audit.id.not_in(select(AuditLease.audit_id).where(AuditLease.heartbeat_at >= cutoff)),
+    )
+    candidates = {
+        row.id: row
+        for row in db.execute(
+            select(Audit.id, Audit.tenant_id, Audit.user_id, Audit.status).where(*orphaned)
+        )
+    }
+    if not candidates:
+        return 0
+    # Re-check in the UPDATE itself: an owner may have renewed or finished since
+    failed_ids = db.execute(
+        update(Audit)
+        .where(Audit.id.in_(list(candidates)), *orphaned)
+        .values(status="failed", completed_at=now)
+        .returning(Audit.id)
+    ).scalars().all()
+    stale = [candidates[audit_id] for audit_id in failed_ids]
+    db.execute(delete(AuditLease).where(AuditLease.audit_id.in_(failed_ids)))
+    db.add_all(
+        AuditEvent(
+            tenant_id=row.tenant_id,
+            user_id=row.user_id,
+            event_type="audit_interrupted",
+            event_data={
+                "audit_id": str(row.id),
+                "previous_status": row.status,
+                "error": INTERRUPTED_AUDIT_ERROR,
+            },
+        )
+        for row in stale
+    )
+    db.commit()
+    for tenant_id in {row.tenant_id for row in stale}:
+        invalidate_kpis(tenant_id)
+    if stale:
+        logger.warning("Marked %d interrupted audit(s) as failed", len(stale))
+    return len(stale)
+
+
+def heartbeat_audit_leases() -> None:
+    """
+    jobs heartbeat: renew this process's leases, drop leases of finished
+    audits, then fail audits whose owner has gone away.
+    """
+    db = jobs.open_session()
+    try:
+        db.execute(
+            update(AuditLease)
+            .where(AuditLease.instance_id == jobs.INSTANCE_ID)
+            .values(heartbeat_at=datetime.now(tz=timezone.utc))
+        )
+        db.execute(
+            delete(AuditLease).where(
+                AuditLease.instance_id == jobs.INSTANCE_ID,
+                AuditLease.audit_id.not_in(select(Audit.id).where(Audit.status.in_(_IN_FLIGHT))),
+            )
+        )
+        db.commit()
+        fail_interrupted_audits(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _run_audit_job(audit_id: uuid.UUID, batch: BatchIn) -> None:
+    """
+    Background entry point (see jobs.submit): pending → running → completed/failed.
+
+    Module-level with picklable arguments so it also runs on a process pool.
+    """
+    db = jobs.open_session()
+    audit: Audit | None = None
+    try:
+        audit = db.get(Audit, audit_id)
+        if audit is None:
+            logger.warning("Audit job %s skipped: audit row no longer exists", audit_id)
+            return
+        audit.status = "running"
+        db.commit()
+        report = _execute_audit(get_audit_engine(db), batch, audit, db)
+        logger.info(
+            "Background audit %s completed: status=%s, samples=%d",
+            audit_id, report.status, len(batch.samples),
+        )
+    except Exception as exc:
+        if audit is not None:
+            _mark_audit_failed(audit, db)
+        logger.exception("Background audit %s failed: %s", audit_id, exc)
+    finally:
+        db.close()
+
+
+def _job_accepted(audit: Audit) -> JSONResponse:
+    job = AuditJobOut(
+        audit_id=audit.id,
+        status=audit.status,
+        status_url=f"/api/v1/audits/{audit.id}",
+    )
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job.model_dump(mode="json"))
+
+
+def _start_audit(
+    batch: BatchIn,
+    audit: Audit,
+    db: Session,
+    async_mode: bool,
+) -> AuditReportOut | JSONResponse:
+    """
+    Persist the audit record and either run it inline or queue it.
+
+    Inline audits are created as running; queued ones as pending until a
+    worker picks them up.
+    """
+    audit.status = "pending" if async_mode else "running"
+    db.add(audit)
+    _lease_audit(audit, db)
+    db.commit()
+
+    if async_mode:
+        jobs.submit(_run_audit_job, audit.id, batch)
+        db.refresh(audit)
+        return _job_accepted(audit)
+
+    try:
+        engine = get_audit_engine(db)
+        return _execute_audit(engine, batch, audit, db)
+    except Exception as exc:
+        _mark_audit_failed(audit, db)
+        logger.exception("Audit %s failed: %s", audit.id, exc)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Audit engine error: {exc}",
+        ) from exc
+
+
+_ASYNC_MODE_QUERY = Query(
+    default=False,
+    description="Queue the audit and return 202 + audit_id instead of waiting for the report.",
+)
+
+
 @router.post(
     "/scan",
     response_model=AuditReportOut,
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(require_role("super_admin", "operator"))],
+    responses={202: {"model": AuditJobOut, "description": "Audit queued (async_mode=true)"}},
     summary="Submit a batch for full SARO audit",
     description=(
         "Accepts a JSON batch of ≥50 text samples, runs the 4-gate audit pipeline, "
         "and returns the complete report including MIT coverage, similar incidents, "
         "fixed-delta, Bayesian risk scores, applied rules, and remediations.\n\n"
+        "With `async_mode=true` the audit is queued and `202` + `audit_id` is "
+        "returned immediately; poll `GET /api/v1/audits/{id}` for the report.\n\n"
         "**Minimum 50 samples required** (EU AI Act Art. 10, NIST MAP 2.3)."
     ),
 )
 def scan_batch(
     payload: BatchIn,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
-) -> AuditReportOut:
+    async_mode: bool = _ASYNC_MODE_QUERY,
+) -> AuditReportOut | JSONResponse:
     """
-    Full inline batch scan.
+    Full batch scan, inline or queued.
 
-    The engine is instantiated per-request so the reference DB data is always
-    fresh.  For high-throughput deployments, cache the engine at the app level
-    after confirming reference data is stable.
+    The engine is bound to the process-wide reference snapshot, so the
+    reference tables and incident index are not reloaded per request.
     """
-    audit_id = uuid.uuid4()
-
-    # Persist the audit record immediately (status=running)
     audit = Audit(
-        id=audit_id,
+        id=uuid.uuid4(),
         tenant_id=current_user.tenant_id,
         user_id=current_user.id,
         batch_id=payload.batch_id,
         dataset_name=payload.dataset_name,
         sample_count=len(payload.samples),
-        status="running",
     )
-    db.add(audit)
-    db.commit()
-
-    try:
-        engine = SARoEngine(db)
-        report: AuditReportOut = engine.run_audit(payload, audit_id)
-
-        # Persist the report
-        scan_report = ScanReport(
-            audit_id=audit_id,
-            mit_coverage_score=report.mit_coverage.score,
-            fixed_delta=report.fixed_delta.delta,
-            overall_risk_score=report.bayesian_scores.overall,
-            confidence_score=report.confidence_score,
-            report_json=report.model_dump(mode="json"),
-        )
-        db.add(scan_report)
-
-        # Update audit status
-        audit.status = report.status
-        audit.completed_at = datetime.now(tz=timezone.utc)
-        db.commit()
-
-        # ── Persist audit traces (non-critical — never block the response) ──
-        _persist_traces(engine, audit_id, db)
-
+    result = _start_audit(payload, audit, db, async_mode)
+    if isinstance(result, AuditReportOut):
         logger.info(
             "Audit %s completed: status=%s, mit_coverage=%.3f, delta=%.3f",
-            audit_id,
-            report.status,
-            report.mit_coverage.score,
-            report.fixed_delta.delta,
+            audit.id,
+            result.status,
+            result.mit_coverage.score,
+            result.fixed_delta.delta,
         )
-        return report
-
-    except Exception as exc:
-        # Roll back any aborted transaction before attempting a status update.
-        # Without this, a failed reference-table query (InFailedSqlTransaction)
-        # will cause the commit below to fail as well, hiding the real error.
-        try:
-            db.rollback()
-            audit.status = "failed"
-            audit.completed_at = datetime.now(tz=timezone.utc)
-            db.commit()
-        except Exception as inner:
-            logger.warning("Could not persist audit failure status for %s: %s", audit_id, inner)
-            db.rollback()
-        logger.exception("Audit %s failed: %s", audit_id, exc)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Audit engine error: {exc}",
-        ) from exc
+    return result
 
 
 @router.get(
@@ -157,20 +385,22 @@ def scan_batch(
     summary="List audits for the current tenant",
 )
 def list_audits(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
+    response: Response,
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(
+        default=None, description="Opaque cursor from the previous page's X-Next-Cursor header"
+    ),
 ) -> list[AuditListItemOut]:
-    rows = (
-        db.query(Audit, ScanReport)
+    q = (
+        select(Audit, ScanReport)
         .outerjoin(ScanReport, ScanReport.audit_id == Audit.id)
-        .filter(Audit.tenant_id == current_user.tenant_id)
-        .order_by(Audit.created_at.desc())
-        .limit(limit)
-        .offset(offset)
-        .all()
+        .where(Audit.tenant_id == current_user.tenant_id)
     )
+    q = keyset_page(q, Audit.created_at, Audit.id, cursor, offset)
+    rows = db.execute(q.limit(limit)).all()
     result: list[AuditListItemOut] = []
     for audit, report in rows:
         result.append(
@@ -186,6 +416,7 @@ def list_audits(
                 created_at=audit.created_at,
             )
         )
+    set_next_cursor(response, result, limit)
     return result
 
 
@@ -193,17 +424,25 @@ def list_audits(
     "/audits/{audit_id}",
     response_model=AuditReportOut,
     dependencies=[Depends(require_role("super_admin", "operator"))],
+    responses={202: {"model": AuditJobOut, "description": "Audit still pending or running"}},
     summary="Fetch a specific audit report",
 )
 def get_audit(
     audit_id: uuid.UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
-) -> AuditReportOut:
+) -> AuditReportOut | JSONResponse:
     audit = db.get(Audit, audit_id)
     if not audit or audit.tenant_id != current_user.tenant_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Audit not found")
     if not audit.report:
+        if audit.status in ("pending", "running"):
+            return _job_accepted(audit)
+        if audit.status == "failed":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Audit {audit.id} failed — no report was produced",
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Report not yet available"
         )
@@ -221,6 +460,7 @@ def get_audit(
     response_model=AuditReportOut,
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(require_role("super_admin", "operator"))],
+    responses={202: {"model": AuditJobOut, "description": "Audit queued (async_mode=true)"}},
     summary="Submit a saro_data framework batch for full SARO audit",
     description=(
         "Accepts the saro_data framework batch format "
@@ -230,14 +470,16 @@ def get_audit(
         "- `output` → `text`\n"
         "- `gender` / `ethnicity` → `group`\n"
         "- `ground_truth` → `label`\n\n"
+        "`async_mode=true` queues the audit exactly as for POST /api/v1/scan.\n\n"
         "**Minimum 50 samples required** (EU AI Act Art. 10, NIST MAP 2.3)."
     ),
 )
 def scan_data_batch(
     payload: SARoDataBatchIn,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
-) -> AuditReportOut:
+    async_mode: bool = _ASYNC_MODE_QUERY,
+) -> AuditReportOut | JSONResponse:
     """
     Translate saro_data framework format → BatchIn and run the full audit.
 
@@ -249,64 +491,245 @@ def scan_data_batch(
     # Translate saro_data format → standard BatchIn
     batch: BatchIn = payload.to_batch_in()
 
-    audit_id = uuid.uuid4()
     audit = Audit(
-        id=audit_id,
+        id=uuid.uuid4(),
         tenant_id=current_user.tenant_id,
         user_id=current_user.id,
         batch_id=payload.batch_id,
         dataset_name=payload.model_type,
         sample_count=len(payload.model_outputs),
-        status="running",
     )
-    db.add(audit)
-    db.commit()
-
-    try:
-        engine = SARoEngine(db)
-        report: AuditReportOut = engine.run_audit(batch, audit_id)
-
-        scan_report = ScanReport(
-            audit_id=audit_id,
-            mit_coverage_score=report.mit_coverage.score,
-            fixed_delta=report.fixed_delta.delta,
-            overall_risk_score=report.bayesian_scores.overall,
-            confidence_score=report.confidence_score,
-            report_json=report.model_dump(mode="json"),
-        )
-        db.add(scan_report)
-        audit.status = report.status
-        audit.completed_at = datetime.now(tz=timezone.utc)
-        db.commit()
-
-        # ── Persist audit traces (non-critical — never block the response) ──
-        _persist_traces(engine, audit_id, db)
-
+    result = _start_audit(batch, audit, db, async_mode)
+    if isinstance(result, AuditReportOut):
         logger.info(
             "saro_data audit %s completed: model_type=%s, samples=%d, "
             "mit_coverage=%.3f, delta=%.3f",
-            audit_id,
+            audit.id,
             payload.model_type,
             len(payload.model_outputs),
-            report.mit_coverage.score,
-            report.fixed_delta.delta,
+            result.mit_coverage.score,
+            result.fixed_delta.delta,
         )
-        return report
+    return result
 
-    except Exception as exc:
-        # Roll back any aborted transaction before attempting a status update.
-        try:
-            db.rollback()
-            audit.status = "failed"
-            audit.completed_at = datetime.now(tz=timezone.utc)
-            db.commit()
-        except Exception as inner:
-            logger.warning(
-                "Could not persist audit failure status for %s: %s", audit_id, inner
+
+# ─────────────────────────────────────────────────────────────────────────────
+# /api/v1/scan/stream  — NDJSON streaming endpoint
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Samples handed to the engine per threadpool hop, and the longest line we
+# are willing to buffer while waiting for its newline.
+_STREAM_CHUNK_SAMPLES = 1000
+_STREAM_MAX_LINE_BYTES = 1 << 20
+
+
+async def _ndjson_lines(request: Request) -> AsyncIterator[tuple[int, bytes]]:
+    """Yield ``(line number, line)`` from the request body as it arrives."""
+    pending = b""
+    line_no = 0
+    async for chunk in request.stream():
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_no += 1
+            yield line_no, line
+        if len(pending) > _STREAM_MAX_LINE_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Line {line_no + 1} exceeds {_STREAM_MAX_LINE_BYTES} bytes",
             )
-            db.rollback()
-        logger.exception("saro_data audit %s failed: %s", audit_id, exc)
+    if pending:
+        yield line_no + 1, pending
+
+
+def _open_stream_audit(
+    audit: Audit, config: AuditConfigIn, db: Session
+) -> AuditStream:
+    """Create the (running) audit row and open an engine stream for it."""
+    audit.status = "running"
+    db.add(audit)
+    _lease_audit(audit, db)
+    db.commit()
+    try:
+        return get_audit_engine(db).open_stream(audit.batch_id, audit.dataset_name, config)
+    except Exception:
+        _mark_audit_failed(audit, db)
+        raise
+
+
+def _finish_stream_audit(stream: AuditStream, audit: Audit, db: Session) -> AuditReportOut:
+    """Run the gates over the streamed totals and persist like an inline audit."""
+    report = stream.finish(audit.id)
+    audit.sample_count = report.sample_count
+    _persist_report(stream.engine, report, audit, db)
+    return report
+
+
+@router.post(
+    "/scan/stream",
+    response_model=AuditReportOut,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_role("super_admin", "operator"))],
+    summary="Stream an NDJSON batch for full SARO audit",
+    description=(
+        "Accepts `application/x-ndjson` (plain or chunked transfer encoding): one "
+        "`SampleIn` JSON object per line, blank lines ignored. Samples are validated "
+        "and run through the gates as they arrive, so batch size is not limited by "
+        "worker memory. Batch metadata and incident-matching options are query "
+        "parameters.\n\n"
+        "A malformed line aborts the audit with `422` naming the line. Fewer than 50 "
+        "samples yields a `failed` report from Gate 1, as for POST /api/v1/scan."
+    ),
+)
+async def scan_stream(
+    request: Request,
+    current_user: Annotated[Principal, Depends(get_current_user)],
+    db: Annotated[Session, Depends(get_db)],
+    batch_id: str | None = Query(default=None),
+    dataset_name: str | None = Query(default=None, max_length=255),
+    incident_top_k: int = Query(default=5, ge=1, le=20),
+    incident_matching: Literal["batch_text", "per_sample"] = Query(default="batch_text"),
+    incident_aggregation: Literal["max", "mean"] = Query(default="max"),
+) -> AuditReportOut:
+    """
+    Streamed batch scan.  Only the current chunk of samples is held in
+    memory; the blocking engine and DB work runs in the threadpool.
+    """
+    config = AuditConfigIn(
+        incident_top_k=incident_top_k,
+        incident_matching=incident_matching,
+        incident_aggregation=incident_aggregation,
+    )
+    audit = Audit(
+        id=uuid.uuid4(),
+        tenant_id=current_user.tenant_id,
+        user_id=current_user.id,
+        batch_id=batch_id,
+        dataset_name=dataset_name,
+        sample_count=0,
+    )
+    try:
+        stream = await run_in_threadpool(_open_stream_audit, audit, config, db)
+    except Exception as exc:
+        logger.exception("Audit %s failed: %s", audit.id, exc)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Audit engine error: {exc}",
+        ) from exc
+
+    try:
+        chunk: list[SampleIn] = []
+        async for line_no, line in _ndjson_lines(request):
+            if not line.strip():
+                continue
+            try:
+                chunk.append(SampleIn.model_validate_json(line))
+            except ValidationError as exc:
+                err = exc.errors(include_url=False)[0]
+                loc = ".".join(str(p) for p in err["loc"]) or "sample"
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Line {line_no}: {loc}: {err['msg']}",
+                ) from exc
+            if len(chunk) >= _STREAM_CHUNK_SAMPLES:
+                await run_in_threadpool(stream.add, chunk)
+                chunk = []
+        await run_in_threadpool(stream.add, chunk)
+        result = await run_in_threadpool(_finish_stream_audit, stream, audit, db)
+    except HTTPException:
+        await run_in_threadpool(_mark_audit_failed, audit, db)
+        raise
+    except Exception as exc:
+        await run_in_threadpool(_mark_audit_failed, audit, db)
+        logger.exception("Audit %s failed: %s", audit.id, exc)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Audit engine error: {exc}",
         ) from exc
+
+    logger.info(
+        "Streamed audit %s completed: status=%s, samples=%d, mit_coverage=%.3f, delta=%.3f",
+        audit.id,
+        result.status,
+        result.sample_count,
+        result.mit_coverage.score,
+        result.fixed_delta.delta,
+    )
+    return result
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# /api/v1/scan/bulk  — one-shot validation for large JSON batches
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _run_bulk_audit(body: bytes, audit_fields: dict, db: Session) -> AuditReportOut:
+    """Validate ``body`` as a BulkBatch, then audit its rows via an engine stream."""
+    try:
+        payload = BULK_BATCH_ADAPTER.validate_json(body)
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors(include_url=False)) from exc
+
+    rows = payload["samples"]
+    audit = Audit(
+        id=uuid.uuid4(),
+        batch_id=payload.get("batch_id"),
+        dataset_name=payload.get("dataset_name"),
+        sample_count=len(rows),
+        **audit_fields,
+    )
+    stream = _open_stream_audit(audit, payload.get("config") or AuditConfigIn(), db)
+    try:
+        stream.add_rows(rows)
+        return _finish_stream_audit(stream, audit, db)
+    except Exception as exc:
+        _mark_audit_failed(audit, db)
+        logger.exception("Audit %s failed: %s", audit.id, exc)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Audit engine error: {exc}",
+        ) from exc
+
+
+@router.post(
+    "/scan/bulk",
+    response_model=AuditReportOut,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_role("super_admin", "operator"))],
+    summary="Submit a large batch for full SARO audit (fast validation)",
+    description=(
+        "Same request body and report as POST /api/v1/scan, for large batches. "
+        "The payload is validated in one pass by a TypeAdapter into plain rows — "
+        "no per-sample model objects or uuid4 defaults; samples without a "
+        "`sample_id` are identified by their position (`\"#0\"`, `\"#1\"`, ...).\n\n"
+        "**Minimum 50 samples required** (EU AI Act Art. 10, NIST MAP 2.3)."
+    ),
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            # Same document shape as POST /api/v1/scan
+            "content": {"application/json": {"schema": {"$ref": "#/components/schemas/BatchIn"}}},
+        }
+    },
+)
+async def scan_bulk(
+    request: Request,
+    current_user: Annotated[Principal, Depends(get_current_user)],
+    db: Annotated[Session, Depends(get_db)],
+) -> AuditReportOut:
+    """
+    Bulk batch scan.  The raw body bypasses FastAPI's model parsing; the
+    validation and the audit both run in the threadpool.
+    """
+    body = await request.body()
+    audit_fields = {"tenant_id": current_user.tenant_id, "user_id": current_user.id}
+    result = await run_in_threadpool(_run_bulk_audit, body, audit_fields, db)
+    logger.info(
+        "Bulk audit %s completed: status=%s, samples=%d, mit_coverage=%.3f, delta=%.3f",
+        result.audit_id,
+        result.status,
+        result.sample_count,
+        result.mit_coverage.score,
+        result.fixed_delta.delta,
+    )
+    return result
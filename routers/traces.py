@@ -16,9 +16,10 @@ from typing import Annotated, Any
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from auth import get_current_user, require_role
+from auth import Principal, get_current_user, require_role
 from database import get_db
-from models import Audit, AuditTrace, User
+from models import Audit, AuditTrace
+from routers.dashboard import invalidate_kpis
 from schemas import AuditTraceOut, RemediateTraceIn
 
 logger = logging.getLogger(__name__)
@@ -45,7 +46,7 @@ def _get_audit_or_404(
 )
 def get_traces(
     audit_id: uuid.UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
     gate_id: int | None = Query(default=None, description="Filter by gate (1–4)"),
     result: str | None = Query(
@@ -76,7 +77,7 @@ def get_traces(
 )
 def get_failed_traces(
     audit_id: uuid.UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
     include_remediated: bool = Query(
         default=False,
@@ -110,7 +111,7 @@ def get_failed_traces(
 )
 def get_trace_summary(
     audit_id: uuid.UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> dict[str, Any]:
     """Return counts and breakdown across all trace records for the audit."""
@@ -160,7 +161,7 @@ def remediate_trace(
     audit_id: uuid.UUID,
     trace_id: uuid.UUID,
     payload: RemediateTraceIn,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ) -> AuditTraceOut:
     """
@@ -184,6 +185,7 @@ def remediate_trace(
         )
 
     db.commit()
+    invalidate_kpis(current_user.tenant_id)
     db.refresh(trace)
     logger.info(
         "Trace %s (audit=%s, gate=%d, check=%s) marked remediated by %s",
@@ -9,9 +9,10 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import Any, Literal
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, EmailStr, Field, StringConstraints, TypeAdapter, field_validator
+from typing_extensions import NotRequired, TypedDict
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -103,6 +104,11 @@ class AuditConfigIn(BaseModel):
     min_samples: int = Field(default=50, ge=50)
     confidence_threshold: float = Field(default=0.95, ge=0.5, le=1.0)
     incident_top_k: int = Field(default=5, ge=1, le=20)
+    # "batch_text": one query over the first 200 samples joined together.
+    # "per_sample": every sample is matched; scores are aggregated per incident
+    # and the best-matching samples are attributed on each similar incident.
+    incident_matching: Literal["batch_text", "per_sample"] = "batch_text"
+    incident_aggregation: Literal["max", "mean"] = "max"
     # Which frameworks to include in compliance mapping
     frameworks: list[str] = Field(
         default=["EU AI Act", "NIST AI RMF", "AIGP", "ISO 42001"]
@@ -133,6 +139,38 @@ class BatchIn(BaseModel):
         return v
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Bulk batch format (POST /api/v1/scan/bulk)
+# ─────────────────────────────────────────────────────────────────────────────
+#
+# Same JSON shape as BatchIn, validated in one pass by pydantic-core into plain
+# dicts: no SampleIn instance, Python validator call or uuid4 per sample.  The
+# non-blank text rule is a pattern constraint; samples without a sample_id get
+# their ordinal position ("#0", "#1", ...) when the engine reads them.
+
+
+class SampleRow(TypedDict):
+    """One sample of a bulk batch — the fields of SampleIn, as a dict."""
+
+    text: Annotated[str, StringConstraints(min_length=1, pattern=r"\S")]
+    sample_id: NotRequired[str]
+    group: NotRequired[str | None]
+    label: NotRequired[str | None]
+    metadata: NotRequired[dict[str, Any]]
+
+
+class BulkBatch(TypedDict):
+    """A BatchIn-shaped payload whose samples stay SampleRow dicts."""
+
+    batch_id: NotRequired[str | None]
+    dataset_name: NotRequired[Annotated[str, StringConstraints(max_length=255)] | None]
+    samples: Annotated[list[SampleRow], Field(min_length=50)]
+    config: NotRequired[AuditConfigIn]
+
+
+BULK_BATCH_ADAPTER: TypeAdapter[BulkBatch] = TypeAdapter(BulkBatch)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # saro_data framework batch format (POST /api/v1/scan/data)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -264,6 +302,11 @@ class MITCoverageOut(BaseModel):
     domain_risk_counts: dict[str, int]
 
 
+class SampleMatchOut(BaseModel):
+    sample_id: str
+    similarity_score: float
+
+
 class SimilarIncidentOut(BaseModel):
     incident_id: str
     title: str
@@ -274,6 +317,8 @@ class SimilarIncidentOut(BaseModel):
     url: str | None
     similarity_score: float
     is_fixed: bool
+    # Populated only with incident_matching="per_sample"
+    matched_samples: list[SampleMatchOut] | None = None
 
 
 class FixedDeltaOut(BaseModel):
@@ -323,6 +368,14 @@ class AuditReportOut(BaseModel):
     created_at: datetime
 
 
+class AuditJobOut(BaseModel):
+    """Returned with 202 while an audit queued via async_mode is not yet finished."""
+
+    audit_id: uuid.UUID
+    status: str
+    status_url: str
+
+
 class AuditListItemOut(BaseModel):
     id: uuid.UUID
     batch_id: str | None
@@ -593,6 +646,17 @@ class SingleOutputAuditOut(BaseModel):
     created_at: datetime
 
 
+class OutputAuditBatchIn(BaseModel):
+    """Many single outputs audited in one call (high-volume inference logging)."""
+    outputs: list[SingleOutputAuditIn] = Field(..., min_length=1, max_length=1000)
+
+
+class OutputAuditBatchOut(BaseModel):
+    """One SingleOutputAuditOut per submitted output, in submission order."""
+    count: int
+    results: list[SingleOutputAuditOut]
+
+
 class AuditMetadataOut(BaseModel):
     """Metadata attached to a universal output audit."""
     audit_id: uuid.UUID
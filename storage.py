@@ -0,0 +1,60 @@
+"""
+SARO trace text storage
+=======================
+Compact at-rest format for the large free-text columns of enhanced_traces
+(raw_prompt, raw_response, prompt_text, raw_output_text).
+
+Texts of at least TRACE_PACK_MIN_BYTES are stored gzip-compressed and base64
+encoded behind a ``PACKED_PREFIX`` marker, so the columns stay plain TEXT on
+every dialect and rows written before packing existed read back unchanged.
+``PackedText`` applies the format transparently: ORM code reads and writes
+ordinary strings.
+"""
+from __future__ import annotations
+
+import base64
+import gzip
+import os
+from typing import Any
+
+from sqlalchemy import Text
+from sqlalchemy.types import TypeDecorator
+
+PACKED_PREFIX = "saro:gz:"
+TRACE_PACK_MIN_BYTES: int = int(os.environ.get("TRACE_PACK_MIN_BYTES", "1024"))
+
+
+def pack_text(text: str | None) -> str | None:
+    """
+    The stored form of ``text``: compressed when that makes it smaller,
+    verbatim otherwise.  Text that itself starts with the marker is always
+    packed so that unpack_text() is unambiguous.
+    """
+    if text is None:
+        return None
+    raw = text.encode("utf-8")
+    marked = text.startswith(PACKED_PREFIX)
+    if len(raw) < TRACE_PACK_MIN_BYTES and not marked:
+        return text
+    packed = PACKED_PREFIX + base64.b64encode(gzip.compress(raw, mtime=0)).decode("ascii")
+    return packed if marked or len(packed) < len(text) else text
+
+
+def unpack_text(stored: str | None) -> str | None:
+    """Inverse of pack_text(); plain (legacy or small) values pass through."""
+    if stored is None or not stored.startswith(PACKED_PREFIX):
+        return stored
+    return gzip.decompress(base64.b64decode(stored[len(PACKED_PREFIX):])).decode("utf-8")
+
+
+class PackedText(TypeDecorator):
+    """TEXT column holding pack_text() values; loads as the original string."""
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect: Any) -> str | None:
+        return pack_text(value)
+
+    def process_result_value(self, value: Any, dialect: Any) -> str | None:
+        return unpack_text(value)
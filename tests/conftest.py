@@ -0,0 +1,173 @@
+"""
+Shared fixtures and helpers for the SARO test suite.
+
+    session_factory   sessionmaker over a fresh in-memory SQLite database
+    client            TestClient on the real app, bound to session_factory,
+                      an operator of a fresh tenant and an engine built from
+                      _INCIDENTS
+    _make_engine / _make_batch / _INCIDENTS / _MIXED_TEXTS
+                      in-memory audit engine and batches (no DB queries)
+    _tenant / _seed   tenant and audit rows for aggregate tests
+
+Helpers are imported with ``from conftest import ...``.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-unit-tests")
+# Keep fitted incident-index artifacts out of the shared temp dir
+os.environ.setdefault("INCIDENT_INDEX_DIR", "")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# In-memory audit engine
+# ─────────────────────────────────────────────────────────────────────────────
+
+_INCIDENTS = [
+    {
+        "incident_id": f"INC-{i}",
+        "title": title,
+        "description": desc,
+        "category": cat,
+        "harm_type": None,
+        "affected_sector": None,
+        "date": None,
+        "url": None,
+        "is_fixed": i % 2 == 0,
+    }
+    for i, (title, desc, cat) in enumerate([
+        ("Chatbot produced racist output", "Toxic and racist replies to users", "bias"),
+        ("Credit card numbers leaked", "Model exposed credit card and password data", "privacy"),
+        ("Self-driving crash", "Autonomous vehicle failed to brake and crashed", "safety"),
+        ("Election hoax spread", "Generated fake news about the election", "misinformation"),
+        ("Phishing emails generated", "Model used to write phishing scam emails", "malicious"),
+    ])
+]
+
+_MIXED_TEXTS = [
+    "racist toxic output",
+    "the model gave a helpful and harmless answer",
+    "ok",
+    "hallucinated a fake citation about self-driving car crash",
+    "personal data leak of email addresses",
+] * 30
+
+
+def _make_engine(incidents: list[dict] | None = None):
+    """Build a SARoEngine from in-memory reference data (no DB queries)."""
+    import engine as eng_module
+    e = eng_module.SARoEngine.__new__(eng_module.SARoEngine)
+    e._mit_risks = []
+    e._incidents = list(incidents or [])
+    e._eu_rules = []
+    e._nist_controls = []
+    e._aigp = []
+    e._gov_rules = []
+    e._build_incident_index()
+    return e
+
+
+def _make_batch(texts: list[str]):
+    from schemas import BatchIn, SampleIn
+    return BatchIn(
+        batch_id="test-batch",
+        dataset_name="test",
+        samples=[SampleIn(sample_id=f"s{i}", text=t) for i, t in enumerate(texts)],
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Database rows
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _tenant(db) -> uuid.UUID:
+    from models import Tenant
+
+    tenant = Tenant(id=uuid.uuid4(), name="Acme", slug=f"acme-{uuid.uuid4().hex[:8]}")
+    db.add(tenant)
+    db.flush()
+    return tenant.id
+
+
+def _seed(db, tenant_id: uuid.UUID, status: str, risk: float | None, mit: float | None,
+          days_ago: int = 0, failed_traces: int = 0, remediated: int = 0) -> uuid.UUID:
+    from models import Audit, AuditTrace, ScanReport
+
+    completed_at = datetime.now(tz=timezone.utc) - timedelta(days=days_ago)
+    audit = Audit(id=uuid.uuid4(), tenant_id=tenant_id, sample_count=60, status=status,
+                  completed_at=completed_at if status != "pending" else None)
+    db.add(audit)
+    if risk is not None or mit is not None:
+        db.add(ScanReport(audit_id=audit.id, overall_risk_score=risk, mit_coverage_score=mit,
+                          fixed_delta=0.0, confidence_score=0.9, report_json={}))
+    for i in range(failed_traces):
+        db.add(AuditTrace(id=uuid.uuid4(), audit_id=audit.id, gate_id=3, gate_name="g",
+                          check_type="risk_domain", check_name=f"c{i}", result="flagged",
+                          is_remediated=i < remediated))
+    db.add(AuditTrace(id=uuid.uuid4(), audit_id=audit.id, gate_id=1, gate_name="g",
+                      check_type="gate_result", check_name="ok", result="pass", is_remediated=False))
+    return audit.id
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ─────────────────────────────────────────────────────────────────────────────
+
+@pytest.fixture()
+def session_factory():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    import models  # noqa: F401  (registers tables on Base.metadata)
+    from database import Base
+
+    eng = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(eng)
+    yield sessionmaker(bind=eng, autoflush=False)
+    eng.dispose()
+
+
+@pytest.fixture()
+def client(session_factory):
+    from fastapi.testclient import TestClient
+
+    from auth import get_current_user
+    from database import get_db
+    from main import app
+    from routers import output_audit, scan
+
+    db = session_factory()
+    tenant_id = _tenant(db)
+    db.commit()
+    db.close()
+
+    def _db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    user = MagicMock(id=None, tenant_id=tenant_id, role="operator")
+    engine = _make_engine(_INCIDENTS)
+    app.dependency_overrides[get_db] = _db
+    app.dependency_overrides[get_current_user] = lambda: user
+    with patch.object(scan, "get_audit_engine", return_value=engine), \
+            patch.object(output_audit, "get_audit_engine", return_value=engine):
+        yield TestClient(app)
+    app.dependency_overrides.clear()
@@ -0,0 +1,120 @@
+"""
+Tests for the principal cache behind auth.get_current_user.
+
+Runs against an in-memory SQLite database — no live DB required.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import uuid
+
+import pytest
+
+from conftest import _tenant
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-unit-tests")
+
+
+@pytest.fixture()
+def user_token(session_factory):
+    import auth
+    from models import User
+
+    auth._principal_cache.clear()
+    db = session_factory()
+    user = User(id=uuid.uuid4(), tenant_id=_tenant(db), email=f"{uuid.uuid4().hex[:8]}@acme.io",
+                hashed_password="x", role="operator", is_active=True)
+    db.add(user)
+    db.commit()
+    token = auth.create_access_token(user)
+    user_id = user.id
+    db.close()
+    yield user_id, token
+    auth._principal_cache.clear()
+
+
+def _authenticate(db, token: str):
+    from fastapi.security import HTTPAuthorizationCredentials
+
+    from auth import get_current_user
+
+    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return asyncio.run(get_current_user(creds, db))
+
+
+def _count_selects(db, fn):
+    from sqlalchemy import event
+
+    selects: list[str] = []
+    bind = db.get_bind()
+    listener = lambda conn, cur, stmt, *a: stmt.startswith("SELECT") and selects.append(stmt)  # noqa: E731
+    event.listen(bind, "before_cursor_execute", listener)
+    try:
+        result = fn()
+    finally:
+        event.remove(bind, "before_cursor_execute", listener)
+    return result, len(selects)
+
+
+class TestPrincipalCache:
+    def test_cached_principal_skips_db(self, session_factory, user_token):
+        user_id, token = user_token
+        db = session_factory()
+        first, n_first = _count_selects(db, lambda: _authenticate(db, token))
+        second, n_second = _count_selects(db, lambda: _authenticate(db, token))
+        assert (n_first, n_second) == (1, 0)
+        assert first == second
+        assert (second.id, second.role, second.is_active) == (user_id, "operator", True)
+        db.close()
+
+    def test_role_change_and_deactivation_evict(self, session_factory, user_token):
+        from fastapi import HTTPException
+
+        from models import User
+
+        user_id, token = user_token
+
+        def authenticate():
+            db = session_factory()          # one session per request, as in get_db
+            try:
+                return _authenticate(db, token)
+            finally:
+                db.close()
+
+        assert authenticate().role == "operator"
+
+        admin = session_factory()
+        admin.get(User, user_id).role = "super_admin"
+        admin.commit()
+        assert authenticate().role == "super_admin"
+
+        admin.get(User, user_id).is_active = False
+        admin.commit()
+        with pytest.raises(HTTPException) as exc:
+            authenticate()
+        assert exc.value.status_code == 403
+
+        admin.delete(admin.get(User, user_id))
+        admin.commit()
+        with pytest.raises(HTTPException) as exc:
+            authenticate()
+        assert exc.value.status_code == 401
+        admin.close()
+
+    def test_invalid_token_never_hits_cache(self, session_factory, user_token):
+        from fastapi import HTTPException
+
+        _, token = user_token
+        db = session_factory()
+        _authenticate(db, token)
+        with pytest.raises(HTTPException) as exc:
+            _authenticate(db, token[:-4] + "AAAA")
+        assert exc.value.status_code == 401
+        db.close()
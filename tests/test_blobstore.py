@@ -0,0 +1,119 @@
+"""
+Tests for the large-object store (blobstore.py) and offloaded single-output
+texts: content-addressed local backend, background uploads, inline fallback
+and the streamed GET /api/v1/audit/output/{id}.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-unit-tests")
+
+
+# Quotes, backslashes, newlines and multi-byte characters all survive streaming
+_BIG_OUTPUT = 'Réponse « citée » — "quoted" \\ path\n' * 4000
+
+
+class TestLocalBlobStore:
+    def test_content_addressed_and_deduplicated(self, tmp_path):
+        from blobstore import LocalBlobStore, content_hash
+
+        store = LocalBlobStore(str(tmp_path))
+        data = _BIG_OUTPUT.encode()
+        key = store.put(data)
+        assert key == content_hash(data)
+        with patch.object(store, "_write") as write:
+            assert store.put(data) == key
+            write.assert_not_called()
+        assert b"".join(store.open(key)) == data
+        assert [p.name for p in tmp_path.rglob("*") if p.is_file()] == [key]
+
+    def test_rejects_foreign_keys(self, tmp_path):
+        from blobstore import LocalBlobStore
+
+        with pytest.raises(KeyError):
+            LocalBlobStore(str(tmp_path)).open("../../etc/passwd")
+
+    def test_incomplete_backend_cannot_be_built(self):
+        from blobstore import BlobStore
+
+        class NoRead(BlobStore):
+            def key_for(self, digest: str) -> str:
+                return digest
+
+            def exists(self, key: str) -> bool:
+                return False
+
+            def _write(self, key: str, data: bytes) -> None:
+                pass
+
+        with pytest.raises(TypeError):
+            NoRead()
+
+    def test_put_async(self, tmp_path):
+        from blobstore import LocalBlobStore, put_async
+
+        store = LocalBlobStore(str(tmp_path))
+        assert put_async(store, b"hello").result() == store.put(b"hello")
+
+
+class TestOffloadedOutputText:
+    def _post(self, client, store):
+        from routers import output_audit
+
+        with patch.object(output_audit, "get_blob_store", return_value=store), \
+                patch.object(output_audit, "BLOB_OFFLOAD_BYTES", 1000):
+            resp = client.post("/api/v1/audit/output", json={
+                "prompt": "short prompt", "raw_output": _BIG_OUTPUT,
+            })
+        assert resp.status_code == 201, resp.text
+        return uuid.UUID(resp.json()["audit_id"])
+
+    def test_offloaded_text_streamed_back(self, client, session_factory, tmp_path):
+        from blobstore import LocalBlobStore, content_hash
+        from models import AuditMetadata, EnhancedTrace
+        from routers import output_audit
+
+        store = LocalBlobStore(str(tmp_path))
+        audit_id = self._post(client, store)
+
+        db = session_factory()
+        meta = db.query(AuditMetadata).filter(AuditMetadata.audit_id == audit_id).one()
+        trace = db.query(EnhancedTrace).filter(EnhancedTrace.audit_id == audit_id).one()
+        assert meta.output_s3_key == content_hash(_BIG_OUTPUT.encode())
+        assert meta.prompt_s3_key is None
+        assert (trace.raw_output_text, trace.prompt_text) == (None, "short prompt")
+        db.close()
+
+        with patch.object(output_audit, "get_blob_store", return_value=store):
+            resp = client.get(f"/api/v1/audit/output/{audit_id}")
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["raw_output_text"] == _BIG_OUTPUT
+        assert body["prompt_text"] == "short prompt"
+        assert body["audit_id"] == str(audit_id)
+
+    def test_failed_upload_stays_inline(self, client, session_factory, tmp_path):
+        from blobstore import LocalBlobStore
+        from models import AuditMetadata, EnhancedTrace
+
+        store = LocalBlobStore(str(tmp_path))
+        with patch.object(store, "_write", side_effect=OSError("disk full")):
+            audit_id = self._post(client, store)
+
+        db = session_factory()
+        meta = db.query(AuditMetadata).filter(AuditMetadata.audit_id == audit_id).one()
+        trace = db.query(EnhancedTrace).filter(EnhancedTrace.audit_id == audit_id).one()
+        assert meta.output_s3_key is None
+        assert trace.raw_output_text == _BIG_OUTPUT
+        db.close()
@@ -0,0 +1,95 @@
+"""
+Tests for bulk user enrollment during enterprise client onboarding.
+
+Runs against an in-memory SQLite database — no live DB required.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import uuid
+from types import SimpleNamespace
+
+from conftest import _tenant
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-unit-tests")
+
+
+def _onboard(db, sso_enabled: bool, emails: list[str]):
+    from routers.clients import create_client
+    from schemas import ClientOnboardingIn
+
+    payload = ClientOnboardingIn(
+        company_name=f"Client {uuid.uuid4().hex[:6]}",
+        sso_enabled=sso_enabled,
+        initial_users=[{"email": e} for e in emails],
+    )
+    admin = SimpleNamespace(id=uuid.uuid4(), email="root@saro.ai")
+    return create_client(payload, admin, db)
+
+
+def _user_hashes(db, tenant_id) -> dict[str, str]:
+    from models import User
+
+    return {u.email: u.hashed_password for u in db.query(User).filter(User.tenant_id == tenant_id)}
+
+
+class TestInitialUserEnrollment:
+    def test_duplicates_checked_in_one_query(self, session_factory):
+        from sqlalchemy import event
+
+        from models import User
+
+        db = session_factory()
+        db.add(User(email="taken@acme.io", hashed_password="x", tenant_id=_tenant(db)))
+        db.commit()
+
+        user_selects: list[str] = []
+        bind = db.get_bind()
+        listener = lambda conn, cur, stmt, *a: "FROM users" in stmt and user_selects.append(stmt)  # noqa: E731
+        event.listen(bind, "before_cursor_execute", listener)
+        try:
+            out = _onboard(db, True, [f"u{i}@acme.io" for i in range(20)]
+                           + ["taken@acme.io", "u3@acme.io"])
+        finally:
+            event.remove(bind, "before_cursor_execute", listener)
+
+        assert out.users_enrolled == 20
+        assert len(user_selects) == 1
+        assert set(_user_hashes(db, out.tenant_id)) == {f"u{i}@acme.io" for i in range(20)}
+        db.close()
+
+    def test_sso_users_get_unusable_passwords(self, session_factory):
+        from auth import verify_password
+
+        db = session_factory()
+        out = _onboard(db, True, ["a@sso.io", "b@sso.io"])
+        hashes = _user_hashes(db, out.tenant_id)
+        assert all(h.startswith("!") for h in hashes.values())
+        assert len(set(hashes.values())) == 2
+        assert not any(verify_password(h[1:], h) for h in hashes.values())
+        db.close()
+
+    def test_password_users_get_argon2_hashes(self, session_factory):
+        db = session_factory()
+        out = _onboard(db, False, ["a@pw.io", "b@pw.io", "c@pw.io"])
+        hashes = _user_hashes(db, out.tenant_id)
+        assert len(hashes) == 3
+        assert all(h.startswith("$argon2id$") for h in hashes.values())
+        db.close()
+
+
+class TestHashPasswords:
+    def test_pool_hashes_verify_in_order(self, monkeypatch):
+        import auth
+
+        monkeypatch.setattr(auth, "_HASH_WORKERS", 3)
+        plains = [f"pw-{i}" for i in range(5)]
+        hashes = auth.hash_passwords(plains)
+        assert [auth.verify_password(p, h) for p, h in zip(plains, hashes)] == [True] * 5
+        assert not auth.verify_password("pw-1", hashes[0])
@@ -0,0 +1,141 @@
+"""
+Tests for the dashboard KPI aggregates and their per-tenant cache.
+
+Runs against an in-memory SQLite database — no live DB required.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from conftest import _INCIDENTS, _make_batch, _make_engine, _seed, _tenant
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-unit-tests")
+
+
+class TestDashboardKPIs:
+    def test_aggregates_match_tenant_history(self, session_factory):
+        from routers.dashboard import _compute_kpis
+
+        db = session_factory()
+        tenant, other = _tenant(db), _tenant(db)
+        _seed(db, tenant, "completed", 0.2, 0.4, days_ago=0, failed_traces=3, remediated=1)
+        _seed(db, tenant, "completed", 0.4, 0.6, days_ago=0, failed_traces=1)
+        _seed(db, tenant, "completed", 0.9, 1.0, days_ago=2)
+        _seed(db, tenant, "completed", 0.5, 0.5, days_ago=45)           # outside the trend
+        _seed(db, tenant, "failed", 0.99, 0.99, failed_traces=4)        # not averaged
+        _seed(db, tenant, "pending", None, None)
+        _seed(db, other, "completed", 0.0, 0.0, failed_traces=9)
+        db.commit()
+
+        kpis = _compute_kpis(tenant, db)
+        assert (kpis.total_audits, kpis.completed_audits, kpis.failed_audits) == (6, 4, 1)
+        assert kpis.avg_risk_score == round((0.2 + 0.4 + 0.9 + 0.5) / 4, 2)
+        assert kpis.avg_mit_coverage == round((0.4 + 0.6 + 1.0 + 0.5) / 4, 2)
+        assert kpis.pending_remediations == 3
+        today = datetime.now(tz=timezone.utc)
+        assert kpis.risk_trend == [
+            {"date": (today - timedelta(days=2)).strftime("%Y-%m-%d"), "avg_risk_score": 0.9},
+            {"date": today.strftime("%Y-%m-%d"), "avg_risk_score": 0.3},
+        ]
+        db.close()
+
+    def test_empty_tenant(self, session_factory):
+        from routers.dashboard import _compute_kpis
+
+        db = session_factory()
+        kpis = _compute_kpis(_tenant(db), db)
+        assert kpis.total_audits == 0
+        assert kpis.avg_risk_score is None
+        assert kpis.risk_trend == []
+        db.close()
+
+    def test_cached_until_audit_completes(self, session_factory):
+        from unittest.mock import MagicMock
+
+        from routers import dashboard, scan
+
+        db = session_factory()
+        tenant = _tenant(db)
+        db.commit()
+        user = MagicMock(tenant_id=tenant)
+        with patch.object(dashboard, "_kpi_cache", dashboard.TTLCache(ttl=300)):
+            assert dashboard.get_dashboard_kpis(user, db).total_audits == 0
+            with patch.object(dashboard, "_compute_kpis") as compute:
+                dashboard.get_dashboard_kpis(user, db)
+                compute.assert_not_called()
+
+            from models import Audit
+            audit = Audit(id=uuid.uuid4(), tenant_id=tenant, sample_count=60, status="running")
+            db.add(audit)
+            db.commit()
+            assert dashboard.get_dashboard_kpis(user, db).total_audits == 0   # still cached
+            scan._execute_audit(_make_engine(_INCIDENTS), _make_batch(["hello"] * 60), audit, db)
+            kpis = dashboard.get_dashboard_kpis(user, db)
+            assert (kpis.total_audits, kpis.completed_audits) == (1, 1)
+        db.close()
+
+
+class TestTTLCache:
+    def test_expiry_and_lru_eviction(self):
+        from cache import TTLCache
+
+        cache: TTLCache[int] = TTLCache(ttl=10, maxsize=2)
+        with patch("cache.time.monotonic", return_value=0.0):
+            cache.set("a", 1)
+            cache.set("b", 2)
+            assert cache.get("a") == 1          # a is now most recent
+            cache.set("c", 3)                   # evicts b
+            assert cache.get("b") is None
+        with patch("cache.time.monotonic", return_value=11.0):
+            assert cache.get("a") is None
+        assert len(cache) == 1
+
+    def test_zero_ttl_disables(self):
+        from cache import TTLCache
+
+        cache: TTLCache[int] = TTLCache(ttl=0)
+        assert cache.get_or_compute("k", lambda: 5) == 5
+        assert cache.get("k") is None
+
+
+class TestDashboardAuditList:
+    def test_counts_in_one_query(self, session_factory):
+        from unittest.mock import MagicMock
+
+        from fastapi import Response
+        from sqlalchemy import event
+
+        from routers.dashboard import list_dashboard_audits
+
+        db = session_factory()
+        tenant = _tenant(db)
+        done = _seed(db, tenant, "completed", 0.8, 0.5, failed_traces=3, remediated=1)
+        failed = _seed(db, tenant, "failed", None, None, failed_traces=2)
+        clean = _seed(db, tenant, "completed", 0.1, 0.2)
+        db.commit()
+
+        selects: list[str] = []
+        bind = db.get_bind()
+        listener = lambda conn, cur, stmt, *a: stmt.startswith("SELECT") and selects.append(stmt)  # noqa: E731
+        event.listen(bind, "before_cursor_execute", listener)
+        try:
+            items = list_dashboard_audits(MagicMock(tenant_id=tenant), db, Response(), None, 100, 0, None)
+        finally:
+            event.remove(bind, "before_cursor_execute", listener)
+
+        assert len(selects) == 1
+        by_id = {item.id: item for item in items}
+        assert (by_id[done].exceptions_count, by_id[done].remediated_count) == (3, 1)
+        assert by_id[done].remediation_required and by_id[done].overall_risk_score == 0.8
+        assert (by_id[failed].exceptions_count, by_id[failed].overall_risk_score) == (0, None)
+        assert (by_id[clean].exceptions_count, by_id[clean].remediation_required) == (0, False)
+        db.close()
@@ -0,0 +1,79 @@
+"""
+Tests for database pool configuration and pool metrics.
+
+Engines are built against a temporary SQLite file with the same pool kwargs
+and instrumentation _get_engine() uses — no live Postgres required.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-unit-tests")
+
+
+def _instrumented_engine(tmp_path, monkeypatch, **env: str):
+    from sqlalchemy import create_engine
+
+    import database
+
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    database._pool_stats.reset()
+    eng = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", **database._pool_kwargs())
+    database._instrument_pool(eng)
+    return eng
+
+
+def _run_queries(eng, n: int) -> None:
+    from sqlalchemy import text
+
+    for _ in range(n):
+        with eng.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+
+class TestPoolModes:
+    def test_null_pool_is_default_and_connects_every_checkout(self, tmp_path, monkeypatch):
+        import database
+
+        monkeypatch.delenv("DB_POOL_MODE", raising=False)
+        eng = _instrumented_engine(tmp_path, monkeypatch)
+        assert isinstance(eng.pool, database._TimedNullPool)
+        _run_queries(eng, 3)
+        stats = database._pool_stats.snapshot()
+        assert stats["connects"] == 3
+        assert stats["checkouts"] == 3
+        assert stats["checked_out"] == 0
+        eng.dispose()
+
+    def test_queue_pool_reuses_connections(self, tmp_path, monkeypatch):
+        import database
+
+        eng = _instrumented_engine(
+            tmp_path, monkeypatch,
+            DB_POOL_MODE="queue", DB_POOL_SIZE="2", DB_MAX_OVERFLOW="0", DB_POOL_PRE_PING="false",
+        )
+        assert isinstance(eng.pool, database._TimedQueuePool)
+        assert eng.pool.size() == 2
+        _run_queries(eng, 5)
+        stats = database._pool_stats.snapshot()
+        assert stats["connects"] == 1
+        assert stats["checkouts"] == 5
+        assert stats["wait_max_ms"] >= stats["wait_avg_ms"] >= 0.0
+        eng.dispose()
+
+    @pytest.mark.parametrize("raw, expected", [("true", True), ("0", False), ("YES", True)])
+    def test_pre_ping_flag_parsing(self, monkeypatch, raw, expected):
+        import database
+
+        monkeypatch.setenv("DB_POOL_MODE", "queue")
+        monkeypatch.setenv("DB_POOL_PRE_PING", raw)
+        assert database._pool_kwargs()["pool_pre_ping"] is expected
@@ -0,0 +1,287 @@
+"""
+Unit tests for the audit engine's shared-state and fast-path machinery.
+
+Pure in-memory tests — reference data is injected directly, no DB required.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from conftest import _INCIDENTS, _MIXED_TEXTS, _make_batch, _make_engine
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-unit-tests")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Test: shared reference snapshot
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestReferenceSnapshot:
+    def test_engines_share_snapshot_but_not_traces(self):
+        import engine as eng_module
+        snapshot = _make_engine(_INCIDENTS).to_snapshot("v1")
+        a = eng_module.SARoEngine.from_snapshot(snapshot)
+        b = eng_module.SARoEngine.from_snapshot(snapshot)
+        assert a._incidents is b._incidents
+        a.run_audit(_make_batch(["racist toxic output"] * 60), uuid.uuid4())
+        assert a.get_traces()
+        assert b.get_traces() == []
+
+    def test_get_audit_engine_reuses_snapshot_until_fingerprint_changes(self):
+        import engine as eng_module
+        snapshot = _make_engine(_INCIDENTS).to_snapshot("v1")
+        db = MagicMock()
+        with patch.object(eng_module, "_snapshot", snapshot), \
+                patch.object(eng_module, "_snapshot_checked_at", 0.0), \
+                patch.object(eng_module, "reference_fingerprint", return_value="v1"), \
+                patch.object(eng_module, "load_reference_snapshot") as reload:
+            e = eng_module.get_audit_engine(db)
+            assert e._incidents is snapshot.incidents
+            reload.assert_not_called()
+
+        with patch.object(eng_module, "_snapshot", snapshot), \
+                patch.object(eng_module, "_snapshot_checked_at", 0.0), \
+                patch.object(eng_module, "reference_fingerprint", return_value="v2"), \
+                patch.object(eng_module, "load_reference_snapshot", return_value=snapshot) as reload:
+            eng_module.get_audit_engine(db)
+            reload.assert_called_once_with(db)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Test: compiled Gate 3 signal matcher
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _sequential_signals(text: str) -> list[tuple[str, str]]:
+    """The original per-keyword scan, kept as the reference implementation."""
+    import re
+    import engine as eng_module
+    out = []
+    text_lower = text.lower()
+    for domain, signals in eng_module._RISK_SIGNALS.items():
+        hit = next((f"keyword:{kw}" for kw in signals["keywords"] if re.search(kw, text_lower)), None)
+        if hit is None:
+            hit = next(
+                (f"pattern:{p.pattern[:40]}" for p in signals["patterns"] if p.search(text)), None
+            )
+        if hit is not None:
+            out.append((domain, hit))
+    return out
+
+
+class TestSignalMatcher:
+    CASES = [
+        "",
+        "neutral text sample",
+        "This is a toxic and racist statement about demographics.",
+        "Please mislead users with a dark pattern — we exploit user trust.",
+        "The autonomous drone crashed after a sensor error.",
+        "Call 555-123-4567 or mail jane@example.com, SSN 123-45-6789.",
+        "Card 4111 1111 1111 1111, passport AB1234567.",
+        "The election results were a HOAX and the vaccine is FAKE",
+        "Job loss from automation displacement widens the wage gap.",
+        "HATE SPEECH and Gender Bias in SQL Injection payloads",
+        "I believe the harmless failure was not fatal.",
+        "self-driving\ncar had an accident",
+    ]
+
+    def test_matches_sequential_scan_on_fixed_cases(self):
+        import engine as eng_module
+        for text in self.CASES:
+            assert eng_module._SIGNAL_MATCHER.match(text) == _sequential_signals(text), text
+
+    def test_matches_sequential_scan_on_random_keyword_mixes(self):
+        import random
+        import engine as eng_module
+        rng = random.Random(1234)
+        vocab = [
+            "mislead", "user", "users", "fail", "autonomous", "exploit", "hate", "speech",
+            "lie", "believe", "error", "ssn", "dob", "phi", "pii", "drone", "crash",
+            "carbon", "job", "loss", "dark", "pattern", "123-45-6789", "x@y.io", "the",
+            "AB123456", "covid", "false", "manipulative", "HARASSMENT",
+        ]
+        for _ in range(500):
+            seps = [" ", "", "\n", "-"]
+            text = "".join(rng.choice(vocab) + rng.choice(seps) for _ in range(rng.randint(1, 12)))
+            assert eng_module._SIGNAL_MATCHER.match(text) == _sequential_signals(text), text
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Test: vectorised Beta posteriors
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestBetaPosteriors:
+    def test_matches_frozen_scipy_distribution(self):
+        from scipy import stats
+        import engine as eng_module
+        n = 137
+        ks = [0, 1, 5, 68, 136, 137, 5]
+        got = eng_module._beta_posteriors(ks, n, 0.5, 0.95)
+        for k, (mean, lo, hi) in zip(ks, got):
+            dist = stats.beta(0.5 + k, 0.5 + n - k)
+            assert mean == pytest.approx(dist.mean(), abs=1e-12)
+            assert lo == pytest.approx(dist.ppf(0.025), abs=1e-10)
+            assert hi == pytest.approx(dist.ppf(0.975), abs=1e-10)
+
+    def test_cache_is_bounded_lru(self):
+        import engine as eng_module
+        with patch.object(eng_module, "_POSTERIOR_CACHE_SIZE", 3), \
+                patch.object(eng_module, "_posterior_cache", eng_module.OrderedDict()):
+            eng_module._beta_posteriors([1, 2, 3], 10, 0.5, 0.95)
+            eng_module._beta_posteriors([1], 10, 0.5, 0.95)      # refresh k=1
+            eng_module._beta_posteriors([4], 10, 0.5, 0.95)      # evicts k=2
+            assert [key[0] for key in eng_module._posterior_cache] == [3, 1, 4]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Test: streaming audits (running accumulators)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _labelled_samples(texts: list[str]):
+    from schemas import SampleIn
+    return [
+        SampleIn(
+            sample_id=f"s{i}",
+            text=t,
+            group=("A", "B", None)[i % 3],
+            label=("toxic", "safe", None, "Benign")[i % 4],
+        )
+        for i, t in enumerate(texts)
+    ]
+
+
+class TestAuditStream:
+    def _dump(self, report) -> dict:
+        return report.model_dump(exclude={"audit_id", "created_at"})
+
+    def test_chunked_stream_matches_run_audit(self):
+        from schemas import AuditConfigIn, BatchIn
+        samples = _labelled_samples(_MIXED_TEXTS)
+        for matching in ("batch_text", "per_sample"):
+            config = AuditConfigIn(incident_matching=matching)
+            batch = BatchIn(batch_id="b", dataset_name="d", samples=samples, config=config)
+            expected = _make_engine(_INCIDENTS).run_audit(batch, uuid.uuid4())
+
+            stream = _make_engine(_INCIDENTS).open_stream("b", "d", config)
+            for start in range(0, len(samples), 7):
+                stream.add(samples[start:start + 7])
+            assert self._dump(stream.finish(uuid.uuid4())) == self._dump(expected)
+
+    def test_gate_details_match_direct_computation(self):
+        import numpy as np
+        samples = _labelled_samples(_MIXED_TEXTS)
+        stream = _make_engine(_INCIDENTS).open_stream()
+        stream.add(samples)
+        gates = {g.gate_id: g.details for g in stream.finish(uuid.uuid4()).gates}
+
+        lengths = [len(s.text.split()) for s in samples]
+        assert gates[1]["mean_token_length"] == round(float(np.mean(lengths)), 1)
+        assert gates[1]["std_token_length"] == round(float(np.std(lengths)), 1)
+        assert gates[1]["very_short_samples"] == sum(1 for n in lengths if n < 3)
+
+        for group in ("A", "B"):
+            labels = [s.label for s in samples if s.group == group and s.label]
+            positive = sum(1 for lb in labels if lb.lower() not in ("safe", "benign"))
+            assert gates[2]["positive_rates"][group] == round(positive / len(labels), 4)
+        assert gates[2]["groups_analysed"] == ["A", "B"]
+
+    def test_columnar_tally_matches_per_sample_fold(self):
+        import engine as eng_module
+        from schemas import SampleIn
+        rows = [("B", None), ("", "toxic"), ("A", "SAFE"), ("B", "toxic"), (None, "x"),
+                ("A", ""), ("C", "0"), ("A", "toxic"), ("B", "benign")] * 7
+        samples = [
+            SampleIn(sample_id=f"s{i}", text=f"sample {'x ' * (i % 5)}", group=g, label=lb)
+            for i, (g, lb) in enumerate(rows)
+        ]
+        expected: dict[str, list[int]] = {}
+        for s in samples:
+            if s.group and s.label:
+                counts = expected.setdefault(s.group, [0, 0])
+                counts[0] += 1
+                counts[1] += s.label.lower() not in ("safe", "benign", "0", "false")
+
+        tally = eng_module._AuditTally()
+        for start in range(0, len(samples), 10):
+            tally.add(eng_module._SampleColumns.from_samples(samples[start:start + 10]))
+        assert tally.group_labels == expected
+        assert list(tally.group_labels) == list(expected)
+        assert tally.with_group == sum(1 for s in samples if s.group is not None)
+        assert tally.with_label == sum(1 for s in samples if s.label is not None)
+        lengths = [len(s.text.split()) for s in samples]
+        assert (tally.token_sum, tally.token_sq_sum) == (sum(lengths), sum(n * n for n in lengths))
+
+    def test_bulk_rows_fold_like_samples(self):
+        import engine as eng_module
+        samples = _labelled_samples(_MIXED_TEXTS)
+        rows = [s.model_dump(exclude={"sample_id"}) for s in samples]
+        from_rows = eng_module._AuditTally()
+        for start in range(0, len(rows), 40):
+            from_rows.add(eng_module._SampleColumns.from_rows(rows[start:start + 40], offset=start))
+        from_samples = eng_module._AuditTally()
+        from_samples.add(eng_module._SampleColumns.from_samples(samples))
+
+        flagged = from_rows.flag_examples["Discrimination & Toxicity"]
+        assert [f.sample_id for f in flagged[:2]] == ["#0", "#5"]
+        for examples in from_samples.flag_examples.values():
+            for f in examples:
+                f.sample_id = "#" + f.sample_id.removeprefix("s")
+        assert from_rows == from_samples
+
+    def test_retained_state_is_bounded(self):
+        import engine as eng_module
+        stream = _make_engine(_INCIDENTS).open_stream()
+        stream.add(_labelled_samples(["racist toxic output"] * 500))
+        tally = stream._tally
+        assert tally.domain_counts["Discrimination & Toxicity"] == 500
+        assert len(tally.flag_examples["Discrimination & Toxicity"]) == eng_module._FLAG_EXAMPLES_PER_DOMAIN
+        assert len(tally.head_texts) == eng_module._BATCH_TEXT_SAMPLES
+
+    def test_too_few_samples_fails_gate1(self):
+        stream = _make_engine(_INCIDENTS).open_stream("b", "d")
+        stream.add(_labelled_samples(["racist toxic output"] * 10))
+        report = stream.finish(uuid.uuid4())
+        assert report.status == "failed"
+        assert report.sample_count == 10
+        assert [g.gate_id for g in report.gates] == [1]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Test: sharded Gate 3
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestGate3Sharding:
+    def test_sharded_scan_matches_serial(self):
+        import engine as eng_module
+        texts = [t + f" #{i}" for i, t in enumerate(_MIXED_TEXTS)]
+        serial = eng_module._signal_code_matrix(texts)
+        with patch.object(eng_module, "GATE3_PARALLEL_THRESHOLD", 10), \
+                patch.object(eng_module, "GATE3_WORKERS", 2):
+            try:
+                pool = eng_module._get_gate3_pool()
+                assert pool._mp_context.get_start_method() in ("forkserver", "spawn")
+                sharded = eng_module._scan_signals(texts)
+                stream = _make_engine(_INCIDENTS).open_stream("b", "d")
+                stream.add(_labelled_samples(texts))
+                parallel_report = stream.finish(uuid.uuid4())
+            finally:
+                eng_module.shutdown_gate3_pool()
+        assert sharded.dtype == serial.dtype
+        assert (sharded == serial).all()
+
+        with patch.object(eng_module, "GATE3_PARALLEL_THRESHOLD", 0):
+            stream = _make_engine(_INCIDENTS).open_stream("b", "d")
+            stream.add(_labelled_samples(texts))
+            serial_report = stream.finish(uuid.uuid4())
+        dump = TestAuditStream()._dump
+        assert dump(parallel_report) == dump(serial_report)
+
@@ -0,0 +1,199 @@
+"""
+Tests for the concurrent GitHub correlation scanner.
+
+Runs against a local http.server stub of the GitHub REST API — no network.
+"""
+from __future__ import annotations
+
+import base64
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-unit-tests")
+
+_LATENCY = 0.05
+
+
+class _StubGitHub(BaseHTTPRequestHandler):
+    """/search/code → two files per term; /repos/{repo}/contents/{path} → file body."""
+
+    calls: Counter = Counter()
+    rate_limited_once: set[str] = set()
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def log_message(self, *args) -> None:  # keep pytest output clean
+        pass
+
+    def _send(self, code: int, body: dict, headers: dict[str, str] | None = None) -> None:
+        raw = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self) -> None:  # noqa: N802
+        # Count only the simulated latency: a request must be out of flight
+        # before its response is sent, or the next test can still see it.
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            time.sleep(_LATENCY)
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+        self._route()
+
+    def _route(self) -> None:
+        url = urlparse(self.path)
+        if url.path == "/search/code":
+            term, repo = parse_qs(url.query)["q"][0].split(" repo:")
+            with self.lock:
+                self.calls["search"] += 1
+                first_hit = term in self.rate_limited_once
+                self.rate_limited_once.discard(term)
+            if first_hit:
+                self._send(403, {"message": "API rate limit exceeded"}, {
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset": str(time.time() + 0.2),
+                    "X-RateLimit-Resource": "code_search",
+                })
+                return
+            items = [{"path": f"src/{term}_{i}.py", "sha": f"{repo}-{term}-{i}"} for i in range(2)]
+            self._send(200, {"items": items}, {"X-RateLimit-Remaining": "29"})
+        elif url.path.startswith("/repos/"):
+            with self.lock:
+                self.calls["contents"] += 1
+            path = url.path.split("/contents/", 1)[1]
+            content = base64.b64encode(f"# {path}\n".encode() * 100).decode()
+            self._send(200, {"content": content})
+        else:
+            self._send(404, {})
+
+
+@pytest.fixture()
+def github_stub(monkeypatch):
+    import github_scanner
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubGitHub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _StubGitHub.calls.clear()
+    _StubGitHub.rate_limited_once.clear()
+    _StubGitHub.max_in_flight = 0
+    monkeypatch.setattr(github_scanner, "GITHUB_API_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(github_scanner, "GITHUB_SCAN_CONCURRENCY", 8)
+    github_scanner.close_client()
+    github_scanner._snippet_cache.clear()
+    yield _StubGitHub
+    github_scanner.close_client()
+    server.shutdown()
+    server.server_close()
+
+
+def _searches(repos: int) -> list[tuple[str, str, str]]:
+    return [
+        (f"acme/repo{r}", domain, term)
+        for r in range(repos)
+        for domain, terms in (("Privacy & Security", ["pii", "redact"]),
+                              ("Misinformation", ["rag", "grounding"]))
+        for term in terms
+    ]
+
+
+class TestGitHubScanner:
+    def test_hits_keep_serial_order_and_cap(self, github_stub):
+        import github_scanner
+
+        searches = _searches(3)
+        hits = github_scanner.scan("pat", searches, max_results=10, files_per_search=3)
+        expected = [
+            (repo, domain, f"src/{term}_{i}.py")
+            for repo, domain, term in searches
+            for i in range(2)
+        ][:10]
+        assert [(h.repo, h.domain, h.path) for h in hits] == expected
+        assert all(h.snippet.startswith(f"# {h.path}") and h.snippet.endswith("…") for h in hits)
+        assert all(len(h.scan_hash) == 64 for h in hits)
+        assert github_stub.calls["contents"] == 10
+
+    def test_requests_overlap(self, github_stub, monkeypatch):
+        import github_scanner
+
+        monkeypatch.setattr(github_scanner, "GITHUB_SCAN_CONCURRENCY", 4)
+        hits = github_scanner.scan("pat", _searches(4), max_results=100)
+        assert len(hits) == 32                       # 16 searches + 32 snippet fetches
+        assert 1 < github_stub.max_in_flight <= 4
+
+    def test_snippets_cached_by_blob_sha(self, github_stub):
+        import github_scanner
+
+        first = github_scanner.scan("pat", _searches(1), max_results=100)
+        second = github_scanner.scan("pat", _searches(1), max_results=100)
+        assert first == second
+        assert github_stub.calls["contents"] == len(first)
+        assert github_stub.calls["search"] == 2 * len(_searches(1))
+
+    def test_waits_out_rate_limit_reset(self, github_stub):
+        import github_scanner
+
+        github_stub.rate_limited_once.add("pii")
+        hits = github_scanner.scan("pat", _searches(1)[:1], max_results=100)
+        assert [h.path for h in hits] == ["src/pii_0.py", "src/pii_1.py"]
+        assert github_stub.calls["search"] == 2
+
+    def test_gives_up_when_reset_exceeds_max_wait(self, github_stub, monkeypatch):
+        import github_scanner
+
+        monkeypatch.setattr(github_scanner, "GITHUB_RATE_LIMIT_MAX_WAIT", 0.0)
+        monkeypatch.setattr(github_scanner, "_rate_limit", github_scanner._RateLimit())
+        github_stub.rate_limited_once.add("pii")
+        assert github_scanner.scan("pat", _searches(1)[:1], max_results=100) == []
+
+    def test_searches_stop_once_cap_is_reachable(self, github_stub):
+        import github_scanner
+
+        searches = _searches(8)
+        hits = github_scanner.scan("pat", searches, max_results=2, files_per_search=3)
+        assert len(hits) == 2
+        assert github_stub.calls["search"] == 1          # the serial walk's count
+
+        github_stub.calls.clear()
+        github_scanner.scan("pat", searches, max_results=7, files_per_search=2)
+        assert github_stub.calls["search"] == 4
+
+    def test_rate_limits_are_per_token_and_resource(self, monkeypatch):
+        import httpx
+
+        import github_scanner
+
+        monkeypatch.setattr(github_scanner, "GITHUB_RATE_LIMIT_MAX_WAIT", 0.0)
+        limits = github_scanner._RateLimit()
+        exhausted = httpx.Response(403, headers={
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(time.time() + 60),
+            "X-RateLimit-Resource": "code_search",
+        })
+        assert limits.observe("tenant-a", "/search/code", exhausted)
+        assert not limits.wait("tenant-a", "/search/code")
+        assert limits.wait("tenant-a", "/repos/acme/x/contents/a.py")    # core budget
+        assert limits.wait("tenant-b", "/search/code")                   # other token
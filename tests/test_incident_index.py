@@ -0,0 +1,229 @@
+"""
+Tests for the sparse TF-IDF incident index (incident_index.py) and its
+incremental extension from the engine's reference snapshot.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import uuid
+
+import numpy as np
+import pytest
+
+from conftest import _INCIDENTS, _make_batch, _make_engine
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-unit-tests")
+
+
+_QUERIES = [
+    "the chatbot gave racist and toxic replies",
+    "credit card password leak",
+    "autonomous car crashed",
+    "no overlap whatsoever zzz",
+]
+
+
+def _corpus(incidents):
+    from incident_index import incident_text
+    return [incident_text(inc) for inc in incidents]
+
+
+class TestIncidentIndexSearch:
+    def test_matches_dense_cosine_similarity(self):
+        from sklearn.metrics.pairwise import cosine_similarity
+        from incident_index import IncidentIndex
+
+        index = IncidentIndex.build(_corpus(_INCIDENTS))
+        for query in _QUERIES:
+            dense = cosine_similarity(index.vectorizer.transform([query]), index.matrix).ravel()
+            expected = sorted(
+                ((i, s) for i, s in enumerate(dense) if s >= 0.01), key=lambda p: (-p[1], p[0])
+            )[:3]
+            got = index.search(query, top_k=3, min_score=0.01)
+            assert [i for i, _ in got] == [i for i, _ in expected], query
+            assert np.allclose([s for _, s in got], [s for _, s in expected])
+
+    def test_search_each_matches_search(self):
+        from incident_index import IncidentIndex
+
+        index = IncidentIndex.build(_corpus(_INCIDENTS))
+        batched = index.search_each(_QUERIES, top_k=3, min_score=0.01)
+        for query, got in zip(_QUERIES, batched):
+            expected = index.search(query, top_k=3, min_score=0.01)
+            assert [i for i, _ in got] == [i for i, _ in expected], query
+            assert np.allclose([s for _, s in got], [s for _, s in expected])
+        assert index.search_each([], top_k=3) == []
+
+    def test_empty_corpus_and_zero_k(self):
+        from incident_index import IncidentIndex
+
+        assert IncidentIndex.build([]) is None
+        index = IncidentIndex.build(_corpus(_INCIDENTS))
+        assert index.search("racist", top_k=0) == []
+
+    def test_add_keeps_vocabulary_and_returns_new_index(self):
+        from incident_index import IncidentIndex
+
+        index = IncidentIndex.build(_corpus(_INCIDENTS[:3]))
+        extended = index.add(_corpus(_INCIDENTS[3:]))
+        assert len(index) == 3 and len(extended) == 5
+        assert extended.vectorizer is index.vectorizer
+        assert extended.fitted_size == 3
+        assert extended.search("crash", top_k=1)[0][0] == 2
+
+    def test_save_load_round_trip(self, tmp_path):
+        from incident_index import IncidentIndex
+
+        index = IncidentIndex.build(_corpus(_INCIDENTS)).add(["Deepfake election video spread"])
+        index.save(str(tmp_path))
+        loaded = IncidentIndex.load(str(tmp_path))
+        assert loaded.fitted_size == index.fitted_size
+        for query in _QUERIES:
+            assert loaded.search(query, 5) == index.search(query, 5)
+
+
+class TestIncrementalSnapshotIndex:
+    def _rebuild(self, incidents, previous):
+        import engine as eng_module
+        e = eng_module.SARoEngine.__new__(eng_module.SARoEngine)
+        e._incidents = list(incidents)
+        e._build_incident_index(previous)
+        return e._incident_index
+
+    def test_appended_incidents_extend_previous_index(self):
+        from unittest.mock import patch
+        import engine as eng_module
+        previous = _make_engine(_INCIDENTS[:4]).to_snapshot("v1")
+        with patch.object(eng_module, "INCIDENT_INDEX_REFIT_RATIO", 0.5):
+            index = self._rebuild(_INCIDENTS, previous)
+        assert index.vectorizer is previous.incident_index.vectorizer
+        assert len(index) == 5
+
+    def test_extended_index_is_not_persisted(self, tmp_path):
+        from unittest.mock import patch
+        import engine as eng_module
+        from incident_index import IncidentIndex, corpus_checksum
+
+        with patch.object(eng_module, "INCIDENT_INDEX_DIR", str(tmp_path)):
+            previous = _make_engine(_INCIDENTS[:4]).to_snapshot("v1")
+            with patch.object(eng_module, "INCIDENT_INDEX_REFIT_RATIO", 0.5):
+                self._rebuild(_INCIDENTS, previous)
+            assert not (tmp_path / corpus_checksum(_corpus(_INCIDENTS))).exists()
+            cold = self._rebuild(_INCIDENTS, None)
+        fresh = IncidentIndex.build(_corpus(_INCIDENTS))
+        assert cold.fitted_size == len(_INCIDENTS)
+        for query in _QUERIES:
+            assert cold.search(query, 5) == fresh.search(query, 5)
+
+    @pytest.mark.parametrize("incidents", [_INCIDENTS[1:], list(reversed(_INCIDENTS))])
+    def test_changed_prefix_refits(self, incidents):
+        previous = _make_engine(_INCIDENTS[:4]).to_snapshot("v1")
+        index = self._rebuild(incidents, previous)
+        assert index.vectorizer is not previous.incident_index.vectorizer
+        assert index.fitted_size == len(incidents)
+
+    def test_large_append_refits(self):
+        import engine as eng_module
+        previous = _make_engine(_INCIDENTS[:1]).to_snapshot("v1")
+        assert len(_INCIDENTS) - 1 > eng_module.INCIDENT_INDEX_REFIT_RATIO * 1
+        index = self._rebuild(_INCIDENTS, previous)
+        assert index.vectorizer is not previous.incident_index.vectorizer
+
+
+def _is_memory_mapped(array) -> bool:
+    """True when the array is a (possibly wrapped) view onto a file mapping."""
+    import mmap
+    while array is not None:
+        if isinstance(array, (np.memmap, mmap.mmap)):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+class TestIndexArtifacts:
+    def test_second_process_maps_saved_artifact(self, tmp_path):
+        from unittest.mock import MagicMock
+        from incident_index import corpus_checksum, load_or_build
+
+        corpus = _corpus(_INCIDENTS)
+        built = load_or_build(corpus, str(tmp_path))
+        assert (tmp_path / corpus_checksum(corpus) / "index.json").exists()
+
+        never = MagicMock()
+        loaded = load_or_build(corpus, str(tmp_path), build=never)
+        never.assert_not_called()
+        assert _is_memory_mapped(loaded.matrix.data)
+        assert _is_memory_mapped(loaded._postings.indices)
+        assert loaded.vectorizer.vocabulary_ == built.vectorizer.vocabulary_
+        for query in _QUERIES:
+            assert (loaded.vectorizer.transform([query]) != built.vectorizer.transform([query])).nnz == 0
+            assert loaded.search(query, 5) == built.search(query, 5)
+
+    def test_changed_corpus_gets_new_artifact_and_old_ones_are_pruned(self, tmp_path):
+        import incident_index
+        corpus = _corpus(_INCIDENTS)
+        for i in range(incident_index._ARTIFACTS_KEPT + 2):
+            incident_index.load_or_build(corpus[: i + 1], str(tmp_path))
+        assert len(list(tmp_path.iterdir())) == incident_index._ARTIFACTS_KEPT
+
+    def test_corrupt_artifact_is_rebuilt(self, tmp_path):
+        from incident_index import corpus_checksum, load_or_build
+
+        corpus = _corpus(_INCIDENTS)
+        load_or_build(corpus, str(tmp_path))
+        (tmp_path / corpus_checksum(corpus) / "index.json").write_text("{not json")
+        index = load_or_build(corpus, str(tmp_path))
+        assert index.search("racist", 1)[0][0] == 0
+
+
+class TestPerSampleMatching:
+    SAMPLES = [
+        "racist toxic reply from the chatbot",
+        "nothing to see here",
+        "leaked credit card numbers",
+        "the chatbot was racist again",
+        "autonomous vehicle crash",
+    ] * 3
+
+    @pytest.mark.parametrize("aggregation", ["max", "mean"])
+    def test_matches_dense_per_sample_scores(self, aggregation):
+        from sklearn.metrics.pairwise import cosine_similarity
+        from incident_index import IncidentIndex, IncidentMatchAccumulator
+
+        index = IncidentIndex.build(_corpus(_INCIDENTS))
+        dense = cosine_similarity(index.vectorizer.transform(self.SAMPLES), index.matrix)
+        agg = dense.max(axis=0) if aggregation == "max" else dense.mean(axis=0)
+        eligible = [i for i in range(dense.shape[1]) if dense[:, i].max() >= 0.01]
+        expected = sorted(eligible, key=lambda i: (-agg[i], i))[:3]
+
+        acc = IncidentMatchAccumulator(index, attributions=3)
+        for start in range(0, len(self.SAMPLES), 4):
+            acc.add(self.SAMPLES[start:start + 4])
+        got = acc.top(3, 0.01, aggregation)
+        assert [doc for doc, _, _ in got] == expected
+        for doc, score, attributions in got:
+            assert score == pytest.approx(agg[doc])
+            best_rows = sorted(range(len(self.SAMPLES)), key=lambda r: (-dense[r, doc], r))[:3]
+            assert [pos for pos, _ in attributions] == [r for r in best_rows if dense[r, doc] > 0]
+
+    def test_engine_per_sample_mode_attributes_samples(self):
+        engine = _make_engine(_INCIDENTS)
+        batch = _make_batch(["benign filler text"] * 55 + ["racist toxic chatbot output"] * 5)
+        batch.config.incident_matching = "per_sample"
+        report = engine.run_audit(batch, uuid.uuid4())
+        top = report.similar_incidents[0]
+        assert top.incident_id == "INC-0"
+        assert {m.sample_id for m in top.matched_samples} <= {f"s{i}" for i in range(55, 60)}
+
+    def test_default_mode_has_no_attributions(self):
+        report = _make_engine(_INCIDENTS).run_audit(
+            _make_batch(["racist toxic chatbot output"] * 60), uuid.uuid4()
+        )
+        assert report.similar_incidents
+        assert all(inc.matched_samples is None for inc in report.similar_incidents)
@@ -125,8 +125,7 @@ class TestEngineTracing:
                 e._nist_controls = []
                 e._aigp = []
                 e._gov_rules = []
-                e._tfidf_vectorizer = None
-                e._incident_matrix = None
+                e._incident_index = None
                 return e
 
     def _make_batch(self, n: int = 60, include_risk_text: bool = False):
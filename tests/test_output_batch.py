@@ -0,0 +1,168 @@
+"""
+Tests for micro-batched single-output audits: SARoEngine.run_output_audits
+and POST /api/v1/audit/output/batch.
+
+Runs the real router through TestClient against an in-memory SQLite database
+and an engine built from injected reference data.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import uuid
+from unittest.mock import MagicMock, patch
+
+from conftest import _INCIDENTS, _MIXED_TEXTS, _make_engine
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-unit-tests")
+
+
+_PROMPTS = [None, "Summarise the customer's account", "Is this news accurate?"]
+
+
+def _outputs(n: int) -> list[tuple[uuid.UUID, str, str | None, str]]:
+    return [
+        (uuid.uuid4(), _MIXED_TEXTS[i % len(_MIXED_TEXTS)], _PROMPTS[i % len(_PROMPTS)], "openai")
+        for i in range(n)
+    ]
+
+
+def _comparable(report) -> dict:
+    return report.model_dump(mode="json", exclude={"created_at"})
+
+
+class TestRunOutputAudits:
+    def test_matches_single_output_audits(self):
+        engine = _make_engine(_INCIDENTS)
+        outputs = _outputs(12)
+        batched = engine.run_output_audits(outputs)
+        assert len(batched) == len(outputs)
+        for (audit_id, raw_output, prompt, model), (report, traces) in zip(outputs, batched):
+            single = engine.run_output_audit(audit_id, raw_output, prompt, model)
+            assert _comparable(report) == _comparable(single)
+            assert traces == engine.get_traces()
+        assert engine.run_output_audits([]) == []
+
+
+class TestOutputBatchEndpoint:
+    def test_batch_persists_every_output_in_one_commit(self, client, session_factory):
+        from sqlalchemy import event, func, select
+        from sqlalchemy.orm import Session
+
+        from models import Audit, AuditMetadata, AuditTrace, EnhancedTrace, ScanReport
+
+        body = {"outputs": [
+            {"prompt": prompt or "n/a", "raw_output": raw, "source_model": "claude",
+             "metadata": {"i": i}}
+            for i, (_, raw, prompt, _) in enumerate(_outputs(25))
+        ]}
+        commits: list[int] = []
+        on_commit = lambda session: commits.append(1)  # noqa: E731
+        event.listen(Session, "after_commit", on_commit)
+        try:
+            resp = client.post("/api/v1/audit/output/batch", json=body)
+        finally:
+            event.remove(Session, "after_commit", on_commit)
+        assert len(commits) == 1
+        assert resp.status_code == 201, resp.text
+        data = resp.json()
+        assert data["count"] == 25
+        ids = [uuid.UUID(r["audit_id"]) for r in data["results"]]
+        assert len(set(ids)) == 25
+
+        db = session_factory()
+        for model in (Audit, AuditMetadata, ScanReport, EnhancedTrace):
+            assert db.execute(select(func.count()).select_from(model)).scalar() == 25, model
+        n_traces = db.execute(select(func.count()).select_from(AuditTrace)).scalar()
+        assert n_traces >= 25 * 3                                 # gates 1, 2, 4 at least
+        first = data["results"][0]
+        trace = db.execute(
+            select(EnhancedTrace).where(EnhancedTrace.audit_id == ids[0])
+        ).scalar_one()
+        assert trace.raw_output_text == body["outputs"][0]["raw_output"]
+        assert trace.chain_of_thought["total_checks"] == db.execute(
+            select(func.count()).select_from(AuditTrace).where(AuditTrace.audit_id == ids[0])
+        ).scalar()
+        assert first["exceptions_count"] == trace.chain_of_thought["failed_checks"]
+        assert {a.status for a in db.execute(select(Audit)).scalars()} == {"completed"}
+        db.close()
+
+    def test_engine_error_writes_nothing(self, client, session_factory):
+        from sqlalchemy import func, select
+
+        from models import Audit
+        from routers import output_audit
+
+        broken = MagicMock()
+        broken.run_output_audits.side_effect = RuntimeError("boom")
+        with patch.object(output_audit, "get_audit_engine", return_value=broken):
+            resp = client.post("/api/v1/audit/output/batch", json={"outputs": [
+                {"prompt": "p", "raw_output": "o"}
+            ]})
+        assert resp.status_code == 500
+        db = session_factory()
+        assert db.execute(select(func.count()).select_from(Audit)).scalar() == 0
+        db.close()
+
+    def test_write_error_rolls_back(self, client, session_factory):
+        from sqlalchemy import func, select
+
+        from models import Audit
+        from routers import output_audit
+
+        with patch.object(output_audit.rollups, "record_reports", side_effect=RuntimeError("db")):
+            resp = client.post("/api/v1/audit/output/batch", json={"outputs": [
+                {"prompt": "p", "raw_output": "o"}
+            ]})
+        assert resp.status_code == 500
+        assert "could not be saved" in resp.json()["detail"]
+        db = session_factory()
+        assert db.execute(select(func.count()).select_from(Audit)).scalar() == 0
+        db.close()
+
+    def test_empty_batch_rejected(self, client):
+        assert client.post("/api/v1/audit/output/batch", json={"outputs": []}).status_code == 422
+
+
+class TestSingleOutputEndpoint:
+    def test_enhanced_trace_built_without_rereading_traces(self, client, session_factory):
+        from sqlalchemy import event, func, select
+        from sqlalchemy.engine import Engine
+        from sqlalchemy.orm import Session
+
+        from models import AuditTrace, EnhancedTrace
+
+        trace_selects: list[str] = []
+        commits: list[int] = []
+        on_select = lambda conn, cur, stmt, *a: (  # noqa: E731
+            stmt.startswith("SELECT") and "audit_traces" in stmt and trace_selects.append(stmt)
+        )
+        on_commit = lambda session: commits.append(1)  # noqa: E731
+        event.listen(Engine, "before_cursor_execute", on_select)
+        event.listen(Session, "after_commit", on_commit)
+        try:
+            resp = client.post("/api/v1/audit/output", json={
+                "prompt": "Summarise the account", "raw_output": _MIXED_TEXTS[1],
+            })
+        finally:
+            event.remove(Engine, "before_cursor_execute", on_select)
+            event.remove(Session, "after_commit", on_commit)
+
+        assert resp.status_code == 201, resp.text
+        assert trace_selects == []
+        assert len(commits) == 2                  # running audit, then everything else
+        audit_id = uuid.UUID(resp.json()["audit_id"])
+        db = session_factory()
+        trace = db.execute(
+            select(EnhancedTrace).where(EnhancedTrace.audit_id == audit_id)
+        ).scalar_one()
+        assert trace.chain_of_thought["total_checks"] == db.execute(
+            select(func.count()).select_from(AuditTrace).where(AuditTrace.audit_id == audit_id)
+        ).scalar()
+        assert resp.json()["exceptions_count"] == trace.chain_of_thought["failed_checks"]
+        db.close()
@@ -0,0 +1,138 @@
+"""
+Tests for the content-hash cache of single-output audit results.
+
+Engines are built from injected reference data (no DB); the module cache is
+swapped for a fresh one per test.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from conftest import _INCIDENTS, _MIXED_TEXTS, _make_engine
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-unit-tests")
+
+
+_TEXT = _MIXED_TEXTS[1]
+
+
+@pytest.fixture()
+def output_cache():
+    import engine
+
+    cache = engine.TTLCache(ttl=60, maxsize=100)
+    with patch.object(engine, "_output_cache", cache):
+        yield cache
+
+
+def _versioned_engine(version: str = "v1"):
+    eng = _make_engine(_INCIDENTS)
+    eng._reference_version = version
+    return eng
+
+
+def _comparable(report) -> dict:
+    return report.model_dump(mode="json", exclude={"audit_id", "created_at"})
+
+
+class TestOutputAuditCache:
+    def test_hit_reissues_report_under_new_audit_id(self, output_cache):
+        eng = _versioned_engine()
+        first_id, second_id = uuid.uuid4(), uuid.uuid4()
+        first = eng.run_output_audit(first_id, _TEXT, "prompt", "openai")
+        first_traces = eng.get_traces()
+
+        with patch.object(eng, "_find_similar_incidents") as search:
+            second = eng.run_output_audit(second_id, _TEXT, "prompt", "openai")
+            search.assert_not_called()
+
+        assert (first.audit_id, second.audit_id) == (first_id, second_id)
+        assert _comparable(second) == _comparable(first)
+        assert eng.get_traces() == first_traces
+        assert (output_cache.hits, output_cache.misses) == (1, 1)
+
+    def test_key_covers_content_model_and_reference_version(self, output_cache):
+        eng = _versioned_engine()
+        eng.run_output_audit(uuid.uuid4(), _TEXT, "prompt", "openai")
+        eng.run_output_audit(uuid.uuid4(), _TEXT, "other prompt", "openai")
+        eng.run_output_audit(uuid.uuid4(), _TEXT, "prompt", "anthropic")
+        _versioned_engine("v2").run_output_audit(uuid.uuid4(), _TEXT, "prompt", "openai")
+        assert (output_cache.hits, len(output_cache)) == (0, 4)
+
+    def test_uncached_without_versioned_snapshot(self, output_cache):
+        for eng in (_make_engine(_INCIDENTS), _versioned_engine("unversioned")):
+            eng.run_output_audit(uuid.uuid4(), _TEXT, None, "openai")
+        assert len(output_cache) == 0
+
+    def test_batch_computes_each_distinct_output_once(self, output_cache):
+        eng = _versioned_engine()
+        eng.run_output_audit(uuid.uuid4(), _MIXED_TEXTS[0], None, "openai")
+        outputs = [
+            (uuid.uuid4(), _MIXED_TEXTS[0], None, "openai"),   # cached
+            (uuid.uuid4(), _MIXED_TEXTS[2], None, "openai"),
+            (uuid.uuid4(), _MIXED_TEXTS[2], None, "openai"),   # repeat within the batch
+        ]
+        with patch.object(eng, "_run_output_audits", wraps=eng._run_output_audits) as compute:
+            results = eng.run_output_audits(outputs)
+        assert [len(call.args[0]) for call in compute.call_args_list] == [1]
+
+        uncached = _make_engine(_INCIDENTS)
+        for (audit_id, raw, prompt, model), (report, traces) in zip(outputs, results):
+            assert report.audit_id == audit_id
+            expected = uncached.run_output_audit(audit_id, raw, prompt, model)
+            assert _comparable(report) == _comparable(expected)
+            assert traces == uncached.get_traces()
+
+    def test_admin_stats(self, output_cache):
+        from routers.admin import get_output_cache_stats
+
+        _versioned_engine().run_output_audit(uuid.uuid4(), _TEXT, None, "openai")
+        stats = get_output_cache_stats()
+        assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 0, 1)
+        assert (stats["ttl_seconds"], stats["max_entries"]) == (60, 100)
+
+
+class TestReferenceReload:
+    def test_reload_under_same_fingerprint_misses(self, output_cache):
+        import engine
+
+        snapshot = _make_engine(_INCIDENTS).to_snapshot("v1")
+        reloaded = _make_engine(_INCIDENTS).to_snapshot("v1")
+        assert reloaded.generation != snapshot.generation
+        engine.SARoEngine.from_snapshot(snapshot).run_output_audit(uuid.uuid4(), _TEXT, None, "openai")
+        engine.SARoEngine.from_snapshot(reloaded).run_output_audit(uuid.uuid4(), _TEXT, None, "openai")
+        assert (output_cache.hits, output_cache.misses) == (0, 2)
+
+    def test_load_clears_cache(self, output_cache, session_factory):
+        import engine
+
+        _versioned_engine().run_output_audit(uuid.uuid4(), _TEXT, None, "openai")
+        db = session_factory()
+        with patch.object(engine, "_snapshot", None):
+            engine.load_reference_snapshot(db)
+        db.close()
+        assert len(output_cache) == 0
+
+    def test_fingerprint_sees_in_place_is_fixed_update(self, session_factory):
+        from engine import reference_fingerprint
+        from models import AIIncident
+
+        db = session_factory()
+        incident = AIIncident(incident_id="INC-1", title="Chatbot leak", is_fixed=False)
+        db.add(incident)
+        db.commit()
+        before = reference_fingerprint(db)
+        incident.is_fixed = True
+        db.commit()
+        assert reference_fingerprint(db) != before
+        db.close()
@@ -0,0 +1,165 @@
+"""
+Tests for keyset (cursor) pagination on the audit / audit-event listings and
+for creating model indexes on pre-existing tables.
+
+Runs against SQLite — no live DB required.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import _tenant
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-unit-tests")
+
+
+_BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _seed_audits(db, tenant_id: uuid.UUID, n: int) -> list[uuid.UUID]:
+    """n audits, created in pairs sharing a timestamp so the id tiebreak matters."""
+    from models import Audit
+
+    audits = [
+        Audit(id=uuid.uuid4(), tenant_id=tenant_id, sample_count=60, status="pending",
+              created_at=_BASE + timedelta(minutes=i // 2))
+        for i in range(n)
+    ]
+    db.add_all(audits)
+    db.commit()
+    newest_first = sorted(audits, key=lambda a: (a.created_at, a.id), reverse=True)
+    return [a.id for a in newest_first]
+
+
+def _walk(list_fn, limit: int, **kwargs) -> tuple[list[uuid.UUID], int]:
+    """Follow X-Next-Cursor until exhausted; returns (ids, pages)."""
+    from fastapi import Response
+
+    ids: list[uuid.UUID] = []
+    cursor, pages = None, 0
+    while True:
+        response = Response()
+        page = list_fn(response=response, limit=limit, offset=0, cursor=cursor, **kwargs)
+        pages += 1
+        ids.extend(item.id for item in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return ids, pages
+
+
+class TestKeysetPagination:
+    def test_audit_list_pages_cover_every_row_once(self, session_factory):
+        from routers.scan import list_audits
+
+        db = session_factory()
+        tenant = _tenant(db)
+        expected = _seed_audits(db, tenant, 11)
+        _seed_audits(db, _tenant(db), 3)                          # other tenant
+
+        user = SimpleNamespace(tenant_id=tenant)
+        ids, pages = _walk(list_audits, 4, current_user=user, db=db)
+        assert ids == expected
+        assert pages == 3
+        db.close()
+
+    def test_dashboard_list_with_status_filter(self, session_factory):
+        from routers.dashboard import list_dashboard_audits
+
+        db = session_factory()
+        tenant = _tenant(db)
+        expected = _seed_audits(db, tenant, 6)
+        user = SimpleNamespace(tenant_id=tenant)
+        ids, _ = _walk(list_dashboard_audits, 5, current_user=user, db=db,
+                       status_filter="pending")
+        assert ids == expected
+        db.close()
+
+    def test_audit_events_pages(self, session_factory):
+        from models import AuditEvent
+        from routers.clients import list_audit_events
+
+        db = session_factory()
+        tenant = _tenant(db)
+        events = [
+            AuditEvent(id=uuid.uuid4(), tenant_id=tenant, event_type=kind, event_data={},
+                       created_at=_BASE + timedelta(seconds=i))
+            for i, kind in enumerate(["user_enrolled", "client_created"] * 5)
+        ]
+        db.add_all(events)
+        db.commit()
+
+        expected = [e.id for e in reversed(events) if e.event_type == "user_enrolled"]
+        ids, pages = _walk(list_audit_events, 2, current_user=None, db=db,
+                           tenant_id=tenant, event_type="user_enrolled")
+        assert ids == expected
+        assert pages == 3                      # last full page → one empty probe
+        db.close()
+
+    def test_offset_ignored_with_cursor(self, session_factory):
+        from fastapi import Response
+
+        from routers.scan import list_audits
+
+        db = session_factory()
+        tenant = _tenant(db)
+        expected = _seed_audits(db, tenant, 6)
+        user = SimpleNamespace(tenant_id=tenant)
+        response = Response()
+        first = list_audits(user, db, response, limit=2, offset=0, cursor=None)
+        cursor = response.headers["X-Next-Cursor"]
+        after = list_audits(user, db, Response(), limit=2, offset=3, cursor=cursor)
+        assert [a.id for a in first + after] == expected[:4]
+        skipped = list_audits(user, db, Response(), limit=2, offset=3, cursor=None)
+        assert [a.id for a in skipped] == expected[3:5]
+        db.close()
+
+    def test_malformed_cursor_is_400(self, session_factory):
+        from fastapi import HTTPException, Response
+
+        from routers.scan import list_audits
+
+        db = session_factory()
+        with pytest.raises(HTTPException) as exc:
+            list_audits(response=Response(), current_user=SimpleNamespace(tenant_id=uuid.uuid4()),
+                        db=db, limit=10, offset=0, cursor="not-a-cursor")
+        assert exc.value.status_code == 400
+        db.close()
+
+
+class TestEnsureAppIndexes:
+    def test_missing_indexes_created_on_existing_tables(self, tmp_path, monkeypatch):
+        from sqlalchemy import create_engine, inspect
+
+        import database
+        from models import AuditEvent
+
+        eng = create_engine(f"sqlite:///{tmp_path / 'ix.db'}")
+        database.Base.metadata.create_all(eng)
+        with eng.begin() as conn:
+            conn.exec_driver_sql("DROP INDEX ix_audits_tenant_created")
+            conn.exec_driver_sql("DROP INDEX ix_audit_events_tenant_type_created")
+        monkeypatch.setattr(database, "_get_engine", lambda: eng)
+
+        database.ensure_app_indexes()
+        database.ensure_app_indexes()                      # idempotent
+        inspector = inspect(eng)
+        assert "ix_audits_tenant_created" in {
+            ix["name"] for ix in inspector.get_indexes("audits")
+        }
+        assert {"tenant_id", "event_type", "created_at"} == {
+            c for ix in inspector.get_indexes(AuditEvent.__tablename__)
+            if ix["name"] == "ix_audit_events_tenant_type_created"
+            for c in ix["column_names"]
+        }
+        eng.dispose()
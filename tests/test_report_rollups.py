@@ -0,0 +1,130 @@
+"""
+Tests for the per-tenant report rollups behind GET /api/v1/reports/summary.
+
+Runs against an in-memory SQLite database — no live DB required.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from conftest import _tenant
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-unit-tests")
+
+
+def _report_json(frameworks: list[str], domains: dict[str, int]) -> dict:
+    return {
+        "applied_rules": [{"framework": fw, "rule_id": f"r{i}"} for i, fw in enumerate(frameworks)],
+        "gates": [
+            {"gate_id": 1, "details": {}},
+            {"gate_id": 3, "details": {"domain_counts": domains}},
+        ],
+    }
+
+
+def _complete(db, tenant_id: uuid.UUID, risk: float | None, mit: float, delta: float,
+              frameworks: list[str], domains: dict[str, int], days_ago: int = 0,
+              status: str = "completed", record: bool = True) -> None:
+    import rollups
+    from models import Audit, ScanReport
+
+    audit = Audit(id=uuid.uuid4(), tenant_id=tenant_id, sample_count=60, status=status,
+                  completed_at=datetime.now(tz=timezone.utc) - timedelta(days=days_ago))
+    report = ScanReport(audit_id=audit.id, overall_risk_score=risk, mit_coverage_score=mit,
+                        fixed_delta=delta, confidence_score=0.9,
+                        report_json=_report_json(frameworks, domains))
+    db.add_all([audit, report])
+    if record:
+        rollups.record_report(db, audit, report)
+    db.commit()
+
+
+def _summary(db, tenant_id: uuid.UUID, days: int | None = None) -> dict:
+    from routers.reports import reports_summary
+
+    return reports_summary(current_user=SimpleNamespace(tenant_id=tenant_id), db=db, days=days)
+
+
+def _seed_history(db, tenant_id: uuid.UUID, record: bool = True) -> None:
+    _complete(db, tenant_id, 0.2, 0.4, 0.1, ["EU AI Act", "NIST AI RMF", "EU AI Act"],
+              {"Privacy & Security": 3, "Misinformation": 0}, record=record)
+    _complete(db, tenant_id, None, 0.6, 0.3, ["EU AI Act"],
+              {"Privacy & Security": 1, "Discrimination & Toxicity": 2}, record=record)
+    _complete(db, tenant_id, 0.8, 1.0, 0.5, ["ISO 42001"], {"Misinformation": 4},
+              days_ago=10, record=record)
+    _complete(db, tenant_id, 0.99, 0.99, 0.99, ["ISO 42001"], {"Misinformation": 9},
+              status="failed", record=record)
+
+
+class TestReportsSummary:
+    def test_summary_matches_report_history(self, session_factory):
+        db = session_factory()
+        tenant, other = _tenant(db), _tenant(db)
+        _seed_history(db, tenant)
+        _complete(db, other, 0.0, 0.0, 0.0, ["EU AI Act"], {"Misinformation": 1})
+
+        summary = _summary(db, tenant)
+        assert summary["total_audits"] == summary["completed"] == 3
+        assert summary["failed"] == 1
+        assert summary["avg_mit_coverage"] == round((0.4 + 0.6 + 1.0) / 3, 4)
+        assert summary["avg_risk_score"] == round((0.2 + 0.8) / 2, 4)      # NULL skipped
+        assert summary["avg_fixed_delta"] == round((0.1 + 0.3 + 0.5) / 3, 4)
+        assert summary["top_triggered_frameworks"] == {
+            "EU AI Act": 3, "ISO 42001": 1, "NIST AI RMF": 1,
+        }
+        assert summary["top_triggered_domains"] == {
+            "Privacy & Security": 2, "Discrimination & Toxicity": 1, "Misinformation": 1,
+        }
+        db.close()
+
+    def test_days_window(self, session_factory):
+        db = session_factory()
+        tenant = _tenant(db)
+        _seed_history(db, tenant)
+
+        summary = _summary(db, tenant, days=7)
+        assert summary["completed"] == 2
+        assert summary["avg_mit_coverage"] == 0.5
+        assert "ISO 42001" not in summary["top_triggered_frameworks"]
+        assert summary["top_triggered_domains"] == {
+            "Privacy & Security": 2, "Discrimination & Toxicity": 1,
+        }
+        db.close()
+
+    def test_empty_tenant(self, session_factory):
+        db = session_factory()
+        summary = _summary(db, _tenant(db))
+        assert summary["completed"] == 0
+        assert summary["avg_risk_score"] is None
+        db.close()
+
+
+class TestRollupBackfill:
+    def test_backfill_matches_incremental(self, session_factory):
+        import rollups
+
+        db = session_factory()
+        live, legacy = _tenant(db), _tenant(db)
+        _seed_history(db, live)
+        _seed_history(db, legacy, record=False)
+        # Rollups already exist (for `live`) → backfill is a no-op
+        assert rollups.backfill(db) == 0
+
+        from models import ReportRollup, ReportRollupHit
+
+        db.query(ReportRollupHit).delete()
+        db.query(ReportRollup).delete()
+        db.commit()
+        assert rollups.backfill(db) == 6
+        expected = _summary(db, live)
+        assert _summary(db, legacy) == expected
+        db.close()
@@ -0,0 +1,214 @@
+"""
+Tests for asynchronous (queued) batch audits: jobs executor + scan router.
+
+The job runs against an in-memory SQLite database and an engine built from
+injected reference data — no live DB or external service required.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from conftest import _INCIDENTS, _make_batch, _make_engine, _tenant
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-unit-tests")
+
+
+def _seed_pending_audit(factory, sample_count: int) -> tuple[uuid.UUID, uuid.UUID]:
+    from models import Audit, Tenant
+
+    db = factory()
+    tenant = Tenant(id=uuid.uuid4(), name="Acme", slug=f"acme-{uuid.uuid4().hex[:8]}")
+    db.add(tenant)
+    audit = Audit(id=uuid.uuid4(), tenant_id=tenant.id, sample_count=sample_count, status="pending")
+    db.add(audit)
+    db.commit()
+    ids = (audit.id, tenant.id)
+    db.close()
+    return ids
+
+
+class TestAuditJob:
+    def test_job_moves_audit_to_completed_and_persists_report(self, session_factory):
+        from models import Audit
+        from routers import scan
+
+        batch = _make_batch(["racist toxic output"] * 60)
+        audit_id, _ = _seed_pending_audit(session_factory, len(batch.samples))
+        with patch("jobs.open_session", side_effect=session_factory), \
+                patch.object(scan, "get_audit_engine", return_value=_make_engine(_INCIDENTS)):
+            scan._run_audit_job(audit_id, batch)
+
+        db = session_factory()
+        audit = db.get(Audit, audit_id)
+        assert audit.status in ("completed", "partial")
+        assert audit.completed_at is not None
+        assert audit.report is not None
+        assert audit.report.report_json["audit_id"] == str(audit_id)
+        assert audit.traces
+        db.close()
+
+    def test_job_failure_marks_audit_failed(self, session_factory):
+        from models import Audit
+        from routers import scan
+
+        batch = _make_batch(["neutral"] * 60)
+        audit_id, _ = _seed_pending_audit(session_factory, len(batch.samples))
+        broken = MagicMock()
+        broken.run_audit.side_effect = RuntimeError("boom")
+        with patch("jobs.open_session", side_effect=session_factory), \
+                patch.object(scan, "get_audit_engine", return_value=broken):
+            scan._run_audit_job(audit_id, batch)
+
+        db = session_factory()
+        assert db.get(Audit, audit_id).status == "failed"
+        db.close()
+
+    def test_get_audit_returns_202_while_pending(self, session_factory):
+        from routers import scan
+
+        audit_id, tenant_id = _seed_pending_audit(session_factory, 60)
+        db = session_factory()
+        user = MagicMock(tenant_id=tenant_id)
+        resp = scan.get_audit(audit_id, user, db)
+        assert resp.status_code == 202
+        assert b'"status":"pending"' in resp.body
+        db.close()
+
+    def test_fails_only_audits_no_live_process_owns(self, session_factory):
+        from fastapi import HTTPException
+        from models import Audit, AuditEvent, AuditLease
+        from routers import scan
+
+        now = datetime.now(tz=timezone.utc)
+        old = now - timedelta(hours=1)
+        db = session_factory()
+        tenant_id = _tenant(db)
+
+        def audit(status, created_at, lease_at=None):
+            row = Audit(id=uuid.uuid4(), tenant_id=tenant_id, sample_count=60,
+                        status=status, created_at=created_at)
+            db.add(row)
+            if lease_at is not None:
+                db.add(AuditLease(audit_id=row.id, instance_id="other:1:abc",
+                                  heartbeat_at=lease_at))
+            return row.id
+
+        orphaned_pending = audit("pending", old)                   # no lease, old
+        orphaned_running = audit("running", old, lease_at=old)     # owner stopped renewing
+        live = audit("running", old, lease_at=now)                 # another live process
+        young = audit("pending", now)                              # just accepted
+        done = audit("completed", old)
+        db.commit()
+
+        assert scan.fail_interrupted_audits(db) == 2
+        assert scan.fail_interrupted_audits(db) == 0
+        db.expire_all()
+        statuses = {i: db.get(Audit, i).status for i in
+                    (orphaned_pending, orphaned_running, live, young, done)}
+        assert statuses == {orphaned_pending: "failed", orphaned_running: "failed",
+                            live: "running", young: "pending", done: "completed"}
+        assert db.get(AuditLease, orphaned_running) is None
+        events = db.query(AuditEvent).filter(AuditEvent.event_type == "audit_interrupted").all()
+        assert {e.event_data["previous_status"] for e in events} == {"pending", "running"}
+        assert all(e.event_data["error"] == scan.INTERRUPTED_AUDIT_ERROR for e in events)
+
+        with pytest.raises(HTTPException) as exc:
+            scan.get_audit(orphaned_pending, MagicMock(tenant_id=tenant_id), db)
+        assert exc.value.status_code == 404
+        assert "failed" in exc.value.detail
+        db.close()
+
+    def test_heartbeat_renews_own_leases_and_prunes_finished(self, session_factory):
+        import jobs
+        from models import Audit, AuditLease
+        from routers import scan
+
+        old = datetime.now(tz=timezone.utc) - timedelta(hours=1)
+        db = session_factory()
+        tenant_id = _tenant(db)
+        ids = {}
+        for status in ("running", "completed"):
+            ids[status] = uuid.uuid4()
+            db.add(Audit(id=ids[status], tenant_id=tenant_id, sample_count=60,
+                         status=status, created_at=old))
+            db.add(AuditLease(audit_id=ids[status], instance_id=jobs.INSTANCE_ID, heartbeat_at=old))
+        db.commit()
+        db.close()
+
+        with patch("jobs.open_session", side_effect=session_factory):
+            scan.heartbeat_audit_leases()
+
+        db = session_factory()
+        assert db.get(Audit, ids["running"]).status == "running"
+        renewed = db.get(AuditLease, ids["running"]).heartbeat_at
+        assert renewed.replace(tzinfo=None) > old.replace(tzinfo=None)   # SQLite drops tzinfo
+        assert db.get(AuditLease, ids["completed"]) is None
+        db.close()
+
+    def test_queued_audit_is_leased_by_this_process(self, session_factory):
+        import jobs
+        from models import Audit, AuditLease
+        from routers import scan
+
+        db = session_factory()
+        audit = Audit(id=uuid.uuid4(), tenant_id=_tenant(db), sample_count=60)
+        with patch.object(jobs, "submit"):
+            scan._start_audit(_make_batch(["ok"] * 60), audit, db, async_mode=True)
+        assert db.get(AuditLease, audit.id).instance_id == jobs.INSTANCE_ID
+        db.close()
+
+
+class TestJobsExecutor:
+    def test_inline_runs_before_returning(self):
+        import jobs
+
+        calls = []
+        with patch.object(jobs, "AUDIT_EXECUTOR", "inline"):
+            assert jobs.submit(calls.append, 1) is None
+        assert calls == [1]
+
+    def test_thread_executor_returns_future(self):
+        import jobs
+
+        with patch.object(jobs, "AUDIT_EXECUTOR", "thread"), patch.object(jobs, "_executor", None):
+            future = jobs.submit(sum, [1, 2, 3])
+            assert future.result(timeout=5) == 6
+            jobs.shutdown()
+
+
+class TestBulkTracePersistence:
+    def test_all_traces_written_in_one_statement(self, session_factory):
+        from sqlalchemy import event
+
+        from models import AuditTrace
+        from routers import scan
+
+        audit_id, _ = _seed_pending_audit(session_factory, 60)
+        engine = _make_engine(_INCIDENTS)
+        engine.run_audit(_make_batch(["racist toxic output"] * 60), audit_id)
+        expected = len(engine.get_traces())
+
+        db = session_factory()
+        inserts: list[str] = []
+        bind = db.get_bind()
+        listener = lambda conn, cur, stmt, *a: stmt.startswith("INSERT") and inserts.append(stmt)  # noqa: E731
+        event.listen(bind, "before_cursor_execute", listener)
+        try:
+            scan._persist_traces(engine, audit_id, db)
+        finally:
+            event.remove(bind, "before_cursor_execute", listener)
+
+        assert db.query(AuditTrace).filter(AuditTrace.audit_id == audit_id).count() == expected
+        assert len(inserts) == 1
+        db.close()
@@ -0,0 +1,124 @@
+"""
+Tests for the large-batch scan endpoints: NDJSON streaming
+(POST /api/v1/scan/stream) and one-shot bulk validation (POST /api/v1/scan/bulk).
+
+Runs the real router through TestClient against an in-memory SQLite database
+and an engine built from injected reference data.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import uuid
+
+from conftest import _INCIDENTS, _make_engine
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-unit-tests")
+
+
+def _ndjson(texts: list[str]):
+    """Yield the body in small pieces so lines straddle chunk boundaries."""
+    body = "".join(
+        json.dumps({"sample_id": f"s{i}", "text": t}) + "\n" for i, t in enumerate(texts)
+    ).encode()
+    for start in range(0, len(body), 37):
+        yield body[start:start + 37]
+
+
+def _audit(session_factory, audit_id: str):
+    from models import Audit
+
+    db = session_factory()
+    audit = db.get(Audit, uuid.UUID(audit_id))
+    db.expunge(audit)
+    db.close()
+    return audit
+
+
+class TestScanStream:
+    def test_streamed_batch_is_audited_and_persisted(self, client, session_factory):
+        texts = ["racist toxic output", "a perfectly neutral reply to the user"] * 40
+        resp = client.post(
+            "/api/v1/scan/stream?batch_id=big&incident_matching=per_sample",
+            content=_ndjson(texts),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert resp.status_code == 200, resp.text
+        report = resp.json()
+        assert report["sample_count"] == 80
+        assert report["batch_id"] == "big"
+        assert report["mit_coverage"]["domain_risk_counts"]["Discrimination & Toxicity"] == 40
+
+        audit = _audit(session_factory, report["audit_id"])
+        assert audit.status == report["status"]
+        assert audit.sample_count == 80
+
+    def test_malformed_line_returns_422_and_fails_audit(self, client, session_factory):
+        from models import Audit
+
+        body = b'{"text": "fine"}\n\n{"text": "   "}\n'
+        resp = client.post("/api/v1/scan/stream", content=body)
+        assert resp.status_code == 422
+        assert resp.json()["detail"].startswith("Line 3: text:")
+
+        db = session_factory()
+        assert [a.status for a in db.query(Audit).all()] == ["failed"]
+        db.close()
+
+    def test_too_few_samples_returns_failed_report(self, client):
+        resp = client.post("/api/v1/scan/stream", content=_ndjson(["hello there friend"] * 5))
+        assert resp.status_code == 200
+        assert resp.json()["status"] == "failed"
+        assert resp.json()["sample_count"] == 5
+
+
+class TestScanBulk:
+    def test_bulk_report_matches_model_path(self, client):
+        from schemas import BatchIn
+
+        samples = [
+            {"sample_id": f"s{i}", "text": t, "group": "AB"[i % 2], "label": ("toxic", "safe")[i % 3 == 0]}
+            for i, t in enumerate(["racist toxic output", "a perfectly neutral reply"] * 30)
+        ]
+        payload = {"batch_id": "bulk", "samples": samples, "config": {"incident_matching": "per_sample"}}
+        resp = client.post("/api/v1/scan/bulk", json=payload)
+        assert resp.status_code == 200, resp.text
+
+        expected = _make_engine(_INCIDENTS).run_audit(BatchIn.model_validate(payload), uuid.uuid4())
+        skip = {"audit_id", "created_at"}
+        got = {k: v for k, v in resp.json().items() if k not in skip}
+        assert got == {k: v for k, v in expected.model_dump(mode="json").items() if k not in skip}
+
+    def test_missing_sample_ids_are_ordinals(self, client):
+        payload = {
+            "samples": [{"text": "racist hiring bias incident"}] + [{"text": "hello there"}] * 59,
+            "config": {"incident_matching": "per_sample"},
+        }
+        resp = client.post("/api/v1/scan/bulk", json=payload)
+        assert resp.status_code == 200, resp.text
+        matched = resp.json()["similar_incidents"][0]["matched_samples"]
+        assert matched[0]["sample_id"] == "#0"
+
+    def test_ordinal_ids_do_not_collide_with_supplied_ids(self, client):
+        samples = [{"text": "hello there"}] * 59 + [{"sample_id": "0", "text": "hello there"}]
+        samples[0] = {"text": "racist hiring bias incident"}
+        payload = {"samples": samples, "config": {"incident_matching": "per_sample"}}
+        resp = client.post("/api/v1/scan/bulk", json=payload)
+        assert resp.status_code == 200, resp.text
+        matched = resp.json()["similar_incidents"][0]["matched_samples"]
+        assert [m["sample_id"] for m in matched] == ["#0"]
+
+    def test_blank_text_and_short_batches_are_rejected(self, client):
+        blank = {"samples": [{"text": "ok"}] * 49 + [{"text": "  "}]}
+        resp = client.post("/api/v1/scan/bulk", json=blank)
+        assert resp.status_code == 422
+        assert resp.json()["detail"][0]["loc"] == ["samples", 49, "text"]
+
+        resp = client.post("/api/v1/scan/bulk", json={"samples": [{"text": "ok"}] * 10})
+        assert resp.status_code == 422
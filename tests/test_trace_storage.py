@@ -0,0 +1,123 @@
+"""
+Tests for the packed storage of enhanced-trace texts (storage.py) and the
+on-read rendering of raw_response.
+
+Runs against an in-memory SQLite database — no live DB required.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+from conftest import _seed, _tenant
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-unit-tests")
+
+
+_LONG = "The model recommended increasing the dosage without citing a source. " * 200
+
+
+class TestPackText:
+    def test_round_trip(self):
+        from storage import PACKED_PREFIX, pack_text, unpack_text
+
+        packed = pack_text(_LONG)
+        assert packed.startswith(PACKED_PREFIX)
+        assert len(packed) < len(_LONG) / 10
+        assert unpack_text(packed) == _LONG
+
+    def test_small_and_legacy_values_pass_through(self):
+        from storage import pack_text, unpack_text
+
+        assert pack_text("short") == "short"
+        assert pack_text(None) is None and unpack_text(None) is None
+        assert unpack_text(_LONG) == _LONG          # stored before packing existed
+
+    def test_marker_text_is_unambiguous(self):
+        from storage import PACKED_PREFIX, pack_text, unpack_text
+
+        tricky = PACKED_PREFIX + "not actually packed"
+        assert pack_text(tricky) != tricky
+        assert unpack_text(pack_text(tricky)) == tricky
+
+
+class TestEnhancedTraceStorage:
+    def test_columns_stored_packed(self, session_factory):
+        from sqlalchemy import select, text
+
+        from models import EnhancedTrace
+        from storage import PACKED_PREFIX
+
+        db = session_factory()
+        audit_id = _seed(db, _tenant(db), "completed", 0.5, 0.5)
+        db.add(EnhancedTrace(audit_id=audit_id, chain_of_thought={}, raw_prompt="small",
+                             prompt_text=_LONG, raw_output_text=_LONG))
+        db.commit()
+
+        stored = db.execute(text("SELECT raw_prompt, prompt_text FROM enhanced_traces")).one()
+        assert stored[0] == "small"
+        assert stored[1].startswith(PACKED_PREFIX)
+        db.expunge_all()
+        trace = db.execute(select(EnhancedTrace)).scalar_one()
+        assert trace.prompt_text == trace.raw_output_text == _LONG
+        db.close()
+
+    def test_raw_response_rendered_on_read(self, session_factory):
+        from models import AuditTrace, EnhancedTrace
+        from routers.dashboard import get_enhanced_trace
+
+        db = session_factory()
+        tenant = _tenant(db)
+        audit_id = _seed(db, tenant, "completed", 0.7, 0.4, failed_traces=2)
+        db.commit()
+        user = MagicMock(tenant_id=tenant)
+
+        first = get_enhanced_trace(audit_id, user, db)
+        stored = db.query(EnhancedTrace).filter(EnhancedTrace.audit_id == audit_id).one()
+        assert stored.raw_response is None
+        assert json.loads(first.raw_response) == {
+            "audit_id": str(audit_id),
+            "chain_of_thought": first.chain_of_thought,
+            "report_summary": first.client_output_summary,
+        }
+        assert first.chain_of_thought["total_checks"] == db.query(AuditTrace).filter(
+            AuditTrace.audit_id == audit_id
+        ).count()
+
+        db.expunge_all()
+        assert get_enhanced_trace(audit_id, user, db).raw_response == first.raw_response
+
+        legacy = db.query(EnhancedTrace).filter(EnhancedTrace.audit_id == audit_id).one()
+        legacy.raw_response = "{}"
+        db.commit()
+        assert get_enhanced_trace(audit_id, user, db).raw_response == "{}"
+        db.close()
+
+    def test_single_output_raw_prompt_rendered_on_read(self, session_factory):
+        from models import EnhancedTrace, ScanReport
+        from routers.dashboard import _trace_out
+        from routers.output_audit import _enhanced_trace
+
+        db = session_factory()
+        audit_id = _seed(db, _tenant(db), "completed", 0.5, 0.5)
+        report = ScanReport(audit_id=audit_id, overall_risk_score=0.5, mit_coverage_score=0.5,
+                            fixed_delta=0.0, confidence_score=0.9, report_json={})
+        db.add(_enhanced_trace(audit_id, "the prompt", _LONG, report, [], "claude"))
+        db.commit()
+        db.expunge_all()
+
+        stored = db.query(EnhancedTrace).filter(EnhancedTrace.audit_id == audit_id).one()
+        assert stored.raw_prompt is None
+        out = _trace_out(stored)
+        assert out.raw_prompt.startswith("SARO Universal Output Audit — Single-Output Mode\n")
+        assert "Source Model: claude\n" in out.raw_prompt
+        assert out.raw_prompt.endswith(f"--- ORIGINAL PROMPT ---\nthe prompt\n\n"
+                                       f"--- RAW AI OUTPUT ---\n{_LONG}")
+        db.close()